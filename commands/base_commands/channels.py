@@ -123,8 +123,7 @@ class ArxChannelCommand(command.Command):
             log_file = channel.attributes.get("log_file", default="channel_%s.log" % channel.key)
 
             def send_msg(lines):
-                msgs = "".join(line for line in lines)
-                arx_more.msg(caller, msgs, justify_kwargs=False)
+                arx_more.msg(caller, lines, justify_kwargs=False)
             if self.num_messages > 200:
                 self.num_messages = 200
             self.msg("{wChannel history for %s:{n" % self.key)
@@ -181,12 +181,21 @@ class CmdGameSettings(ArxPlayerCommand):
                 self.msg("%s is now off." % attr)
                 char.tags.remove(attr)
                 char.tags.all()  # update cache until there's a fix for that
+            table = char.db.sitting_at_table
+            if attr == "emit_label" and table:
+                table.refresh_occupant(char)
             return
         char.attributes.add(attr, not char.attributes.get(attr))
         if not char.attributes.get(attr):
             caller.msg("%s is now off." % attr)
         else:
             caller.msg("%s is now on." % attr)
+        if attr == "lookingforrp":
+            from server.utils.presence import PRESENCE
+            PRESENCE.refresh(caller)
+        if attr == "ignore_weather":
+            from world.weather.utils import WEATHER_STATE
+            WEATHER_STATE.set_ignores_weather(char, char.attributes.get(attr))
 
     def set_text_colors(self, char, attr):
         """Sets either pose_quote_color or name_color for the caller"""
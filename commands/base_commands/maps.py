@@ -128,7 +128,7 @@ class CmdMapRoom(ArxCommand):
             caller.msg("No map found for %s." % self.lhs)
             return
         if 'clear' in self.switches:
-            map.db.rooms[(x,y)] = None
+            map.clear_square(x, y)
             caller.msg("Location (%s, %s) will be a blank space." % (x, y))
             return
         # set up room
@@ -5,7 +5,6 @@ import time
 
 from django.conf import settings
 
-from evennia.server.sessionhandler import SESSIONS
 from evennia.commands.default.account import CmdOOC
 from evennia.commands.default.comms import (CmdCdestroy, CmdChannelCreate, CmdChannels, find_channel,
                                             CmdClock, CmdCBoot, CmdCdesc, CmdAllCom, CmdCWho)
@@ -795,6 +794,22 @@ class CmdWho(ArxPlayerCommand):
             base += " {c(Staff){n"
         return base
 
+    @staticmethod
+    def format_record(record, lname=False, sparse=False):
+        """
+        Returns the name of an online player with flags, from their presence record
+        """
+        base = record.name.capitalize()
+        if lname and not sparse:
+            base = record.longname or base
+        if record.afk:
+            base += " {w(AFK){n"
+        if record.lrp:
+            base += " {w(LRP){n"
+        if record.staff:
+            base += " {c(Staff){n"
+        return base
+
     def check_filters(self, pname, base, fealty=""):
         """
         If we have no filters or the name starts with the
@@ -828,23 +843,35 @@ class CmdWho(ArxPlayerCommand):
             return "Idle"
         return "Idle+"
 
+    @staticmethod
+    def get_client_name(session):
+        """Returns a sane name for the client a session is using"""
+        if session.protocol_key == "websocket" or "ajax" in session.protocol_key:
+            return "Webclient"
+        client_name = session.protocol_flags.get('CLIENTNAME')
+        if not client_name:
+            client_name = session.protocol_flags.get('TERM')
+        if client_name and client_name.upper().endswith("-256COLOR"):
+            client_name = client_name[:-9]
+        if client_name is None:
+            client_name = "Unknown"
+        return client_name.capitalize()
+
     def func(self):
         """
-        Get all connected players by polling session.
+        Get all connected players from the presence registry.
         """
+        from server.utils.presence import PRESENCE
         player = self.caller
-        session_list = [ob for ob in SESSIONS.get_sessions() if ob.account and ob.account.show_online(player)]
-        session_list = sorted(session_list, key=lambda o: o.account.key.lower())
+        is_builder = player.check_permstring("builders")
+        records = [ob for ob in PRESENCE.online() if ob.visible_to(is_builder)]
         sparse = "sparse" in self.switches
-        watch_list = player.db.watching or []
         if self.cmdstring == "doing":
             show_session_data = False
         else:
             show_session_data = player.check_permstring("Immortals") or player.check_permstring("Wizards")
-        total_players = len(set(ob.account for ob in session_list))
+        total_players = len(records)
         number_displayed = 0
-        already_counted = []
-        public_members = []
         if "org" in self.switches:
             from world.dominion.models import Organization
             try:
@@ -854,7 +881,12 @@ class CmdWho(ArxPlayerCommand):
             except Organization.DoesNotExist:
                 self.msg("Organization not found.")
                 return
-            public_members = [ob.player.player for ob in org.members.filter(deguilded=False, secret=False)]
+            public_members = set(org.members.filter(deguilded=False, secret=False)
+                                 .values_list('player__player_id', flat=True))
+            records = [ob for ob in records if ob.account.id in public_members]
+        if "watch" in self.switches:
+            watch_list = set(player.db.watching or [])
+            records = [ob for ob in records if ob.char in watch_list]
         if show_session_data:
             table = prettytable.PrettyTable(["{wPlayer Name",
                                              "{wOn for",
@@ -862,109 +894,43 @@ class CmdWho(ArxPlayerCommand):
                                              "{wRoom",
                                              "{wClient",
                                              "{wHost"])
-            for session in session_list:
-                pc = session.get_account()
-                if pc in already_counted:
-                    continue
-                if not session.logged_in:
-                    already_counted.append(pc)
-                    continue
-                delta_cmd = pc.idle_time
-                if "active" in self.switches and delta_cmd > 1200:
-                    already_counted.append(pc)
-                    continue
-                if "org" in self.switches and pc not in public_members:
-                    continue
-                delta_conn = time.time() - session.conn_time
-                plr_pobject = session.get_puppet()
-                plr_pobject = plr_pobject or pc
-                base = str(session.get_account())
-                pname = self.format_pname(session.get_account())
-                char = pc.char_ob
-                if "watch" in self.switches and char not in watch_list:
-                    already_counted.append(pc)
+        elif not sparse:
+            table = prettytable.PrettyTable(["{wPlayer name", "{wFealty", "{wIdle"])
+        else:
+            table = prettytable.PrettyTable(["{wPlayer name", "{wIdle"])
+        now = time.time()
+        for record in records:
+            pc = record.account
+            delta_cmd = pc.idle_time
+            if "active" in self.switches and delta_cmd > 1200:
+                continue
+            if show_session_data:
+                session = record.session()
+                if not session:
                     continue
-                if not char or not char.db.fealty:
-                    fealty = "---"
-                else:
-                    fealty = char.db.fealty
-                if not self.check_filters(pname, base, fealty):
-                    already_counted.append(pc)
+                pname = self.format_record(record)
+                if not self.check_filters(pname, record.name, record.fealty):
                     continue
-                pname = crop(pname, width=18)
-                if session.protocol_key == "websocket" or "ajax" in session.protocol_key:
-                    client_name = "Webclient"
-                else:
-                    # Get a sane client name to display.
-                    client_name = session.protocol_flags.get('CLIENTNAME')
-                    if not client_name:
-                        client_name = session.protocol_flags.get('TERM')
-                    if client_name and client_name.upper().endswith("-256COLOR"):
-                        client_name = client_name[:-9]
-
-                if client_name is None:
-                    client_name = "Unknown"
-
-                client_name = client_name.capitalize()
-
-                table.add_row([pname,
-                               time_format(delta_conn)[:6],
+                plr_pobject = session.get_puppet() or pc
+                table.add_row([crop(pname, width=18),
+                               time_format(now - session.conn_time)[:6],
                                time_format(delta_cmd, 1),
                                hasattr(plr_pobject, "location") and plr_pobject.location and plr_pobject.location.dbref
                                or "None",
-                               client_name[:9],
+                               self.get_client_name(session)[:9],
                                isinstance(session.address, tuple) and session.address[0] or session.address])
-                already_counted.append(pc)
-                number_displayed += 1
-        else:
-            if not sparse:
-                table = prettytable.PrettyTable(["{wPlayer name", "{wFealty", "{wIdle"])
             else:
-                table = prettytable.PrettyTable(["{wPlayer name", "{wIdle"])
-
-            for session in session_list:
-                pc = session.get_account()
-                if pc in already_counted:
-                    continue
-                if not session.logged_in:
-                    already_counted.append(pc)
+                if record.hidden:
                     continue
-                if "org" in self.switches and pc not in public_members:
+                pname = self.format_record(record, lname=True, sparse=sparse)
+                if not self.check_filters(pname, record.name, record.fealty):
                     continue
-                delta_cmd = pc.idle_time
-                if "active" in self.switches and delta_cmd > 1200:
-                    already_counted.append(pc)
-                    continue
-                if not pc.db.hide_from_watch:
-                    base = str(pc)
-                    pname = self.format_pname(pc, lname=True, sparse=sparse)
-                    char = pc.char_ob
-                    if "watch" in self.switches and char not in watch_list:
-                        already_counted.append(pc)
-                        continue
-                    if not char or not char.db.fealty:
-                        fealty = "---"
-                    else:
-                        fealty = char.db.fealty
-                    if not self.check_filters(pname, base, fealty):
-                        already_counted.append(pc)
-                        continue
-                    idlestr = self.get_idlestr(delta_cmd)
-                    if sparse:
-                        width = 30
-                    else:
-                        width = 55
-                    pname = crop(pname, width=width)
-                    if not sparse:
-                        table.add_row([pname,
-                                       fealty,
-                                       idlestr])
-                    else:
-                        table.add_row([pname, idlestr])
-                    already_counted.append(pc)
-                    number_displayed += 1
+                idlestr = self.get_idlestr(delta_cmd)
+                if not sparse:
+                    table.add_row([crop(pname, width=55), record.fealty, idlestr])
                 else:
-                    already_counted.append(pc)
+                    table.add_row([crop(pname, width=30), idlestr])
+            number_displayed += 1
         is_one = number_displayed == 1
         if number_displayed == total_players:
             string = "{wPlayers:{n\n%s\n%s unique account%s logged in." % (table, "One" if is_one else number_displayed,
@@ -19,6 +19,7 @@ from server.utils import prettytable
 from server.utils.arx_utils import inform_staff, list_to_string
 from typeclasses.bulletin_board.bboard import BBoard
 from web.character.models import Roster
+from web.character.roster_snapshot import ROSTER_SNAPSHOT
 from world.dominion.models import Propriety
 
 # limit symbol import for API
@@ -71,6 +72,12 @@ def list_characters(caller, character_list, roster_type="Active Characters", ros
                                              "{wFealty{n",
                                              "{wConcept{n",
                                              "{wSR{n"])
+        # index hidden characters by name, keeping the first match as a linear search would
+        hidden_by_name = {}
+        for ob in reversed(hidden_chars or []):
+            hidden_by_name[ob.name.lower()] = ob
+        ROSTER_SNAPSHOT.load([ob.id for ob in character_list if hasattr(ob, 'id')] +
+                             [ob.id for ob in hidden_by_name.values()])
         for char in character_list:
             try:
                 if use_keys:
@@ -95,33 +102,33 @@ def list_characters(caller, character_list, roster_type="Active Characters", ros
                 hide = True
             if not charob and hidden_chars:
                 # convert both to lower case for case-insensitive matching
-                match_list = [ob for ob in hidden_chars if ob.name.lower() == char.lower()]
-                if match_list:
-                    charob = match_list[0]
+                charob = hidden_by_name.get(char.lower())
+                if charob:
                     hide = True
             if charob:
                 if not use_keys and charob.name and name != charob.name and caller.check_permstring("Builders"):
                     name += "{w(%s){n" % charob.name
+                row = ROSTER_SNAPSHOT.row(charob.id)
                 if titles:
-                    title = charob.db.longname
+                    title = row['longname']
                     if title and not hide:
                         name = '{n' + title.replace(char, '{c' + char + '{n')
                 # yes, yes, I know they're not the same thing.
                 # sex is only 3 characters and gender is 5.
-                sex = charob.db.gender
+                sex = row['gender']
                 if not sex or hide:
                     sex = "-"
                 sex = sex[0].capitalize()
-                age = charob.db.age
+                age = row['age']
                 if not age or hide:
                     age = "-"
-                house = charob.db.fealty
+                house = row['fealty']
                 if not house or hide:
                     house = "-"
-                concept = charob.db.concept
+                concept = row['concept']
                 if not concept or hide:
                     concept = "-"
-                srank = charob.db.social_rank
+                srank = row['social_rank']
                 if not srank or hide:
                     srank = "-"
                 if not titles or hide:
@@ -22,6 +22,7 @@ from commands.base_commands.roster import format_header
 from commands.mixins import RewardRPToolUseMixin
 from server.utils.exceptions import PayError, CommandError
 from server.utils.prettytable import PrettyTable
+from server.utils.presence import PRESENCE
 from server.utils.arx_utils import inform_staff, time_from_now, inform_guides, commafy, a_or_an, get_full_url
 from typeclasses.characters import Character
 from typeclasses.rooms import ArxRoom
@@ -272,6 +273,7 @@ class CmdWatch(ArxPlayerCommand):
             hide = not hide
             caller.msg("Hiding set to %s." % str(hide))
             caller.db.hide_from_watch = hide
+            PRESENCE.refresh(caller)
             return
         player = caller.search(self.args)
         if not player:
@@ -2103,10 +2105,10 @@ class CmdAFK(ArxPlayerCommand):
         if caller.db.afk:
             caller.db.afk = ""
             caller.msg("You are no longer AFK.")
-            return
-        caller.db.afk = self.args or "Sorry, I am AFK(away from keyboard) right now."
-        caller.msg("{wYou are now AFK with the following message{n: %s" % caller.db.afk)
-        return
+        else:
+            caller.db.afk = self.args or "Sorry, I am AFK(away from keyboard) right now."
+            caller.msg("{wYou are now AFK with the following message{n: %s" % caller.db.afk)
+        PRESENCE.refresh(caller)
 
 
 class CmdRoomHistory(ArxCommand):
@@ -2163,12 +2165,11 @@ class CmdRoomMood(RewardRPToolUseMixin, ArxCommand):
         mood = caller.location.db.room_mood or (None, 0, "")
         self.msg("Old mood was: %s" % mood[2])
         if not self.args:
-            caller.location.attributes.remove("room_mood")
+            caller.location.clear_room_mood()
             self.msg("Mood erased.")
             return
-        mood = (caller, time.time(), self.args)
-        caller.location.db.room_mood = mood
-        self.caller.location.msg_contents("{w(OOC)The scene set/room mood is now set to:{n %s" % mood[2])
+        caller.location.set_room_mood(caller, self.args)
+        self.caller.location.msg_contents("{w(OOC)The scene set/room mood is now set to:{n %s" % self.args)
         self.mark_command_used()
 
 
@@ -716,16 +716,17 @@ class CmdViewLog(ArxPlayerCommand):
     """
     Views a log
         Usage:
-            @view_log
-            @view_log/previous
-            @view_log/current
+            @view_log [<page #>]
+            @view_log/previous [<page #>]
+            @view_log/current [<page #>]
             @view_log/report <player>
             @view_log/purge
 
     Views a log of messages sent to you from other players. @view_log with no
     arguments lists the log that will be seen by staff if you've submitted a /report.
     To view the log of recent messages, use /current. For your last session, use
-    /previous. /report <player> will go through your logs for messages from the
+    /previous. Logs are shown a page at a time; give a page number to see later
+    pages. /report <player> will go through your logs for messages from the
     player and report it to staff. Using /report again will overwrist your existing
     flagged log. If you do not want to log messages sent by others, then you may
     use @settings/private_mode. GMs cannot read any messages sent to you if that mode
@@ -736,38 +737,44 @@ class CmdViewLog(ArxPlayerCommand):
 
     If you wish to wipe all current logs stored on your character, you can use the
     /purge command.
+
+    Staff view a player's flagged log with @view_log <player>[=<page #>].
     """
     key = "@view_log"
     help_category = "Admin"
     locks = "cmd:all()"
 
-    def view_log(self, log):
-        """Views a log for a player"""
-        msg = ""
-        for line in log:
-            def get_name(ob):
-                """Formats their name"""
-                if self.caller.check_permstring("builder"):
-                    return ob.key
-                return ob.name
-            msg += "{wFrom: {c%s {wMsg:{n %s\n" % (get_name(line[0]), line[1])
+    def view_log(self, log, page_arg=None):
+        """Views a page of a log for a player"""
+        try:
+            page = int(page_arg or 1)
+        except ValueError:
+            self.msg("Page must be a number.")
+            return
+        pages = log.page_count()
+        page = max(1, min(page, pages))
+        show_keys = self.caller.check_permstring("builder")
+        lines = ["{wFrom: {c%s {wMsg:{n %s" % (sender.key if show_keys else sender.name, text)
+                 for sender, text, _ in log.page(page)]
+        if pages > 1:
+            lines.append("{wPage %s of %s.{n" % (page, pages))
         from server.utils import arx_more
-        arx_more.msg(self.caller, msg)
+        arx_more.msg(self.caller, "\n".join(lines))
 
-    def view_flagged_log(self, player):
+    def view_flagged_log(self, player, page=None):
         """Views a logged flag for viewing by a player"""
         self.msg("Viewing %s's flagged log" % player)
-        self.view_log(player.flagged_log)
+        self.view_log(player.flagged_log, page)
 
-    def view_previous_log(self, player):
+    def view_previous_log(self, player, page=None):
         """Views the previous log for a plyaer"""
         self.msg("Viewing %s's previous log" % player)
-        self.view_log(player.previous_log)
+        self.view_log(player.previous_log, page)
 
-    def view_current_log(self, player):
+    def view_current_log(self, player, page=None):
         """Views the player's current log"""
         self.msg("Viewing %s's current log" % player)
-        self.view_log(player.current_log)
+        self.view_log(player.current_log, page)
 
     def func(self):
         """Executes the log command"""
@@ -780,21 +787,23 @@ class CmdViewLog(ArxPlayerCommand):
             inform_staff("%s has reported %s for bad behavior. Please use @view_log to check it out." % (
                 self.caller, targ))
             return
-        if self.caller.check_permstring("immortals"):
-            targ = self.caller.search(self.args)
+        page = self.args
+        if self.caller.check_permstring("immortals") and self.lhs and not self.lhs.isdigit():
+            targ = self.caller.search(self.lhs)
+            page = self.rhs
         else:
             targ = self.caller
         if not targ:
             return
         # staff are only permitted to view the flagged log
         if not self.switches or targ != self.caller:
-            self.view_flagged_log(targ)
+            self.view_flagged_log(targ, page)
             return
         if "previous" in self.switches:
-            self.view_previous_log(targ)
+            self.view_previous_log(targ, page)
             return
         if "current" in self.switches:
-            self.view_current_log(targ)
+            self.view_current_log(targ, page)
             return
         if "purge" in self.switches:
             targ.current_log = []
@@ -18,7 +18,7 @@ from web.character.models import PlayerAccount
 from world.dominion.models import CraftingRecipe
 from typeclasses.readable.readable import CmdWrite
 
-from . import story_actions, overrides, social, staff_commands, roster, crafting, jobs, xp, help, general
+from . import story_actions, overrides, social, staff_commands, roster, crafting, jobs, xp, help, general, maps
 
 
 class CraftingTests(TestEquipmentMixins, ArxCommandTest):
@@ -79,13 +79,12 @@ class CraftingTests(TestEquipmentMixins, ArxCommandTest):
         self.assertEqual(created_obj.desc, "[[TEMPLATE_1]]")
         self.assertEqual(self.template1.applied_to.get(), created_obj)
 
-        created_obj.return_appearance(self.char1)
-
-        self.assertIsNotNone(created_obj.ndb.cached_template_desc)
+        self.assertIn(self.template1.desc, created_obj.return_appearance(self.char1))
 
+        self.template1.desc = "An edited templated description."
         self.template1.save()
 
-        self.assertIsNone(created_obj.ndb.cached_template_desc)
+        self.assertIn("An edited templated description.", created_obj.return_appearance(self.char1))
 
         self.setup_cmd(crafting.CmdCraft, self.char2)
         self.call_cmd("{}".format(recipe.name), None)
@@ -119,13 +118,12 @@ class CraftingTests(TestEquipmentMixins, ArxCommandTest):
         self.assertEqual(created_obj.desc, "[[TEMPLATE_1]]")
         self.assertEqual(self.template1.applied_to.get(), created_obj)
 
-        created_obj.return_appearance(self.char1)
-
-        self.assertIsNotNone(created_obj.ndb.cached_template_desc)
+        self.assertIn(self.template1.desc, created_obj.return_appearance(self.char1))
 
+        self.template1.desc = "An edited templated description."
         self.template1.save()
 
-        self.assertIsNone(created_obj.ndb.cached_template_desc)
+        self.assertIn("An edited templated description.", created_obj.return_appearance(self.char1))
 
         self.setup_cmd(CmdWrite, self.char2)
         self.call_cmd("[[TEMPLATE_1]] and [[TEMPLATE_2]]",
@@ -512,6 +510,11 @@ class OverridesTests(TestEquipmentMixins, ArxCommandTest):
     def test_cmd_who(self):
         self.setup_cmd(overrides.CmdWho, self.account2)
         self.call_cmd("asdf", "Players:\n\nPlayer name Fealty Idle \n\nShowing 0 out of 1 unique account logged in.")
+        self.call_cmd("/watch", "Players:\n\nPlayer name Fealty Idle \n\nShowing 0 out of 1 unique account logged in.")
+        from server.utils.presence import PRESENCE
+        self.account.db.hide_from_watch = True
+        PRESENCE.refresh(self.account)
+        self.call_cmd("", "Players:\n\nPlayer name Fealty Idle \n\n0 unique accounts logged in.")
 
 
 # noinspection PyUnresolvedReferences
@@ -787,8 +790,25 @@ class SocialTests(ArxCommandTest):
         self.call_cmd("this is a test mood", 'Old mood was: |'
                                              '(OOC)The scene set/room mood is now set to: this is a test mood')
         self.assertEqual(self.room1.db.room_mood[2], "this is a test mood")
+        self.assertIn("Current Room Mood:{n this is a test mood", self.room1.return_appearance(self.char2))
         self.call_cmd("", "Old mood was: this is a test mood|Mood erased.")
         self.assertEqual(self.room1.db.room_mood, None)
+        self.assertNotIn("Current Room Mood", self.room1.return_appearance(self.char2))
+
+    def test_room_appearance_cache(self):
+        self.room1.desc = "A quiet room."
+        appearance = self.room1.return_appearance(self.char2)
+        self.assertIn("A quiet room.", appearance)
+        self.assertIn("Char", appearance)
+        self.assertNotIn("+shop", appearance)
+        self.room1.tags.add("shop")
+        self.assertIn("You can {c+shop{w here.", self.room1.return_appearance(self.char2))
+        self.room1.tags.remove("shop")
+        self.room1.desc = "A loud room."
+        appearance = self.room1.return_appearance(self.char2)
+        self.assertNotIn("+shop", appearance)
+        self.assertIn("A loud room.", appearance)
+        self.assertNotIn("A quiet room.", appearance)
 
     @patch.object(social, "inform_staff")
     def test_cmd_favor(self, mock_inform_staff):
@@ -999,6 +1019,27 @@ class StaffCommandTests(ArxCommandTest):
         self.assertEqual(self.assetowner.legend, 200)
         self.assertEqual(self.assetowner2.legend, 1200)
 
+    @patch("server.utils.arx_more.msg")
+    @patch.object(staff_commands, "inform_staff")
+    def test_cmd_view_log(self, mock_inform_staff, mock_more_msg):
+        self.setup_cmd(staff_commands.CmdViewLog, self.account2)
+        for num in range(25):
+            self.account2.log_message(self.char1, "Hello %s" % num)
+        self.account2.log_message(self.obj1, "Hi there")
+        self.account2.log_message(self.char1, "Hello 0")
+        self.assertEqual(len(self.account2.current_log), 26)
+        self.call_cmd("/current 2", "Viewing Testaccount2's current log")
+        mock_more_msg.assert_called_with(self.account2, "\n".join(
+            ["{wFrom: {cChar {wMsg:{n Hello %s" % num for num in range(20, 25)] +
+            ["{wFrom: {cObj {wMsg:{n Hi there", "{wPage 2 of 2.{n"]))
+        self.call_cmd("/report testaccount", "Flagging that log for review.")
+        mock_inform_staff.assert_called_with("Testaccount2 has reported Testaccount for bad behavior. Please use "
+                                             "@view_log to check it out.")
+        self.assertEqual(len(self.account2.flagged_log), 25)
+        self.assertEqual(self.account2.flagged_log.entries()[-1][:2], (self.char1, "Hello 24"))
+        self.call_cmd("/purge", "All logs for Testaccount2 cleared.")
+        self.assertEqual(len(self.account2.flagged_log), 0)
+
 
 class StaffCommandTestsPlus(ArxCommandTest):
     num_additional_characters = 1
@@ -1246,9 +1287,27 @@ class XPCommandTests(ArxCommandTest):
         self.assertEqual(self.char2.db.skills.get("seduction"), 6)
         self.assertEqual(stats_and_skills.get_skill_cost(self.char2, "dodge"), 43)
         self.assertEqual(stats_and_skills.get_skill_cost_increase(self.char2), 1.0775)
+        costs = stats_and_skills.get_advancement_costs(self.char2)
+        self.assertIs(stats_and_skills.get_advancement_costs(self.char2), costs)
+        self.assertEqual(costs.skills["dodge"], (0, 6, 43, None))
+        self.assertEqual(costs.skills["seduction"].reason, "seduction is already at its maximum.")
+        self.call_cmd("/cost seduction", "seduction is already at its maximum.")
         self.char2.db.trainer = self.char1
         self.char1.db.skills = {"teaching": 5, "dodge": 2}
+        self.assertEqual(stats_and_skills.get_advancement_costs(self.char2).skills["dodge"].cost, 24)
         self.call_cmd("/spend dodge", 'You spend 24 xp and have 0 remaining.|You have increased your dodge to 1.')
+        # the table is kept until something it's built from is changed, by any means
+        costs = stats_and_skills.get_advancement_costs(self.char2)
+        self.assertIs(stats_and_skills.get_advancement_costs(self.char2), costs)
+        self.assertEqual(costs.skills["dodge"].current, 1)
+        self.char2.db.skills["dodge"] = 2
+        costs = stats_and_skills.get_advancement_costs(self.char2)
+        self.assertEqual(costs.skills["dodge"].current, 2)
+        self.char2.db.strength = 4
+        self.assertEqual(stats_and_skills.get_advancement_costs(self.char2).stats["strength"].current, 4)
+        costs = stats_and_skills.get_advancement_costs(self.char2)
+        ServerConfig.objects.conf("CHARGEN_BONUS_SKILL_POINTS", 6)
+        self.assertIsNot(stats_and_skills.get_advancement_costs(self.char2), costs)
         # TODO: other switches
 
     def test_award_xp(self):
@@ -1263,6 +1322,24 @@ class XPCommandTests(ArxCommandTest):
         self.account2.inform.assert_called_with('You have been awarded 15 xp: hi u r gr8', category="XP")
 
 
+class MapCommandTests(ArxCommandTest):
+    def test_map_commands(self):
+        from evennia.utils.create import create_object
+        from typeclasses.map import Map
+        crownward = create_object(Map, key="Crownward")
+        self.setup_cmd(maps.CmdMapRoom, self.char1)
+        self.call_cmd("crownward=0,1,C", "Added %s at (0, 1)." % self.room1)
+        self.room2.db.x_coord, self.room2.db.y_coord, self.room2.db.map_icon = 1, 0, "R2"
+        crownward.add_room(self.room2)
+        self.assertEqual(crownward.draw_map(self.room1), "\n{gXX{n-  \n  -R2")
+        self.assertEqual(crownward.draw_map(self.room2), "\nC -  \n  -{gXX{n")
+        self.assertEqual(crownward.draw_map(self.room1, destination=self.room2), "\n{gXX{n-  \n  -{rXX{n")
+        self.call_cmd("/clear crownward=1,0", "Location (1, 0) will be a blank space.")
+        self.assertEqual(crownward.draw_map(self.room1, destination=self.room2), "\n{gXX{n-  \n  -  ")
+        self.assertEqual(list(crownward.grid.keys()), [(0, 1)])
+        self.assertEqual(tuple(crownward.grid[(0, 1)]), (self.room1.id, "C"))
+
+
 class HelpCommandTests(ArxCommandTest):
     def test_cmd_help(self):
         from evennia.help.models import HelpEntry
@@ -12,6 +12,7 @@ other players xp awards for good roleplay.
 from commands.base import ArxCommand, ArxPlayerCommand
 from world import stats_and_skills
 from server.utils.arx_utils import inform_staff
+from server.utils.prettytable import PrettyTable
 from evennia.utils.utils import list_to_string
 from evennia.accounts.models import AccountDB
 
@@ -22,12 +23,13 @@ class CmdUseXP(ArxCommand):
     Usage:
         xp
         xp/spend  <stat or skill name>
-        xp/cost   <stat or skill name>
+        xp/cost   [<stat or skill name>]
         xp/transfer <alt>=<amount>
 
     Displays how much xp you have available when used with no arguments,
     and allows you to spend xp to increase stats or skills with the
-    /spend switch. Costs can be reduced by finding a teacher who is willing
+    /spend switch. xp/cost with no name lists the cost of raising every
+    stat, skill and ability. Costs can be reduced by finding a teacher who is willing
     to use the '{wtrain{n' command on you, and has a skill or stat of the
     appropriate rank you're trying to achieve. The training bonus vanishes
     when xp is spent.
@@ -61,6 +63,16 @@ class CmdUseXP(ArxCommand):
         else:
             caller.msg(", ".join(ability for ability in abilities))
 
+    def display_costs(self):
+        """Lists the costs of every stat, skill and ability we could raise"""
+        from server.utils import arx_more
+        costs = stats_and_skills.get_advancement_costs(self.caller)
+        table = PrettyTable(["{wName{n", "{wRating{n", "{wMax{n", "{wCost{n"])
+        for traits in (costs.stats, costs.skills, costs.abilities):
+            for name, trait in traits.items():
+                table.add_row([name, trait.current, trait.maximum, "--" if trait.reason else trait.cost])
+        arx_more.msg(self.caller, str(table), justify_kwargs=False)
+
     def transfer_xp(self):
         targ = self.caller.player.search(self.lhs)
         if not targ:
@@ -105,6 +117,13 @@ class CmdUseXP(ArxCommand):
         spec_warning = False
         if self.cmdstring == "learn":
             self.switches.append("spend")
+        if not caller.db.skills:
+            caller.db.skills = {}
+        if not caller.db.abilities:
+            caller.db.abilities = {}
+        if not self.args and "cost" in self.switches:
+            self.display_costs()
+            return
         if not self.args:
             # Just display our xp
             self.display_traits()
@@ -113,25 +132,23 @@ class CmdUseXP(ArxCommand):
             self.transfer_xp()
             return
         args = self.args.lower()
-        # get cost already factors in if we have a trainer, so no need to check
+        # costs already factor in if we have a trainer, so no need to check
+        trait = None
+        if args not in stats_and_skills.DOM_SKILLS:
+            trait = stats_and_skills.get_advancement_costs(caller).get(args)
         if args in stats_and_skills.VALID_STATS:
-            cost = stats_and_skills.get_stat_cost(caller, args)
-            current = caller.attributes.get(args)
-            if current >= 5:
-                caller.msg("%s is already at its maximum." % args)
+            current = trait.current
+            if trait.reason:
+                caller.msg(trait.reason)
                 return
+            cost = trait.cost
             stype = "stat"
         elif args in stats_and_skills.VALID_SKILLS:
-            if not caller.db.skills:
-                caller.db.skills = {}
-            current = caller.db.skills.get(args, 0)
-            if current >= 6:
-                caller.msg("%s is already at its maximum." % args)
+            current = trait.current
+            if trait.reason:
+                caller.msg(trait.reason)
                 return
-            if current >= 5 and stats_and_skills.get_skill_cost_increase(caller) <= -1.0:
-                caller.msg("You cannot buy a legendary skill while you still have catchup xp remaining.")
-                return
-            cost = stats_and_skills.get_skill_cost(caller, args)
+            cost = trait.cost
             stype = "skill"
         elif args in stats_and_skills.DOM_SKILLS:
             try:
@@ -147,52 +164,21 @@ class CmdUseXP(ArxCommand):
                 caller.msg("Dominion object not found.")
                 return
         elif args in stats_and_skills.VALID_ABILITIES:
-            if not caller.db.abilities:
-                caller.db.abilities = {}
             # if we don't have it, determine if we can learn it
-            current = caller.db.abilities.get(args, 0)
-            if not current:
-                if args in stats_and_skills.CRAFTING_ABILITIES:
-                    # check if we have valid skill:
-                    if args == "tailor" and "sewing" not in caller.db.skills:
-                        caller.msg("You must have sewing to be a tailor.")
-                        return
-                    if (args == "weaponsmith" or args == "armorsmith") and "smithing" not in caller.db.skills:
-                        caller.msg("You must have smithing to be a %s." % args)
-                        return
-                    if args == "apothecary" and "alchemy" not in caller.db.skills:
-                        caller.msg("You must have alchemy to be an apothecary.")
-                        return
-                    if args == "leatherworker" and "tanning" not in caller.db.skills:
-                        caller.msg("You must have tanning to be a leatherworker.")
-                        return
-                    if args == "carpenter" and "woodworking" not in caller.db.skills:
-                        caller.msg("You must have woodworking to be a carpenter.")
-                        return
-                    if args == "jeweler" and "smithing" not in caller.db.skills:
-                        caller.msg("You must have smithing to be a jeweler.")
-                        return
-                    spec_warning = True
-                elif not caller.check_permstring(args):
-                    caller.msg("You do not have permission to learn %s." % args)
-                    return
-                else:
-                    spec_warning = False
-            if current >= 6:
-                caller.msg("%s is already at its maximum." % args)
+            current = trait.current
+            if (not current and args not in stats_and_skills.CRAFTING_ABILITIES
+                    and not caller.check_permstring(args)):
+                caller.msg("You do not have permission to learn %s." % args)
                 return
-            if args in stats_and_skills.CRAFTING_ABILITIES:
-                spec_warning = True
+            if trait.reason:
+                caller.msg(trait.reason)
+                return
+            spec_warning = args in stats_and_skills.CRAFTING_ABILITIES
             if current == 5:
-                if any(key for key, value in caller.db.abilities.items()
-                       if key in stats_and_skills.CRAFTING_ABILITIES and value >= 6):
-                    caller.msg("You have already chosen a crafting specialization.")
-                    return
-                else:
-                    set_specialization = True
-                    spec_warning = False
+                set_specialization = True
+                spec_warning = False
             stype = "ability"
-            cost = stats_and_skills.get_ability_cost(caller, args)
+            cost = trait.cost
         else:
             caller.msg("'%s' wasn't identified as a stat, ability, or skill." % self.args)
             return
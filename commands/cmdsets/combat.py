@@ -42,6 +42,8 @@ def start_fight_at_room(room, caller=None, exclude_list=None):
     cscript = create.create_script(CSCRIPT, obj=room)
     room.ndb.combat_manager = cscript
     cscript.ndb.combat_location = room
+    # everyone here may be checking health change triggers, so cache them all at once
+    room.triggerhandler.warm_room_cache()
     if caller:
         caller_string = caller.key
         announce_exclude = exclude_list + [caller]
@@ -1333,7 +1335,7 @@ class CmdCreateAntagonist(ArxCommand):
         table = evtable.EvTable("ID", "Name", "Type", "Amt", "Threat", "Location", width=78)
         for npc in npcs:
             ntype = npc_types.get_npc_singular_name(npc.db.npc_type)
-            num = npc.db.num_living if ntype.lower() != "champion" else "Unique"
+            num = getattr(npc, "num_living", None) if ntype.lower() != "champion" else "Unique"
             table.add_row(npc.id, npc.key or "None", ntype, num,
                           npc.db.npc_quality, npc.location.id if npc.location else None)
         self.msg(str(table), options={'box': True})
@@ -1346,18 +1348,18 @@ class CmdCreateAntagonist(ArxCommand):
         except (ValueError, TypeError, IndexError):
             self.msg("Must give two integer values on right hand side.")
             return
+        from typeclasses.npcs.npc import spawn_npc
         msg = "Created new "
         if "boss" in self.switches:
-            npc = create.create_object(key=name, typeclass=self.BOSS)
-            npc.boss_rating = value
-            qty = 1
+            typeclass, qty = self.BOSS, 1
             msg += "boss with rating of %s " % value
         else:
-            npc = create.create_object(key=name, typeclass=self.MOOKS)
-            qty = value
+            typeclass, qty = self.MOOKS, value
             msg += "mooks with quantity of %s " % qty
         msg +=  "and threat of %s." % threat
-        npc.setup_npc(self.ntype, threat, qty, sing_name=name, plural_name=name)
+        npc = spawn_npc(typeclass, name, self.ntype, threat, qty, sing_name=name, plural_name=name)
+        if "boss" in self.switches:
+            npc.boss_rating = value
         self.msg(msg)
     
     def get_npc(self, args):
@@ -1439,7 +1441,7 @@ class CmdCreateAntagonist(ArxCommand):
     
     def adjust_spawn_quantity(self, npc):
         try:
-            npc.db.num_living = int(self.rhs)
+            npc.num_living = int(self.rhs)
         except (TypeError, ValueError):
             self.msg("Quantity must be a number.")
         else:
@@ -3,6 +3,8 @@ Tests for different command sets.
 """
 from mock import patch, Mock
 
+from evennia.utils import create
+
 from server.utils.test_utils import ArxCommandTest
 from . import combat, market
 
@@ -125,9 +127,37 @@ class CombatCommandsTests(ArxCommandTest):
     def test_cmd_combat_status(self, mock_inform_staff):
         self.setup_cmd(combat.CmdFightStatus, self.char1)
         self.call_cmd("", "No combat found at your location.")
-        self.start_fight(self.char2)
+        fight = self.start_fight(self.char2)
+        self.call_cmd("", "Combatant Damage Fatigue Action Ready? \n"
+                          "Char2     no     0       None   no     \nCurrent Round: 0")
+        status_table = fight.ndb.status_table
         self.call_cmd("", "Combatant Damage Fatigue Action Ready? \n"
                           "Char2     no     0       None   no     \nCurrent Round: 0")
+        self.assertIs(fight.ndb.status_table, status_table)
+        # a combatant's row changes when their state does
+        self.char2.combat.state.ready = True
+        self.call_cmd("", "Combatant Damage Fatigue Action Ready? \n"
+                          "Char2     no     0       None   yes    \nCurrent Round: 0")
+
+    def test_combat_status_order(self, mock_inform_staff):
+        self.setup_cmd(combat.CmdFightStatus, self.char1)
+        self.start_fight(self.char1, self.char2)
+        self.call_cmd("", "Combatant Damage Fatigue Action Ready? \n"
+                          "Char1     no     0       None   no     \n"
+                          "Char2     no     0       None   no     \nCurrent Round: 0")
+        # readying moves a combatant up the table straight away
+        self.char2.combat.state.ready = True
+        self.call_cmd("", "Combatant Damage Fatigue Action Ready? \n"
+                          "Char2     no     0       None   yes    \n"
+                          "Char1     no     0       None   no     \nCurrent Round: 0")
+
+    def test_start_fight_in_shardhaven(self, mock_inform_staff):
+        # shardhaven exits have no triggerhandler, so warming the room's trigger caches has to skip them
+        create.create_object("typeclasses.exits.ShardhavenInstanceExit", key="north", location=self.room1,
+                             destination=self.room2)
+        fight = self.start_fight(self.char2)
+        self.assertTrue(self.char2.combat.state in fight.ndb.combatants)
+        self.assertEqual(self.char2.combat.combat, fight)
 
     def test_cmd_admin_combat(self, mock_inform_staff):
         self.setup_cmd(combat.CmdAdminCombat, self.char1)
@@ -175,6 +205,44 @@ class CombatCommandsTests(ArxCommandTest):
         self.setup_cmd(combat.CmdCreateAntagonist, self.char1)
         self.call_cmd("/boss testboss=2,5", "Created new boss with rating of 2 and threat of 5.")
         self.call_cmd("testboss=testmsg", "You spawn testboss.|testmsg")
+        self.call_cmd("/mooks testmooks=3,1", "Created new mooks with quantity of 3 and threat of 1.")
+        mooks = combat.ObjectDB.objects.get(db_key="3 testmooks")
+        # stats come from the shared template rather than being stored on each npc
+        self.assertFalse(mooks.attributes.get("strength", category=None, return_obj=True))
+        self.assertEqual(mooks.attributes.get("strength"), 3)
+        self.assertEqual(mooks.db.skills["medium wpn"], 1)
+        self.assertEqual(mooks.db.armor_class, 10)
+        mooks.db.skills["medium wpn"] += 2
+        self.assertEqual(mooks.db.skills["medium wpn"], 3)
+        self.assertEqual(mooks.npc_template.skills["medium wpn"], 1)
+        self.call_cmd("/threat %s=2" % mooks.id, "3 testmooks threat set to 2.")
+        self.assertEqual(mooks.db.skills["medium wpn"], 2)
+        # outside of combat, losses are saved right away
+        mooks.multideath(1, death=True)
+        self.assertEqual(mooks.db.num_living, 2)
+        self.assertEqual(mooks.db.num_dead, 1)
+        # in combat, they're held until the round ends
+        mooks.combat.state = Mock()
+        mooks.multideath(5)
+        mooks.real_dmg = 20
+        self.assertEqual(mooks.quantity, 0)
+        self.assertEqual(mooks.real_dmg, 20)
+        self.assertEqual(mooks.db.num_living, 2)
+        self.assertFalse(mooks.db.damage)
+        self.assertEqual(mooks.save_losses(), 2)
+        self.assertEqual(mooks.db.num_living, 0)
+        self.assertEqual(mooks.db.num_incap, 2)
+        self.assertEqual(mooks.db.damage, 20)
+        # a heal during the round is kept by the next save rather than overwritten by it
+        with patch("typeclasses.npcs.npc.do_dice_check", return_value=5):
+            mooks.recovery_test()
+        self.assertEqual(mooks.real_dmg, 15)
+        self.assertEqual(mooks.db.damage, 20)
+        mooks.save_losses()
+        self.assertEqual(mooks.db.damage, 15)
+        mooks.combat.state = None
+        self.call_cmd("/quantity %s=4" % mooks.id, "3 testmooks quantity set to 4.")
+        self.assertEqual(mooks.quantity, 4)
 
     @patch("server.utils.arx_utils.inform_staff")
     @patch('typeclasses.scripts.combat.attacks.randint')
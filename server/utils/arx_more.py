@@ -1,8 +1,11 @@
 """
 Arx implementation of EvMore pager
 
+Text can be given as a string or as an iterable of strings, such as a generator of lines, which
+are read as if they'd been joined together. Pages are cut from the text lazily, as the reader
+pages forward, by walking offsets through it rather than copying what's left after each page.
 """
-from builtins import object, range
+from builtins import object
 
 from django.conf import settings
 from evennia.commands.command import Command
@@ -23,17 +26,105 @@ _DISPLAY = \
 """{text}
 (|wmore|n [{pageno}/{pagemax}] |wn|next|||wb|nack|||wt|nop|||we|nnd|||wq|nuit)"""
 
+# size of pages when paging by characters, and how far past it we look for a line break to end it
+PAGE_LENGTH = 3000
+MARGIN = 1000
 
-def find_newline_seperator(text):
+
+def find_newline_seperator(text, start=0, end=None):
+    """
+    Finds a line break in text[start:end], trying each kind of separator in turn. Returns the
+    index just past it, relative to start, or -1 if there's none.
+    """
+    if end is None:
+        end = len(text)
     seps = ("\n", "|/", "{/", "%r")
     index = -1
     for sep in seps:
-        index = text.find(sep)
+        index = text.find(sep, start, end)
         if index != -1:
-            return index + len(sep)
+            return index - start + len(sep)
     return index
 
 
+def _page_end(text, start, page_length, margin):
+    """Returns where a page starting at start should end, at a line break in the margin if there is one."""
+    low = start + page_length
+    return low + find_newline_seperator(text, low, low + margin)
+
+
+def paginate_by_char(chunks, page_length=PAGE_LENGTH, margin=MARGIN):
+    """
+    Generator of pages of about page_length characters, each ended at the first line break found in
+    the margin after it. Every page after the first begins with a newline, which counts toward its length.
+
+        Args:
+            chunks: Iterable of strings, read as if they were joined together.
+            page_length (int): How long a page is before we look for a line break to end it.
+            margin (int): How far past page_length we look for one.
+    """
+    pending = []
+    pending_length = 0
+    prefix = ""
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_length += len(chunk)
+        if len(prefix) + pending_length < page_length + margin:
+            continue
+        text = "".join(pending)
+        start = 0
+        # a page is only cut once all of the margin after it has been read
+        while len(prefix) + len(text) - start >= page_length + margin:
+            end = _page_end(text, start, page_length - len(prefix), margin)
+            yield prefix + text[start:end]
+            prefix, start = "\n", end
+        pending = [text[start:]]
+        pending_length = len(pending[0])
+    text = "".join(pending)
+    start = 0
+    while len(prefix) + len(text) - start > page_length:
+        end = _page_end(text, start, page_length - len(prefix), margin)
+        yield prefix + text[start:end]
+        prefix, start = "\n", end
+    yield prefix + text[start:]
+
+
+def paginate_by_line(chunks, height):
+    """
+    Generator of pages of height lines each.
+
+        Args:
+            chunks: Iterable of strings, read as if they were joined together.
+            height (int): Number of lines on a page.
+    """
+    page = []
+    # pieces of a line that's been split across chunks
+    partial = []
+    for chunk in chunks:
+        lines = chunk.split("\n")
+        if len(lines) == 1:
+            partial.append(chunk)
+            continue
+        partial.append(lines[0])
+        lines[0] = "".join(partial)
+        partial = [lines.pop()]
+        for line in lines:
+            page.append(line)
+            if len(page) == height:
+                yield "\n".join(page)
+                page = []
+    page.append("".join(partial))
+    yield "\n".join(page)
+
+
+def justify_chunks(chunks, **justify_kwargs):
+    """Justifies each chunk on its own, separating them with line breaks."""
+    for num, chunk in enumerate(chunks):
+        if num:
+            yield "\n"
+        yield justify(chunk, **justify_kwargs)
+
+
 class CmdMore(Command):
     """
     Manipulate the text paging
@@ -116,7 +207,10 @@ class EvMore(object):
 
         Args:
             caller (Object or Player): Entity reading the text.
-            text (str): The text to put under paging.
+            text (str or iterable): The text to put under paging, or an iterable
+                of strings, such as lines or blocks of text, read as if they were
+                joined together. Only as much of an iterable as the reader pages
+                through is read.
             always_page (bool, optional): If `False`, the
                 pager will only kick in if `text` is too big
                 to fit the screen.
@@ -124,7 +218,8 @@ class EvMore(object):
                 to determine the screen width and will receive all output.
             justify_kwargs (dict, bool or None, optional): If given, this should
                 be valid keyword arguments to the utils.justify() function. If False,
-                no justification will be done.
+                no justification will be done. Each string from an iterable is
+                justified separately.
             kwargs (any, optional): These will be passed on
                 to the `caller.msg` method.
 
@@ -132,8 +227,8 @@ class EvMore(object):
         self._caller = caller
         self._kwargs = kwargs
         self._pages = []
-        self._npages = []
-        self._npos = []
+        self._source = None
+        self._pos = 0
         self._exit_msg = "Exited |wmore|n pager."
         if not session:
             # if not supplied, use the first session to
@@ -143,7 +238,12 @@ class EvMore(object):
                 return
             session = sessions[0]
         self._session = session
-        text = caller.strip_ascii_from_tags(text)
+        if isinstance(text, str):
+            text = caller.strip_ascii_from_tags(text)
+            chunks = [text]
+        else:
+            chunks = (caller.strip_ascii_from_tags(chunk) for chunk in text)
+            text = None
 
         # set up individual pages for different sessions
         height = max(4, session.protocol_flags.get("SCREENHEIGHT", {0:_SCREEN_HEIGHT})[0] - 4)
@@ -151,35 +251,26 @@ class EvMore(object):
 
         pages_by_char = kwargs.pop('pages_by_char', False)
         if pages_by_char:
-            PAGE_LENGTH = 3000
-            MARGIN = 1000
-            while len(text) > PAGE_LENGTH:
-                index = find_newline_seperator(text[PAGE_LENGTH:PAGE_LENGTH+MARGIN])
-                sep = PAGE_LENGTH + index
-                self._pages.append(text[:sep])
-                text = "\n" + text[sep:]
-            self._pages.append(text)
+            self._source = paginate_by_char(chunks)
         else:
-            if justify_kwargs is False:
-                # no justification. Simple division by line
-                lines = text.split("\n")
-            else:
+            if justify_kwargs is not False:
                 # we must break very long lines into multiple ones
                 justify_kwargs = justify_kwargs or {}
                 width = justify_kwargs.get("width", width)
                 justify_kwargs["width"] = width
                 justify_kwargs["align"] = justify_kwargs.get("align", 'l')
                 justify_kwargs["indent"] = justify_kwargs.get("indent", 0)
-
-                lines = justify(text, **justify_kwargs).split("\n")
+                chunks = justify_chunks(chunks, **justify_kwargs)
 
             # always limit number of chars to 10 000 per page
             height = min(10000 // width, height)
-            self._pages = ["\n".join(lines[i:i+height]) for i in range(0, len(lines), height)]
-        self._npages = len(self._pages)
-        self._npos = 0
-        if self._npages <= 1 and not always_page:
+            self._source = paginate_by_line(chunks, height)
+        # we only need to know whether there's more than one page to decide on paging
+        self._read_pages(2)
+        if len(self._pages) <= 1 and not always_page:
             # no need for paging; just pass-through.
+            if text is None:
+                text = self._pages[0] if self._pages else ""
             caller.msg(text=text, **kwargs)
         else:
             # go into paging mode
@@ -190,15 +281,32 @@ class EvMore(object):
             # goto top of the text
             self.page_top()
 
+    def _read_pages(self, count=None):
+        """
+        Cuts pages from our text until we have count of them, or all of them if count is None.
+        """
+        while self._source and (count is None or len(self._pages) < count):
+            try:
+                self._pages.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    @property
+    def _npages(self):
+        return len(self._pages)
+
     def display(self):
         """
         Pretty-print the page.
         """
         pos = self._pos
+        # read ahead one page, so we know whether this is the last one
+        self._read_pages(pos + 2)
         text = self._pages[pos]
+        pagemax = "%s%s" % (self._npages, "+" if self._source else "")
         page = _DISPLAY.format(text=text,
                                pageno=pos + 1,
-                               pagemax=self._npages)
+                               pagemax=pagemax)
         if not page or not text:
             self.page_quit()
         # check for wrong session
@@ -215,6 +323,7 @@ class EvMore(object):
         """
         Display the bottom page.
         """
+        self._read_pages()
         self._pos = self._npages - 1
         self.display()
 
@@ -223,6 +332,7 @@ class EvMore(object):
         Scroll the text to the next page. Quit if already at the end
         of the page.
         """
+        self._read_pages(self._pos + 2)
         if self._pos >= self._npages - 1:
             # exit if we are already at the end
             self.page_quit()
@@ -252,7 +362,8 @@ def msg(caller, text="", always_page=False, session=None, justify_kwargs=None, *
 
     Args:
         caller (Object or Player): Entity reading the text.
-        text (str): The text to put under paging.
+        text (str or iterable): The text to put under paging, or an iterable
+            of strings read as if they were joined together.
         always_page (bool, optional): If `False`, the
             pager will only kick in if `text` is too big
             to fit the screen.
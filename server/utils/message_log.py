@@ -0,0 +1,114 @@
+"""
+Logs of the messages an account receives from other players.
+
+Each log holds at most MAX_LOG_LENGTH entries: appending is O(1), and once a
+log is full its oldest entry is dropped. Entries are indexed by sender, so
+reporting a player pulls out their lines without scanning everything else
+that was said, and entries are kept in time order so a page of the log, or
+the entries since a given time, can be found without walking the whole log.
+Logs are persisted as plain lists of (sender, text, time) tuples, which is
+also the format read back from older attributes that lack the time.
+"""
+from bisect import bisect_left
+from collections import deque
+from heapq import merge
+from itertools import islice
+import time
+
+MAX_LOG_LENGTH = 1000
+LOG_PAGE_SIZE = 20
+
+
+class MessageLog(object):
+    """A bounded, append-only log of (sender, text, time) entries."""
+
+    def __init__(self, entries=(), maxlen=MAX_LOG_LENGTH):
+        self.maxlen = maxlen
+        # entries before _first are dropped, and are compacted away once there are enough of them
+        self._entries = []
+        self._times = []
+        self._offset = 0
+        self._first = 0
+        self._by_sender = {}
+        self._counts = {}
+        for entry in entries:
+            self.append(*entry)
+
+    def __len__(self):
+        return self._offset + len(self._entries) - self._first
+
+    def __iter__(self):
+        return islice(self._entries, self._first - self._offset, None)
+
+    def __contains__(self, sender_and_text):
+        return sender_and_text in self._counts
+
+    def append(self, sender, text, timestamp=None):
+        """Adds an entry to the end of the log, dropping the oldest if we're full."""
+        if timestamp is None:
+            timestamp = time.time()
+        position = self._offset + len(self._entries)
+        self._entries.append((sender, text, timestamp))
+        self._times.append(timestamp)
+        self._by_sender.setdefault(sender, deque()).append(position)
+        key = (sender, text)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        if len(self) > self.maxlen:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        sender, text, _ = self._entries[self._first - self._offset]
+        positions = self._by_sender[sender]
+        positions.popleft()
+        if not positions:
+            del self._by_sender[sender]
+        key = (sender, text)
+        self._counts[key] -= 1
+        if not self._counts[key]:
+            del self._counts[key]
+        self._first += 1
+        dropped = self._first - self._offset
+        if dropped >= self.maxlen:
+            del self._entries[:dropped]
+            del self._times[:dropped]
+            self._offset = self._first
+
+    def positions(self, senders=None, since=None):
+        """
+        Returns the positions of the entries from any of the given senders, or all entries, made
+        at or after the since timestamp, in order.
+        """
+        start = self._first
+        if since is not None:
+            start = self._offset + bisect_left(self._times, since, self._first - self._offset)
+        if senders is None:
+            return range(start, self._offset + len(self._entries))
+        indexes = [self._by_sender.get(sender, ()) for sender in senders]
+        return [pos for pos in merge(*indexes) if pos >= start]
+
+    def entries(self, senders=None, since=None):
+        """Returns a list of the entries matching the filters of positions."""
+        return [self._entries[pos - self._offset] for pos in self.positions(senders, since)]
+
+    def page(self, number, size=LOG_PAGE_SIZE, senders=None, since=None):
+        """Returns the entries on a page of the log, counting from 1."""
+        start = (number - 1) * size
+        positions = self.positions(senders, since)[start:start + size]
+        return [self._entries[pos - self._offset] for pos in positions]
+
+    def page_count(self, size=LOG_PAGE_SIZE, senders=None, since=None):
+        return max(1, -(-len(self.positions(senders, since)) // size))
+
+    def to_list(self):
+        """Returns our entries as a list of tuples for saving in an attribute."""
+        return list(self)
+
+    @classmethod
+    def from_list(cls, entries):
+        """Builds a log from a saved list. Older entries are (sender, text) pairs with no time."""
+        log = cls()
+        for entry in entries or ():
+            if len(entry) == 2:
+                entry = (entry[0], entry[1], 0)
+            log.append(*entry)
+        return log
@@ -1,10 +1,31 @@
+"""
+Weighted random choices.
+
+A WeightedPicker is compiled into an alias table (Vose's method) the first time it
+picks, so every pick afterwards takes constant time however many options it has.
+Options with no weight are never picked. get_picker returns compiled pickers for a
+given set of options from a cache, for callers that pick from the same options
+over and over.
+"""
+from collections import OrderedDict
 import random
 
+MAX_CACHED_PICKERS = 256
+
 
 class WeightedPicker(object):
 
-    def __init__(self):
+    def __init__(self, options=None):
+        """
+        :param options: Optional iterable of (option, weight) pairs to add to the picker.
+        """
         self.choices = []
+        self._options = None
+        self._chances = None
+        self._aliases = None
+        self._total = 0
+        for option, weight in options or ():
+            self.add_option(option, weight)
 
     def add_option(self, option, weight):
         """
@@ -18,39 +39,101 @@ class WeightedPicker(object):
             raise ValueError("Weight must be an integer value.")
 
         self.choices.append((option, weight))
+        self._options = None
+
+    def compile(self):
+        """
+        Builds the alias table for our options. Each slot of the table holds an option and
+        its chance out of our total weight of being picked, with the rest going to its alias.
+        :return: This picker, so it can be compiled as it's made.
+        """
+        choices = [(option, weight) for option, weight in self.choices if weight > 0]
+        if not choices:
+            # with no weights at all, every option is as likely as any other
+            choices = [(option, 1) for option, weight in self.choices]
+        num = len(choices)
+        total = sum(weight for option, weight in choices)
+        # scale each weight so that an average option's is the total, keeping to integers
+        scaled = [weight * num for option, weight in choices]
+        chances = [total] * num
+        aliases = list(range(num))
+        small = [index for index, weight in enumerate(scaled) if weight < total]
+        large = [index for index, weight in enumerate(scaled) if weight >= total]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            chances[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] += scaled[less] - total
+            if scaled[more] < total:
+                small.append(more)
+            else:
+                large.append(more)
+        self._options = [option for option, weight in choices]
+        self._chances = chances
+        self._aliases = aliases
+        self._total = total
+        return self
 
     def pick(self):
         """
         Picks an option from those given to this WeightedPicker.
         """
-
-        pickerdict = {}
-        current_value = 0
-
         if len(self.choices) == 0:
             return None
 
         if len(self.choices) == 1:
             return self.choices[0][0]
 
-        for option in self.choices:
-            pickerdict[current_value] = option[0]
-            current_value += option[1]
+        if self._options is None:
+            self.compile()
+
+        index = random.randrange(len(self._options))
+        if random.randrange(self._total) >= self._chances[index]:
+            index = self._aliases[index]
+        return self._options[index]
+
+    def pick_many(self, count):
+        """
+        Picks a number of options, each independently of the others.
+        :param count: How many options to pick.
+        :return: A list of the options picked.
+        """
+        if len(self.choices) < 2:
+            return [self.pick() for _ in range(count)]
+
+        if self._options is None:
+            self.compile()
+
+        options = self._options
+        chances = self._chances
+        aliases = self._aliases
+        num = len(options)
+        total = self._total
+        randrange = random.randrange
+        results = []
+        for _ in range(count):
+            index = randrange(num)
+            if randrange(total) >= chances[index]:
+                index = aliases[index]
+            results.append(options[index])
+        return results
 
-        picker = random.randint(0, current_value)
-        last_value = 0
-        result = None
-        sorted_keys = sorted(pickerdict.keys())
 
-        found = False
-        for key in sorted_keys:
-            if key >= picker:
-                result = pickerdict[last_value]
-                found = True
-                continue
-            last_value = key
+_picker_cache = OrderedDict()
 
-        if not found:
-            result = pickerdict[sorted_keys[-1]]
 
-        return result
+def get_picker(options):
+    """
+    Returns a compiled WeightedPicker for the given options, reusing the one made the last
+    time we were given the same options. Pickers from here are shared, so don't add to them.
+    :param options: An iterable of (option, weight) pairs. The options must be hashable.
+    """
+    key = tuple((option, int(weight)) for option, weight in options)
+    picker = _picker_cache.pop(key, None)
+    if picker is None:
+        picker = WeightedPicker(key).compile()
+        if len(_picker_cache) >= MAX_CACHED_PICKERS:
+            _picker_cache.popitem(last=False)
+    _picker_cache[key] = picker
+    return picker
@@ -0,0 +1,132 @@
+"""
+Registry of online accounts for who, watch and similar listings.
+
+Each online account has a PresenceRecord holding everything those listings
+display or filter on, so rendering them doesn't re-read attributes for every
+row. Records are refreshed by the account and character hooks that change
+them (login, puppeting, toggling afk/lrp/hidden), and the set of online
+accounts is reconciled against the session handler whenever its sessions
+change, so a missed logout can't leave a stale entry behind. Long names and
+fealties can be changed by staff at any time, so they're read when rendering
+from the roster snapshot, which attribute signals keep current. Idle times are
+not stored, since they change with every command and are cheap to read.
+"""
+from bisect import bisect_left, insort
+
+from web.character.roster_snapshot import ROSTER_SNAPSHOT
+
+
+class PresenceRecord(object):
+    """Display data for a single online account."""
+
+    def __init__(self, account):
+        self.account = account
+        self.refresh()
+
+    def refresh(self):
+        account = self.account
+        char = account.char_ob
+        self.char = char
+        self.sort_key = account.key.lower()
+        self.name = str(account)
+        self.hidden = bool(account.db.hide_from_watch)
+        self.afk = bool(account.db.afk)
+        self.lrp = bool(account.db.lookingforrp)
+        self.staff = account.is_staff
+
+    def _snapshot_value(self, field):
+        if not self.char:
+            return None
+        ROSTER_SNAPSHOT.load([self.char.id])
+        return ROSTER_SNAPSHOT.columns[field].get(self.char.id)
+
+    @property
+    def longname(self):
+        return self._snapshot_value("longname") or None
+
+    @property
+    def fealty(self):
+        return self._snapshot_value("fealty") or "---"
+
+    def visible_to(self, is_builder):
+        """Same rules as Account.show_online, given whether the viewer is a builder."""
+        if not self.char or not self.hidden:
+            return True
+        return is_builder
+
+    def session(self):
+        """Returns our first logged in session, if any."""
+        for session in self.account.sessions.all():
+            if session.logged_in:
+                return session
+
+
+class PresenceRegistry(object):
+    """Online accounts, kept sorted by name."""
+
+    def __init__(self):
+        self.records = {}
+        self._order = []
+        self._sessions = {}
+
+    def _insert(self, account):
+        record = PresenceRecord(account)
+        self.records[account.id] = record
+        insort(self._order, (record.sort_key, account.id))
+        return record
+
+    def _discard(self, account_id):
+        record = self.records.pop(account_id, None)
+        if record:
+            del self._order[bisect_left(self._order, (record.sort_key, account_id))]
+
+    def _sync(self):
+        """Brings our accounts in line with the logged in sessions, if those have changed."""
+        from evennia.server.sessionhandler import SESSIONS
+        sessions = {}
+        accounts = {}
+        for session in SESSIONS.get_sessions():
+            account = session.account
+            if account and session.logged_in:
+                sessions[session.sessid] = (id(session), id(account))
+                accounts[account.id] = account
+        if sessions == self._sessions:
+            return
+        self._sessions = sessions
+        for account_id, record in list(self.records.items()):
+            if accounts.get(account_id) is not record.account:
+                self._discard(account_id)
+        for account_id, account in accounts.items():
+            if account_id not in self.records:
+                self._insert(account)
+
+    def refresh(self, account):
+        """Re-reads an online account's display data, adding it if we don't have it yet."""
+        if account.id not in self.records:
+            self._insert(account)
+            return
+        record = self.records[account.id]
+        old_key = record.sort_key
+        record.refresh()
+        if record.sort_key != old_key:
+            del self._order[bisect_left(self._order, (old_key, account.id))]
+            insort(self._order, (record.sort_key, account.id))
+
+    def remove(self, account):
+        """Called when an account's last session disconnects."""
+        self._discard(account.id)
+
+    def clear(self):
+        self.records.clear()
+        del self._order[:]
+        self._sessions = {}
+
+    def online(self):
+        """Returns the records of every online account, sorted by name."""
+        self._sync()
+        records = [self.records[account_id] for _, account_id in self._order]
+        ROSTER_SNAPSHOT.load(ob.char.id for ob in records if ob.char)
+        return records
+
+
+PRESENCE = PresenceRegistry()
@@ -74,6 +74,12 @@ PLAIN_COLUMNS = 12
 RANDOM = 20
 
 _re = re.compile("\033\[[0-9;]*m")
+# characters that aren't simply one column wide, see _char_block_width
+_re_not_single_width = re.compile(u"[\x00\x08\x1f\x7f-\U0010ffff]")
+
+# display widths of strings we've measured, cleared whenever it fills up
+MAX_CACHED_WIDTHS = 20000
+_width_cache = {}
 
 def _ansi(method):
     "decorator for converting ansi in input"
@@ -98,6 +104,8 @@ def _ansi(method):
     return wrapper
 
 def _get_size(text):
+    if "\n" not in text:
+        return (_str_block_width(text), 1)
     lines = text.split("\n")
     height = len(lines)
     width = max([_str_block_width(line) for line in lines])
@@ -144,6 +152,8 @@ class PrettyTable(object):
         self._valign = {}
         self._max_width = {}
         self._rows = []
+        # the rows from our last get_string and how they were rendered, see _get_render_cache
+        self._render_cache = None
         if field_names:
             self.field_names = field_names
         else:
@@ -207,8 +217,10 @@ class PrettyTable(object):
             value = unicode(value, self.encoding, "strict")
         return value
 
-    def _justify(self, text, width, align):
-        excess = width - _str_block_width(text)
+    def _justify(self, text, width, align, text_width=None):
+        if text_width is None:
+            text_width = _str_block_width(text)
+        excess = width - text_width
         if align == "l":
             return text + excess * " "
         elif align == "r":
@@ -217,7 +229,7 @@ class PrettyTable(object):
             if excess % 2:
                 # Uneven padding
                 # Put more space on right if text is of odd length...
-                if _str_block_width(text) % 2:
+                if text_width % 2:
                     return (excess//2)*" " + text + (excess//2 + 1)*" "
                 # and more space on left if text is of even length
                 else:
@@ -917,8 +929,11 @@ class PrettyTable(object):
             value = self._unicode(("%%%sf" % self._float_format[field]) % value)
         return self._unicode(value)
 
-    def _compute_widths(self, rows, options):
-        if options["header"]:
+    def _compute_widths(self, rows, options, widths=None):
+        """Sets the widths of our columns for rows, widening widths if we're given those of other rows."""
+        if widths is not None:
+            widths = list(widths)
+        elif options["header"]:
             widths = [_get_size(field)[0] for field in self._field_names]
         else:
             widths = len(self.field_names) * [0]
@@ -951,7 +966,7 @@ class PrettyTable(object):
         options - dictionary of option settings."""
 
         # Make a copy of only those rows in the slice range
-        rows = copy.deepcopy(self._rows[options["start"]:options["end"]])
+        rows = [list(row) for row in self._rows[options["start"]:options["end"]]]
         # Sort if necessary
         if options["sortby"]:
             sortindex = self._field_names.index(options["sortby"])
@@ -969,6 +984,23 @@ class PrettyTable(object):
     def _format_rows(self, rows, options):
         return [self._format_row(row, options) for row in rows]
 
+    def _get_render_cache(self, rows, options):
+        """
+        Returns the rows rendered by our last get_string, their formatted values, the column widths
+        they were laid out with and their rendered lines. The cache is started over unless the rows
+        it holds are the first of the rows we're rendering now, with the same options and layout.
+        Sorted rows are always rendered from scratch.
+        """
+        # the format dicts are changed in place by their setters, so they're copied like the other dicts
+        options = dict(options, int_format=dict(self._int_format), float_format=dict(self._float_format))
+        layout = (options, list(self._field_names), dict(self._align), dict(self._valign), dict(self._max_width))
+        cache = self._render_cache
+        if (options["sortby"] or not cache or cache["layout"] != layout or
+                cache["rows"] != rows[:len(cache["rows"])]):
+            cache = {"layout": layout, "rows": [], "formatted": [], "widths": None, "lines": []}
+        self._render_cache = cache
+        return cache
+
     ##############################
     # PLAIN TEXT STRING METHODS  #
     ##############################
@@ -1013,11 +1045,21 @@ class PrettyTable(object):
         # Get the rows we need to print, taking into account slicing, sorting, etc.
         rows = self._get_rows(options)
 
-        # Turn all data in all rows into Unicode, formatted as desired
-        formatted_rows = self._format_rows(rows, options)
+        # Rows rendered last time are reused if all that's happened since is rows being added
+        cache = self._get_render_cache(rows, options)
+        new_rows = rows[len(cache["rows"]):]
+        cache["rows"].extend(new_rows)
+
+        # Turn all data in new rows into Unicode, formatted as desired
+        formatted_rows = self._format_rows(new_rows, options)
+        cache["formatted"].extend(formatted_rows)
 
         # Compute column widths
-        self._compute_widths(formatted_rows, options)
+        self._compute_widths(formatted_rows, options, cache["widths"])
+        if self._widths != cache["widths"]:
+            # a column's width changed, so every row has to be laid out again
+            cache["widths"] = self._widths
+            cache["lines"] = []
 
         # Add header or top of border
         self._hrule = self._stringify_hrule(options)
@@ -1027,8 +1069,9 @@ class PrettyTable(object):
             lines.append(self._hrule)
 
         # Add rows
-        for row in formatted_rows:
-            lines.append(self._stringify_row(row, options))
+        for row in cache["formatted"][len(cache["lines"]):]:
+            cache["lines"].append(self._stringify_row(list(row), options))
+        lines.extend(cache["lines"])
 
         # Add bottom of border
         if options["border"] and options["hrules"] == FRAME:
@@ -1111,6 +1154,11 @@ class PrettyTable(object):
 
     def _stringify_row(self, row, options):
 
+        if row and not any("\n" in value for value in row):
+            widths = [_str_block_width(value) for value in row]
+            if all(value_width <= width for value_width, width in zip(widths, self._widths)):
+                return self._stringify_line(row, widths, options)
+
         for index, field, value, width, in zip(range(0,len(row)), self._field_names, row, self._widths):
             # Enforce max widths
             lines = value.split("\n")
@@ -1181,6 +1229,42 @@ class PrettyTable(object):
 
         return "\n".join(bits)
 
+    def _stringify_line(self, row, value_widths, options):
+        """
+        Renders a row that fits on a single line, the same as _stringify_row would, given the
+        display widths of its values.
+        """
+        lpad, rpad = self._get_padding_widths(options)
+        lpad, rpad = " " * lpad, " " * rpad
+        border = options["border"]
+        if options["vrules"] == ALL:
+            separator = self.vertical_char
+        else:
+            separator = " "
+        bits = []
+        if border:
+            if options["vrules"] in (ALL, FRAME):
+                bits.append(self.vertical_char)
+            else:
+                bits.append(" ")
+        for field, value, value_width, width in zip(self._field_names, row, value_widths, self._widths):
+            if options["fields"] and field not in options["fields"]:
+                continue
+            bits.append(lpad)
+            bits.append(self._justify(value, width, self._align[field], value_width))
+            bits.append(rpad)
+            if border:
+                bits.append(separator)
+        # If vrules is FRAME, then we just appended a space at the end
+        # of the last field, when we really want a vertical character
+        if border and options["vrules"] == FRAME:
+            bits.pop()
+            bits.append(options["vertical_char"])
+        if border and options["hrules"] == ALL:
+            bits.append("\n")
+            bits.append(self._hrule)
+        return "".join(bits)
+
     ##############################
     # HTML STRING METHODS        #
     ##############################
@@ -1355,8 +1439,17 @@ def _char_block_width(char):
     return 1
 
 def _str_block_width(val):
-
-    return sum(itermap(_char_block_width, itermap(ord, _re.sub("", val))))
+    width = _width_cache.get(val)
+    if width is None:
+        text = _re.sub("", val)
+        if _re_not_single_width.search(text):
+            width = sum(itermap(_char_block_width, itermap(ord, text)))
+        else:
+            width = len(text)
+        if len(_width_cache) >= MAX_CACHED_WIDTHS:
+            _width_cache.clear()
+        _width_cache[val] = width
+    return width
 
 ##############################
 # TABLE FACTORIES            #
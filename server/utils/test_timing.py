@@ -2,6 +2,12 @@
 Comparison of timing between one large query with iterative checks versus a
 number of smaller queries against a non-indexed field. May add other timings
 when needed for different tests.
+
+time_pager pages texts of increasing size with the arx_more pager, whose time
+should grow linearly with the size of the text.
+
+time_tables renders a 1,000 row PrettyTable from scratch, and again after each
+of a number of rows is added to it, which only renders the new rows.
 """
 
 from timeit import Timer
@@ -41,3 +47,48 @@ def time_all_at_once():
 def time_filters():
     t = Timer('by_filtering()', 'from world.msgs.test_timing import by_filtering')
     print("Time is %s" % t.timeit( number=1))
+
+
+PAGER_SIZES = (250000, 1000000, 4000000)
+
+
+def build_text(size):
+    line = "{wFrom: {cSomeone {wMsg:{n This is a line of a very long log.\n"
+    return line * (size // len(line))
+
+
+def page_text(text):
+    from server.utils.arx_more import paginate_by_char, paginate_by_line
+    list(paginate_by_char([text]))
+    list(paginate_by_line(text.splitlines(True), 40))
+
+
+def time_pager(number=3):
+    for size in PAGER_SIZES:
+        t = Timer('page_text(text)', 'from server.utils.test_timing import build_text, page_text; '
+                                     'text = build_text(%d)' % size)
+        elapsed = t.timeit(number=number) / number
+        print("%d characters: %.5f seconds, %.3f microseconds per 1000 characters" % (size, elapsed,
+                                                                                     elapsed * 1000000000 / size))
+
+
+def build_table(num_rows=1000):
+    from server.utils.prettytable import PrettyTable
+    table = PrettyTable(["{wName #", "{wSex", "{wAge", "{wFealty{n", "{wConcept{n", "{wSR{n"])
+    for num in range(num_rows):
+        table.add_row(["{cCharacter%d{n" % num, "M", 20 + num % 40, "Crown", "A concept %d" % (num % 97), num % 10])
+    return table
+
+
+def add_and_render(table, num_rows=100):
+    for num in range(num_rows):
+        table.add_row(["{cLate%d{n" % num, "F", 30, "Crown", "A late concept", 1])
+        str(table)
+
+
+def time_tables(number=10):
+    t = Timer('str(build_table())', 'from server.utils.test_timing import build_table')
+    print("Render 1000 rows: %.5f seconds" % (t.timeit(number=number) / number))
+    t = Timer('add_and_render(table)', 'from server.utils.test_timing import build_table, add_and_render; '
+                                       'table = build_table(); str(table)')
+    print("Add a row and render again: %.5f seconds" % (t.timeit(number=1) / 100))
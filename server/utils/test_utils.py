@@ -58,6 +58,11 @@ class ArxTestConfigMixin(object):
         """Run for each testcase"""
         super(ArxTestConfigMixin, self).setUp()
         from web.character.models import Roster
+        from web.character.roster_snapshot import ROSTER_SNAPSHOT
+        from server.utils.presence import PRESENCE
+        # these are kept in memory, so they'd otherwise hold on to objects from earlier tests
+        ROSTER_SNAPSHOT.clear()
+        PRESENCE.clear()
         self.active_roster = Roster.objects.create(name="Active")
         self.setup_aliases()
         self.setup_arx_characters()
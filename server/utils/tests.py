@@ -0,0 +1,189 @@
+"""
+Tests for server utilities
+"""
+import random
+import re
+
+from django.test import TestCase
+from mock import Mock, patch
+
+from evennia.server.sessionhandler import SESSIONS
+from server.utils.arx_more import paginate_by_char, paginate_by_line
+from server.utils.picker import WeightedPicker, get_picker
+from server.utils.presence import PresenceRegistry
+from server.utils.prettytable import PrettyTable, ALL
+from server.utils.test_utils import ArxTest
+
+
+class PickerTests(TestCase):
+    def setUp(self):
+        self.random_state = random.getstate()
+        random.seed(1)
+
+    def tearDown(self):
+        random.setstate(self.random_state)
+
+    def test_pick_distribution(self):
+        weights = {"rain": 1, "snow": 3, "sun": 6, "locusts": 0}
+        picker = WeightedPicker()
+        for option, weight in sorted(weights.items()):
+            picker.add_option(option, weight)
+        samples = 30000
+        picks = picker.pick_many(samples - 1000) + [picker.pick() for _ in range(1000)]
+        self.assertNotIn("locusts", picks)
+        total = sum(weights.values())
+        chi_squared = 0.0
+        for option in ("rain", "snow", "sun"):
+            expected = samples * weights[option] / float(total)
+            chi_squared += (picks.count(option) - expected) ** 2 / expected
+        # critical value for two degrees of freedom at p = 0.001
+        self.assertLess(chi_squared, 13.816)
+
+    def test_picker_edge_cases(self):
+        self.assertIsNone(WeightedPicker().pick())
+        self.assertEqual(WeightedPicker([("only", 0)]).pick(), "only")
+        self.assertIn(WeightedPicker([("a", 0), ("b", 0)]).pick(), ("a", "b"))
+        with self.assertRaises(ValueError):
+            WeightedPicker().add_option("a", "heavy")
+
+    def test_get_picker(self):
+        picker = get_picker([("a", 1), ("b", 2)])
+        self.assertIs(get_picker([("a", 1), ("b", 2)]), picker)
+        self.assertIsNot(get_picker([("a", 2), ("b", 2)]), picker)
+        self.assertEqual(set(picker.pick_many(50)), {"a", "b"})
+
+
+class PagerTests(TestCase):
+    def test_paginate_by_line(self):
+        text = "\n".join("line %s" % num for num in range(10))
+        pages = ["\n".join("line %s" % num for num in range(start, min(start + 4, 10))) for start in (0, 4, 8)]
+        self.assertEqual(list(paginate_by_line([text], 4)), pages)
+        self.assertEqual(list(paginate_by_line(("line %s\n" % num for num in range(10)), 4)), pages[:2] +
+                         ["line 8\nline 9\n"])
+        self.assertEqual(list(paginate_by_line(["li", "ne 0\nline", " 1"], 4)), ["line 0\nline 1"])
+        self.assertEqual(list(paginate_by_line([""], 4)), [""])
+
+    def test_paginate_by_char(self):
+        text = "".join("%s%s\n" % (num, "x" * 100) for num in range(100))
+        pages = list(paginate_by_char([text], page_length=500, margin=200))
+        self.assertEqual(pages[0] + "".join(page[1:] for page in pages[1:]), text)
+        self.assertTrue(all(page.endswith("\n") for page in pages[:-1]))
+        self.assertTrue(all(page.startswith("\n") for page in pages[1:]))
+        self.assertTrue(all(len(page) <= 700 for page in pages))
+        # streaming the same text in lines cuts the same pages
+        self.assertEqual(list(paginate_by_char(text.splitlines(True), page_length=500, margin=200)), pages)
+
+
+class PrettyTableTests(TestCase):
+    def make_table(self, rows, **kwargs):
+        table = PrettyTable(["Name", "Count"], **kwargs)
+        for row in rows:
+            table.add_row(row)
+        return table
+
+    def test_render(self):
+        table = self.make_table([["Bob", 1], ["Alice", 10]])
+        # cells have ansi codes added, which take up no width
+        self.assertEqual(re.sub("\x1b\\[[0-9;]*m", "", str(table)), "+-------+-------+\n"
+                                     "| Name  | Count |\n"
+                                     "+-------+-------+\n"
+                                     "| Bob   | 1     |\n"
+                                     "| Alice | 10    |\n"
+                                     "+-------+-------+")
+
+    def test_render_after_adding_rows(self):
+        rows = [["Bob", 1], ["Alice", 10], ["A much longer name", 100], ["Multi\nline", 2]]
+        for kwargs in ({}, {"hrules": ALL}):
+            table = self.make_table([], **kwargs)
+            for num, row in enumerate(rows):
+                table.add_row(row)
+                self.assertEqual(str(table), str(self.make_table(rows[:num + 1], **kwargs)))
+            table.del_row(0)
+            self.assertEqual(str(table), str(self.make_table(rows[1:], **kwargs)))
+            table.align = "r"
+            expected = self.make_table(rows[1:], **kwargs)
+            expected.align = "r"
+            count = table.field_names[1]
+            self.assertEqual(table.get_string(sortby=count), expected.get_string(sortby=count))
+            self.assertEqual(str(table), str(expected))
+
+    def test_render_after_changing_format(self):
+        table = self.make_table([["Bob", 1]])
+        str(table)
+        table.int_format = "05"
+        table.float_format = ".2"
+        table.add_row(["Alice", 2.5])
+        expected = self.make_table([["Bob", 1], ["Alice", 2.5]])
+        expected.int_format = "05"
+        expected.float_format = ".2"
+        self.assertIn("00001", str(table))
+        self.assertEqual(str(table), str(expected))
+
+
+class PresenceTests(ArxTest):
+    def setUp(self):
+        super(PresenceTests, self).setUp()
+        self.registry = PresenceRegistry()
+
+    @staticmethod
+    def make_session(sessid, account, logged_in=True):
+        return Mock(sessid=sessid, account=account, logged_in=logged_in)
+
+    def test_refresh_and_remove(self):
+        registry = self.registry
+        registry.refresh(self.account2)
+        registry.refresh(self.account)
+        registry.refresh(self.account)
+        self.assertEqual([ob.account for ob in registry.records.values()].count(self.account), 1)
+        self.assertEqual(registry._order, [("testaccount", self.account.id), ("testaccount2", self.account2.id)])
+        registry.remove(self.account)
+        self.assertEqual(list(registry.records), [self.account2.id])
+        self.assertEqual(registry._order, [("testaccount2", self.account2.id)])
+        registry.remove(self.account)
+        self.assertEqual(len(registry._order), 1)
+
+    def test_sync(self):
+        registry = self.registry
+        sessions = [self.make_session(1, self.account2), self.make_session(2, self.account, logged_in=False),
+                    self.make_session(3, None)]
+        with patch.object(SESSIONS, 'get_sessions', return_value=sessions):
+            self.assertEqual([ob.account for ob in registry.online()], [self.account2])
+            sessions.append(self.make_session(4, self.account))
+            self.assertEqual([ob.account for ob in registry.online()], [self.account, self.account2])
+            del sessions[0]
+            self.assertEqual([ob.account for ob in registry.online()], [self.account])
+            del sessions[:]
+            self.assertEqual(registry.online(), [])
+
+    def test_display_data(self):
+        registry = self.registry
+        registry.refresh(self.account2)
+        record = registry.records[self.account2.id]
+        self.assertEqual(record.char, self.char2)
+        self.assertEqual(record.fealty, "---")
+        self.assertIsNone(record.longname)
+        # staff changing these while the player is online shows up without a refresh
+        self.char2.db.fealty = "Velenosa"
+        self.char2.db.longname = "Lady Char2 Velenosa"
+        self.assertEqual(record.fealty, "Velenosa")
+        self.assertEqual(record.longname, "Lady Char2 Velenosa")
+        self.assertFalse(record.afk)
+        self.account2.db.afk = True
+        self.account2.db.lookingforrp = True
+        registry.refresh(self.account2)
+        self.assertTrue(record.afk)
+        self.assertTrue(record.lrp)
+
+    def test_hidden(self):
+        registry = self.registry
+        registry.refresh(self.account2)
+        record = registry.records[self.account2.id]
+        self.assertTrue(record.visible_to(is_builder=False))
+        self.account2.db.hide_from_watch = True
+        registry.refresh(self.account2)
+        self.assertTrue(record.hidden)
+        self.assertFalse(record.visible_to(is_builder=False))
+        self.assertTrue(record.visible_to(is_builder=True))
+        # accounts without a character can't hide
+        record.char = None
+        self.assertTrue(record.visible_to(is_builder=False))
@@ -24,6 +24,8 @@ several more options for customizing the Guest account system.
 from evennia import DefaultAccount
 from typeclasses.mixins import MsgMixins, InformMixin
 from web.character.models import PlayerSiteEntry
+from server.utils.message_log import MessageLog
+from server.utils.presence import PRESENCE
 
 
 class Account(InformMixin, MsgMixins, DefaultAccount):
@@ -171,6 +173,7 @@ class Account(InformMixin, MsgMixins, DefaultAccount):
                 self.db.afk = ""
         except AttributeError:
             pass
+        PRESENCE.refresh(self)
 
     # noinspection PyBroadException
     def announce_informs(self):
@@ -394,7 +397,7 @@ class Account(InformMixin, MsgMixins, DefaultAccount):
                 for watcher in watched_by:
                     watcher.msg("{wA player you are watching, {c%s{w, has disconnected.{n" % self.key.capitalize())
             self.previous_log = self.current_log
-            self.current_log = []
+            self.current_log = MessageLog()
             self.db.lookingforrp = False
             temp_muted = self.db.temp_mute_list or []
             for channel in temp_muted:
@@ -405,6 +408,7 @@ class Account(InformMixin, MsgMixins, DefaultAccount):
             except AttributeError:
                 pass
             self.nattributes.clear()
+            PRESENCE.remove(self)
 
     def log_message(self, from_obj, text):
         """Logs messages if we're not in private for this session"""
@@ -412,50 +416,64 @@ class Account(InformMixin, MsgMixins, DefaultAccount):
         if not self.tags.get("private_mode"):
             text = text.strip()
             from_obj = make_iter(from_obj)[0]
-            tup = (from_obj, text)
-            if tup not in self.current_log and from_obj != self and from_obj != self.char_ob:
-                self.current_log.append((from_obj, text))
+            if (from_obj, text) not in self.current_log and from_obj != self and from_obj != self.char_ob:
+                self.current_log.append(from_obj, text)
 
     @property
     def current_log(self):
         """Temporary messages for this session"""
         if self.ndb.current_log is None:
-            self.ndb.current_log = []
+            self.ndb.current_log = MessageLog()
         return self.ndb.current_log
 
     @current_log.setter
     def current_log(self, val):
+        if not isinstance(val, MessageLog):
+            val = MessageLog.from_list(val)
         self.ndb.current_log = val
 
+    def get_saved_log(self, attrname):
+        """Returns a MessageLog of a log saved in one of our attributes, cached after it's first read"""
+        logs = self.ndb.saved_logs
+        if logs is None:
+            logs = self.ndb.saved_logs = {}
+        if attrname not in logs:
+            logs[attrname] = MessageLog.from_list(self.attributes.get(attrname))
+        return logs[attrname]
+
+    def set_saved_log(self, attrname, val):
+        """Saves a log to one of our attributes as a plain list"""
+        if not isinstance(val, MessageLog):
+            val = MessageLog.from_list(val)
+        self.attributes.add(attrname, val.to_list())
+        if self.ndb.saved_logs is None:
+            self.ndb.saved_logs = {}
+        self.ndb.saved_logs[attrname] = val
+
     @property
     def previous_log(self):
         """Log of our past session"""
-        if self.db.previous_log is None:
-            self.db.previous_log = []
-        return self.db.previous_log
+        return self.get_saved_log("previous_log")
 
     @previous_log.setter
     def previous_log(self, val):
-        self.db.previous_log = val
+        self.set_saved_log("previous_log", val)
 
     @property
     def flagged_log(self):
         """Messages flagged for GM notice"""
-        if self.db.flagged_log is None:
-            self.db.flagged_log = []
-        return self.db.flagged_log
+        return self.get_saved_log("flagged_log")
 
     @flagged_log.setter
     def flagged_log(self, val):
-        self.db.flagged_log = val
+        self.set_saved_log("flagged_log", val)
 
     def report_player(self, player):
         """Reports a player for GM attention"""
-        charob = player.char_ob
-        log = []
-        for line in (list(self.previous_log) + list(self.current_log)):
-            if line[0] == charob or line[0] == player:
-                log.append(line)
+        senders = [player]
+        if player.char_ob:
+            senders.append(player.char_ob)
+        log = self.previous_log.entries(senders) + self.current_log.entries(senders)
         self.flagged_log = log
 
     @property
@@ -729,6 +729,9 @@ class Character(UseEquipmentMixins, NameMixins, MsgMixins, ObjectMixins, MagicMi
             docked_location = guard.db.docked
             if docked_location and docked_location == self.location:
                 guard.summon()
+        if self.player:
+            from server.utils.presence import PRESENCE
+            PRESENCE.refresh(self.player)
 
     def at_post_unpuppet(self, player, session=None, **kwargs):
         """
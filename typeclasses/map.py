@@ -1,5 +1,9 @@
 """
 Maps.
+
+A map stores the room and icon at each of its coordinates in a grid attribute, so drawing it doesn't
+have to load the rooms. The squares of the map without anyone's location or destination marked on
+it are kept in memory, and only the rows holding those markers are redrawn for each caller.
 """
 from typeclasses.objects import Object
 
@@ -8,6 +12,15 @@ _BLANK_SQUARE = '  '
 _DEST_ICON = '{rXX{n'
 
 
+def _square(icon):
+    """Returns an icon as the map square it's drawn in"""
+    icon = icon or _BLANK_SQUARE
+    # if icon is only one character, add a space
+    if len(icon) < 2:
+        icon += " "
+    return icon
+
+
 class Map(Object):
     """
     A map. Redo this as a table later
@@ -21,36 +34,91 @@ class Map(Object):
         self.db.min_x = 0
         self.db.max_y = 0
         self.db.min_y = 0
-        self.db.rooms = {}
+        self.db.grid = {}
         # locks so characters cannot 'get' it
         self.locks.add("get:perm(Builders);delete:false()")
         self.at_init()
 
+    @property
+    def grid(self):
+        """
+        Dict of (x, y) coordinates to the (room id, icon) at them. Maps made before the grid was
+        added have it built from their old dict of rooms.
+        """
+        grid = self.db.grid
+        if grid is None:
+            grid = {}
+            for coords, room in (self.db.rooms or {}).items():
+                if room:
+                    grid[coords] = (room.id, room.db.map_icon)
+            self.db.grid = grid
+        return grid
+
+    def get_base_map(self):
+        """
+        Returns the squares of the map, as a list of rows from the top down, and each row drawn as text,
+        without any locations marked. Cached until a room is added or cleared.
+        """
+        base_map = self.ndb.base_map
+        if base_map is None:
+            grid = dict(self.grid)
+            min_x, max_x, min_y, max_y = self.db.min_x, self.db.max_x, self.db.min_y, self.db.max_y
+            squares = []
+            room_coords = {}
+            for y in range(max_y, min_y - 1, -1):
+                row = []
+                for x in range(min_x, max_x + 1):
+                    room_id, icon = grid.get((x, y), (None, None))
+                    if room_id is None:
+                        row.append(_BLANK_SQUARE)
+                        continue
+                    row.append(_square(icon))
+                    room_coords.setdefault(room_id, []).append((x, y))
+                squares.append(row)
+            rows = ["-".join(row) for row in squares]
+            base_map = self.ndb.base_map = (squares, rows, room_coords, (min_x, max_y))
+        return base_map[0], base_map[1]
+
+    def clear_base_map(self):
+        self.ndb.base_map = None
+
+    def get_room_coords(self, room):
+        """Returns a list of the coordinates of a room on this map."""
+        self.get_base_map()
+        return self.ndb.base_map[2].get(room.id, [])
+
     def get_icon(self, origin_room, x, y, destination=None):
-        room = self.db.rooms.get((x,y), None)
-        if not room:
+        room_id, icon = self.grid.get((x, y), (None, None))
+        if room_id is None:
             return _BLANK_SQUARE
-        if room == origin_room:
+        if origin_room and room_id == origin_room.id:
             return _CALLER_ICON
         if (destination and destination.db.x_coord == x
-            and destination.db.y_coord == y):
+                and destination.db.y_coord == y):
             return _DEST_ICON
-        return room.db.map_icon or _BLANK_SQUARE
+        return icon or _BLANK_SQUARE
 
     def draw_map(self, origin_room, destination=None):
-        map = ""
-        for y in range(self.db.max_y, self.db.min_y - 1, -1):
-            map += "\n"
-            for x in range(self.db.min_x, self.db.max_x + 1):
-                if x != self.db.min_x:
-                    map += "-"
-                # cap size of icon at 2 characters
-                icon = self.get_icon(origin_room, x, y, destination)
-                # if icon is only one character, add a space
-                if len(icon) < 2:
-                    icon += " "
-                map += icon
-        return map
+        squares, rows = self.get_base_map()
+        min_x, max_y = self.ndb.base_map[3]
+        markers = []
+        if destination:
+            coords = (destination.db.x_coord, destination.db.y_coord)
+            if self.grid.get(coords, (None,))[0] is not None:
+                markers.append((coords, _DEST_ICON))
+        if origin_room:
+            # the caller's location is drawn over their destination
+            markers.extend((coords, _CALLER_ICON) for coords in self.get_room_coords(origin_room))
+        changed = {}
+        for (x, y), icon in markers:
+            row_num, column = max_y - y, x - min_x
+            if row_num not in changed:
+                changed[row_num] = list(squares[row_num])
+            changed[row_num][column] = icon
+        rows = list(rows)
+        for row_num, row in changed.items():
+            rows[row_num] = "-".join(row)
+        return "".join("\n" + row for row in rows)
 
     def add_room(self, room):
         x = room.db.x_coord
@@ -63,6 +131,15 @@ class Map(Object):
             self.db.max_y = y
         if y < self.db.min_y:
             self.db.min_y = y
-        self.db.rooms[(x,y)] = room
+        grid = self.grid
+        grid[(x, y)] = (room.id, room.db.map_icon)
+        self.db.grid = grid
+        self.clear_base_map()
         room.db.map = self
-        
+
+    def clear_square(self, x, y):
+        """Makes the square at (x, y) blank."""
+        grid = self.grid
+        grid.pop((x, y), None)
+        self.db.grid = grid
+        self.clear_base_map()
@@ -4,7 +4,6 @@ from evennia.utils.utils import lazy_property
 from evennia.utils.ansi import parse_ansi
 
 from world.conditions.triggerhandler import TriggerHandler
-from world.templates.models import Template
 from world.templates.mixins import TemplateMixins
 
 
@@ -59,7 +58,6 @@ class DescMixins(object):
         if self.db.general_desc:
             # general desc is our fallback
             self.db.general_desc = val
-        self.ndb.cached_template_desc = None
 
     def __temp_desc_get(self):
         """
@@ -76,7 +74,6 @@ class DescMixins(object):
             self.db.raw_desc = self.db.desc
         if not self.db.general_desc:
             self.db.desc = self.db.desc
-        self.ndb.cached_template_desc = None
         self.db.desc = val
 
     def __temp_desc_del(self):
@@ -89,7 +86,6 @@ class DescMixins(object):
         if not self.db.general_desc:
             self.db.general_desc = self.db.desc
         self.db.desc = ""
-        self.ndb.cached_template_desc = None
     temp_desc = property(__temp_desc_get, __temp_desc_set, __temp_desc_del)
 
     def __perm_desc_get(self):
@@ -105,7 +101,6 @@ class DescMixins(object):
         """
         self.db.general_desc = val
         self.db.raw_desc = val
-        self.ndb.cached_template_desc = None
     perm_desc = property(__perm_desc_get, __perm_desc_set)
 
     def __get_volume(self):
@@ -228,7 +223,6 @@ class NameMixins(object):
         val = sub_old_ansi(val)
         self.db.colored_name = val
         self.key = parse_ansi(val, strip_ansi=True)
-        self.ndb.cached_template_desc = None
         self.save()
     name = property(__name_get, __name_set)
 
@@ -250,6 +244,11 @@ class BaseObjectMixins(object):
     def is_character(self):
         return False
 
+    @property
+    def places(self):
+        """Places for tabletalk inside us. Only rooms have any."""
+        return []
+
     @property
     def player(self):
         return self.account
@@ -379,8 +378,7 @@ class AppearanceMixins(BaseObjectMixins, TemplateMixins):
         visible = (con for con in self.contents if con.access(pobject, "view"))
         exits, users, things, worn, sheathed, wielded, places, npcs = [], [], [], [], [], [], [], []
         currency = self.return_currency()
-        from typeclasses.places.places import Place
-        qs = list(Place.objects.filter(db_location=self))
+        qs = set(self.places)
         for con in visible:
             key = get_key(con)
             if con in qs and show_places:
@@ -414,11 +412,8 @@ class AppearanceMixins(BaseObjectMixins, TemplateMixins):
                     users.append("{c%s{n" % lname)
             elif hasattr(con, 'is_character') and con.is_character:
                 npcs.append(con)
-            else:
-                if not self.db.places:
-                    things.append(con)
-                elif self.db.places and con not in self.db.places:
-                    things.append(con)
+            elif con not in qs:
+                things.append(con)
         if worn:
             worn = sorted(worn, key=lambda x: x.db.worn_time)
             string += "\n" + "{wWorn items of note:{n " + ", ".join(get_key(ob) for ob in worn)
@@ -502,6 +497,18 @@ class AppearanceMixins(BaseObjectMixins, TemplateMixins):
         # always show contents if a builder+
         show_contents = show_contents or pobject.check_permstring("builders")
         contents = self.return_contents(pobject, strip_ansi=strip_ansi)
+        string = self.return_desc_string(format_desc=format_desc, strip_ansi=strip_ansi)
+        if contents and show_contents:
+            string += contents
+        return string
+
+    def return_desc_string(self, format_desc=False, strip_ansi=False):
+        """
+        Our name and description as they're shown by return_appearance, which is the same for
+        every looker who has the same ansi setting.
+        :param format_desc: bool
+        :param strip_ansi: bool
+        """
         # get description, build string
         string = "{c%s{n" % self.name
         # if altered_desc is true, we use the alternate desc set by an attribute.
@@ -523,17 +530,7 @@ class AppearanceMixins(BaseObjectMixins, TemplateMixins):
                 string += "\n%s{n" % desc
         else:  # for crafted objects, respect formatting
             string += "\n%s{n" % desc
-
-            if self.ndb.cached_template_desc:
-                string = self.ndb.cached_template_desc
-            else:
-                templates = Template.objects.in_list(self.find_template_ids(string))
-                if templates.exists():
-                    string = self.replace_template_values(string, templates)
-                self.ndb.cached_template_desc = string
-
-        if contents and show_contents:
-            string += contents
+            string = self.render_templates(string)
         return string
 
     def transfer_all(self, destination, caller=None):
@@ -20,16 +20,84 @@ those guards if they meet certain criteria. If they execute that
 command, it then summons guards for that player character.
 
 """
+from django.db import transaction
+from evennia.typeclasses.attributes import AttributeHandler
+from evennia.utils.utils import lazy_property
+
 from typeclasses.characters import Character
-from .npc_types import (get_npc_stats, get_npc_desc, get_npc_skills,
+from .npc_types import (get_npc_desc, get_npc_skills,
                         get_npc_singular_name, get_npc_plural_name, get_npc_weapon,
-                        get_armor_bonus, get_hp_bonus, primary_stats,
+                        primary_stats, get_npc_template, NPC_TEMPLATE_KEYS,
                         assistant_skills, spy_skills, get_npc_stat_cap, check_passive_guard,
                         COMBAT_TYPES, get_innate_abilities, ABILITY_COSTS, ANIMAL, SMALL_ANIMAL)
 from world.stats_and_skills import (do_dice_check, get_stat_cost, get_skill_cost,
                                     PHYSICAL_STATS, MENTAL_STATS, SOCIAL_STATS)
 import time
 
+_MISSING = object()
+GROUP_COUNT_KEYS = ("num_living", "num_dead", "num_incap")
+
+
+class TemplateSkills(dict):
+    """
+    A copy of the skills in an npc's template. Changing a skill saves them all as the
+    npc's own skills attribute, the same as changing a character's skills.
+    """
+    def __init__(self, obj, skills):
+        super(TemplateSkills, self).__init__(skills)
+        self.obj = obj
+
+    def __setitem__(self, key, value):
+        super(TemplateSkills, self).__setitem__(key, value)
+        self.obj.attributes.add("skills", dict(self))
+
+
+class NpcAttributeHandler(AttributeHandler):
+    """
+    Attribute handler that falls back to our shared npc template for stats, skills and
+    gear we haven't been given individually, so only those overrides are stored.
+    """
+    def get(self, key=None, default=None, category=None, *args, **kwargs):
+        if category is not None or args or kwargs or not isinstance(key, str) or key not in NPC_TEMPLATE_KEYS:
+            return super(NpcAttributeHandler, self).get(key, default, category, *args, **kwargs)
+        value = super(NpcAttributeHandler, self).get(key, default=_MISSING)
+        if value is not _MISSING:
+            return value
+        template = self.obj.npc_template
+        if not template:
+            return default
+        if key == "skills":
+            return TemplateSkills(self.obj, template.skills)
+        if key == "fakeweapon":
+            return dict(template.weapon)
+        return template.values.get(key, default)
+
+
+def spawn_npc(typeclass, name, ntype=0, threat=0, num=1, location=None, **kwargs):
+    """
+    Creates and sets up an npc in a single transaction, so that spawning it commits once
+    rather than once for every attribute it's given.
+
+        Args:
+            typeclass: typeclass or path of the npc to create
+            name: key for the npc
+            ntype (int): npc type from npc_types
+            threat (int): threat level of the npc
+            num (int): quantity, if it's a MultiNpc
+            location: where to put it, if anywhere
+            **kwargs: passed along to setup_npc
+
+        Returns:
+            The new npc.
+    """
+    from evennia.utils.create import create_object
+    with transaction.atomic():
+        npc = create_object(typeclass=typeclass, key=name)
+        npc.setup_npc(ntype, threat, num, **kwargs)
+        if location:
+            npc.location = location
+    return npc
+
 
 class Npc(Character):
     """
@@ -179,7 +247,7 @@ class Npc(Character):
         applied_damage = self.dmg - roll  # how much dmg character has after the roll
         if applied_damage < 0:
             applied_damage = 0  # no remaining damage
-        self.db.damage = applied_damage
+        self.real_dmg = applied_damage
         if not free:
             self.db.last_recovery_test = time.time()
         return roll
@@ -194,11 +262,9 @@ class Npc(Character):
         return roll
 
     def get_fakeweapon(self, force_update=False):
-        if not self.db.fakeweapon or force_update:
-            npctype = self._get_npc_type()
-            quality = self._get_quality()
-            self.db.fakeweapon = get_npc_weapon(npctype, quality)
-        return self.db.fakeweapon
+        if force_update:
+            self.attributes.remove("fakeweapon")
+        return self.db.fakeweapon or get_npc_weapon(self._get_npc_type(), self._get_quality())
 
     def _set_fakeweapon(self, val):
         self.db.fakeweapon = val
@@ -251,17 +317,27 @@ class Npc(Character):
     def weaponized(self):
         return True
 
+    @lazy_property
+    def attributes(self):
+        return NpcAttributeHandler(self)
+
+    @property
+    def npc_template(self):
+        """The shared template of stats, skills and gear for our type and threat, if we've been set up."""
+        key = self.attributes.get("npc_template")
+        if key:
+            return get_npc_template(*key)
+
     def setup_stats(self, ntype, threat):
+        """
+        Points us at the template for our type and threat. Stats, skills or gear we'd been
+        given individually are removed, so that the template's values apply again.
+        """
+        overrides = [attr.key for attr in self.attributes.all() if attr.key in NPC_TEMPLATE_KEYS and not attr.category]
+        for key in overrides:
+            self.attributes.remove(key)
         self.db.npc_quality = threat
-        for stat, value in get_npc_stats(ntype).items():
-            self.attributes.add(stat, value)
-        skills = get_npc_skills(ntype)
-        for skill in skills:
-            skills[skill] += threat
-        self.db.skills = skills
-        self.db.fakeweapon = get_npc_weapon(ntype, threat)
-        self.db.armor_class = get_armor_bonus(self._get_npc_type(), self._get_quality())
-        self.db.bonus_max_hp = get_hp_bonus(self._get_npc_type(), self._get_quality())
+        self.db.npc_template = (ntype, threat)
 
     @property
     def num_armed_guards(self):
@@ -297,17 +373,98 @@ class Npc(Character):
 
 
 class MultiNpc(Npc):
+    """
+    A group of identical npcs represented by a single object. While we're in combat, the counts of our
+    living, dead and incapacitated members and our damage are kept in memory and only written to our
+    attributes once a round by save_losses, so a large group doesn't save attributes for every blow.
+    """
+    @property
+    def group_counts(self):
+        """Dict of our living, dead and incapacitated members"""
+        if self.ndb.group_counts is None:
+            self.ndb.group_counts = {key: self.attributes.get(key) or 0 for key in GROUP_COUNT_KEYS}
+        return self.ndb.group_counts
+
+    def _set_group_count(self, key, val):
+        self.group_counts[key] = val
+        self.attributes.add(key, val)
+        if self.ndb.unsaved_counts:
+            self.ndb.unsaved_counts.discard(key)
+
+    @property
+    def num_living(self):
+        return self.group_counts["num_living"]
+
+    @num_living.setter
+    def num_living(self, val):
+        self._set_group_count("num_living", val)
+
+    @property
+    def num_dead(self):
+        return self.group_counts["num_dead"]
+
+    @num_dead.setter
+    def num_dead(self, val):
+        self._set_group_count("num_dead", val)
+
+    @property
+    def num_incap(self):
+        return self.group_counts["num_incap"]
+
+    @num_incap.setter
+    def num_incap(self, val):
+        self._set_group_count("num_incap", val)
+
+    @property
+    def saves_losses_per_round(self):
+        """Whether our losses wait for the end of the combat round to be saved"""
+        return bool(self.combat.state)
+
     def multideath(self, num, death=False):
-        living = self.db.num_living or 0
-        if num > living:
-            num = living
-        self.db.num_living = living - num
-        if death:
-            dead = self.db.num_dead or 0
-            self.db.num_dead = dead + num
-        else:
-            incap = self.db.num_incap or 0
-            self.db.num_incap = incap + num
+        counts = self.group_counts
+        num = min(num, counts["num_living"])
+        lost_as = "num_dead" if death else "num_incap"
+        counts["num_living"] -= num
+        counts[lost_as] += num
+        if self.ndb.unsaved_counts is None:
+            self.ndb.unsaved_counts = set()
+        self.ndb.unsaved_counts.update(("num_living", lost_as))
+        self.ndb.round_losses = (self.ndb.round_losses or 0) + num
+        if not self.saves_losses_per_round:
+            self.save_losses()
+
+    def save_losses(self):
+        """
+        Writes the counts and damage that changed since we last saved to our attributes.
+
+            Returns:
+                The number of our members lost since the last save.
+        """
+        counts = self.group_counts
+        for key in self.ndb.unsaved_counts or ():
+            self.attributes.add(key, counts[key])
+        self.ndb.unsaved_counts = None
+        if self.ndb.unsaved_dmg is not None:
+            self.db.damage = self.ndb.unsaved_dmg
+            self.ndb.unsaved_dmg = None
+            self.start_recovery_script()
+        losses = self.ndb.round_losses or 0
+        self.ndb.round_losses = 0
+        return losses
+
+    @property
+    def real_dmg(self):
+        if self.ndb.unsaved_dmg is not None:
+            return self.ndb.unsaved_dmg
+        return self.db.damage or 0
+
+    @real_dmg.setter
+    def real_dmg(self, dmg):
+        if dmg < 1:
+            dmg = 0
+        self.ndb.unsaved_dmg = dmg
+        if not self.saves_losses_per_round:
+            self.save_losses()
 
     def get_singular_name(self):
         return self.db.singular_name or get_npc_singular_name(self._get_npc_type())
@@ -362,24 +519,27 @@ class MultiNpc(Npc):
     # noinspection PyAttributeOutsideInit
     def setup_name(self):
         npc_type = self.db.npc_type
-        if self.db.num_living == 1 and not self.db.num_dead:
+        if self.num_living == 1 and not self.num_dead:
             self.key = self.db.singular_name or get_npc_singular_name(npc_type)
         else:
-            if self.db.num_living == 1:
+            if self.num_living == 1:
                 noun = self.db.singular_name or get_npc_singular_name(npc_type)
             else:
                 noun = self.db.plural_name or get_npc_plural_name(npc_type)
-            if not self.db.num_living and self.db.num_dead:
+            if not self.num_living and self.num_dead:
                 noun = "dead %s" % noun
-                self.key = "%s %s" % (self.db.num_dead, noun)
+                self.key = "%s %s" % (self.num_dead, noun)
             else:
-                self.key = "%s %s" % (self.db.num_living, noun)
+                self.key = "%s %s" % (self.num_living, noun)
         self.save()
 
     def setup_npc(self, ntype=0, threat=0, num=1, sing_name=None, plural_name=None, desc=None, keepold=False):
-        self.db.num_living = num
-        self.db.num_dead = 0
-        self.db.num_incap = 0
+        self.ndb.group_counts = None
+        self.ndb.unsaved_counts = None
+        self.ndb.unsaved_dmg = None
+        self.num_living = num
+        self.num_dead = 0
+        self.num_incap = 0
         self.db.damage = 0
         self.db.health_status = "alive"
         self.db.sleep_status = "awake"
@@ -399,8 +559,7 @@ class MultiNpc(Npc):
 
     @property
     def quantity(self):
-        num = self.db.num_living or 0
-        return num - self.temp_losses
+        return self.num_living - self.temp_losses
 
     @property
     def conscious(self):
@@ -896,12 +1055,12 @@ class Agent(AgentMixin, MultiNpc):
         a_type = self.agentob.agent_class.type
         noun = self.agentob.agent_class.name
         if not noun:
-            if self.db.num_living == 1:
+            if self.num_living == 1:
                 noun = get_npc_singular_name(a_type)
             else:
                 noun = get_npc_plural_name(a_type)
-        if self.db.num_living:
-            self.key = "%s %s" % (self.db.num_living, noun)
+        if self.num_living:
+            self.key = "%s %s" % (self.num_living, noun)
         else:
             self.key = noun
         self.save()
@@ -921,17 +1080,17 @@ class Agent(AgentMixin, MultiNpc):
         """
         if num < 0:
             raise ValueError("Must pass a positive integer to lose_agents.")
-        if num > self.db.num_living:
-            num = self.db.num_living
+        if num > self.num_living:
+            num = self.num_living
         self.multideath(num, death)
         self.agentob.lose_agents(num)
         self.setup_name()
-        if self.db.num_living <= 0:
+        if self.num_living <= 0:
             self.unassign()
         return num
 
     def gain_agents(self, num):
-        self.db.num_living += num
+        self.num_living += num
         self.setup_name()
 
     def death_process(self, *args, **kwargs):
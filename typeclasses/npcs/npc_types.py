@@ -1,4 +1,6 @@
 import copy
+from types import MappingProxyType
+
 from world.stats_and_skills import (PHYSICAL_STATS, MENTAL_STATS, SOCIAL_STATS,
                                     COMBAT_SKILLS, GENERAL_SKILLS, SOCIAL_SKILLS)
 
@@ -186,6 +188,35 @@ def get_npc_skills(n_type):
     return copy.deepcopy(npc_skills.get(n_type, {}))
 
 
+class NpcTemplate(object):
+    """
+    The stats, skills and gear shared by every npc of a type and threat. Npcs look
+    these up rather than storing their own copies, so they're read-only.
+    """
+    def __init__(self, n_type, quality):
+        skills = get_npc_skills(n_type)
+        for skill in skills:
+            skills[skill] += quality
+        self.skills = MappingProxyType(skills)
+        self.weapon = MappingProxyType(get_npc_weapon(n_type, quality))
+        values = get_npc_stats(n_type)
+        values['armor_class'] = get_armor_bonus(n_type, quality)
+        values['bonus_max_hp'] = get_hp_bonus(n_type, quality)
+        self.values = MappingProxyType(values)
+
+
+# attributes that an npc's template supplies unless the npc has its own
+NPC_TEMPLATE_KEYS = frozenset(list(unknown_stats.keys()) + ['armor_class', 'bonus_max_hp', 'skills', 'fakeweapon'])
+_npc_template_cache = {}
+
+
+def get_npc_template(n_type, quality):
+    key = (n_type, quality)
+    if key not in _npc_template_cache:
+        _npc_template_cache[key] = NpcTemplate(n_type, quality)
+    return _npc_template_cache[key]
+
+
 def get_npc_desc(n_type):
     return npc_descs.get(n_type, "Unknown description")
 
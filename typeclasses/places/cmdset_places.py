@@ -49,7 +49,7 @@ class CmdJoin(ArxCommand):
     def func(self):
         """Implements command"""
         caller = self.caller
-        places = caller.location.db.places
+        places = caller.location.places
         table = caller.db.sitting_at_table       
         args = self.args
         if not args or not args.strip("#").strip().isdigit():
@@ -68,8 +68,7 @@ class CmdJoin(ArxCommand):
             caller.msg("Number specified does not match any of the places here.")
             return
         table = places[args]
-        occupants = table.db.occupants or []
-        if len(occupants) >= table.db.max_spots:
+        if len(table.occupancy) >= table.db.max_spots:
             caller.msg("There is no room at %s." % table.key)
             return
         table.join(caller)
@@ -96,7 +95,7 @@ class CmdListPlaces(ArxCommand):
     def func(self):
         """Implements command"""
         caller = self.caller
-        places = caller.location.db.places
+        places = caller.location.places
         caller.msg("{wPlaces here:{n")
         caller.msg("{w------------{n")
         if not places:
@@ -105,7 +104,7 @@ class CmdListPlaces(ArxCommand):
         for num in range(len(places)):
             p_name = places[num].key
             max_spots = places[num].db.max_spots or 0
-            occupants = places[num].db.occupants or []
+            occupants = places[num].occupants
             spots = max_spots - len(occupants)
             caller.msg("%s (#%s) : %s empty spaces" % (p_name, num + 1, spots))
             if occupants:
@@ -5,6 +5,7 @@ Places for tabletalk
 from typeclasses.objects import Object
 from typeclasses.places.cmdset_places import DefaultCmdSet, SittingCmdSet
 from evennia.utils.utils import make_iter
+from server.utils.arx_utils import CachedProperty
 
 
 class Place(Object):
@@ -19,20 +20,40 @@ class Place(Object):
         """
         Run at Place creation.
         """
-        self.db.occupants = []
         self.db.max_spots = 6
         # locks so characters cannot 'get' it
         self.locks.add(self.PLACE_LOCKS)
-        self.at_init()      
-        
+        self.at_init()
+
+    @CachedProperty
+    def occupancy(self):
+        """
+        Our occupants, mapped to whether they want emits labelled with their author. Joining and
+        leaving only touch this dict and the character's sitting_at_table, which is what's persisted,
+        so after a reload it's rebuilt from the characters in the room who are sitting at us.
+        """
+        location = self.location
+        if not location:
+            return {}
+        return {ob: bool(ob.tags.get("emit_label")) for ob in location.contents
+                if ob.attributes.get("sitting_at_table") == self}
+
+    @property
+    def occupants(self):
+        return list(self.occupancy)
+
+    def refresh_occupant(self, character):
+        """Re-reads an occupant's emit_label setting after they've toggled it."""
+        if character in self.occupancy:
+            self.occupancy[character] = bool(character.tags.get("emit_label"))
+
     def leave(self, character):
         """
-        Character leaving the table.
+        Character leaving the table. They may already have moved out of the room, and so be
+        missing from an occupancy rebuilt since, so we check what they're sitting at instead.
         """
-        occupants = self.db.occupants or []
-        if character in occupants:
-            occupants.remove(character)
-            self.db.occupants = occupants
+        if character.db.sitting_at_table == self:
+            self.occupancy.pop(character, None)
             character.cmdset.delete(SittingCmdSet)
             character.db.sitting_at_table = None
             self.location.msg_contents("%s has left the %s." % (character.name, self.key), exclude=character)
@@ -42,13 +63,11 @@ class Place(Object):
         """
         Character joins the table
         """
-        occupants = self.db.occupants or []
         character.cmdset.add(SittingCmdSet, permanent=True)
         character.db.sitting_at_table = self
-        occupants.append(character)
-        self.db.occupants = occupants
+        self.occupancy[character] = bool(character.tags.get("emit_label"))
         self.location.msg_contents("%s has joined the %s." % (character.name, self.key), exclude=character)
-    
+
     def tt_msg(self, message, from_obj, exclude=None, emit=False, options=None):
         """
         Send msg to characters at table. Note that if this method was simply named
@@ -59,28 +78,30 @@ class Place(Object):
         # utils.make_iter checks to see if an object is a list, set, etc, and encloses it in a list if not
         # needed so that 'ob not in exclude' can function if we're just passed a character
         exclude = make_iter(exclude)
-        for ob in self.db.occupants:
+        labelled_message = "{w[{c%s{w]{n %s" % (from_obj, message) if emit else message
+        for ob, emit_label in list(self.occupancy.items()):
             if ob not in exclude:
-                if emit and ob.tags.get("emit_label"):
-                    formatted_message = "{w[{c%s{w]{n %s" % (from_obj, message)
-                else:
-                    formatted_message = message
-                ob.msg(formatted_message, from_obj=from_obj, options=options)
+                ob.msg(labelled_message if emit_label else message, from_obj=from_obj, options=options)
         from_obj.posecount += 1
 
     def at_after_move(self, source_location, **kwargs):
         """If new location is not our wearer, remove."""
         location = self.location
-        # first, remove ourself from the source location's places, if it exists
-        if source_location and hasattr(source_location, 'is_room') and source_location.is_room:
-            if source_location.db.places and self in source_location.db.places:
-                source_location.db.places.remove(self)
+        # rooms rebuild their list of places, and we rebuild our occupants, on next use
+        if source_location and getattr(source_location, 'is_room', False):
+            del source_location.places
+        del self.occupancy
         # if location is a room, add cmdset
         if location and location.is_room:
-            places = location.db.places or []
+            del location.places
             self.cmdset.add_default(DefaultCmdSet, permanent=True)
-            places.append(self)
-            location.db.places = places
         # if location not a room, remove cmdset
         else:
             self.cmdset.delete_default()
+
+    def at_object_delete(self):
+        """Drops us from our room's places."""
+        location = self.location
+        if location and location.is_room:
+            del location.places
+        return super(Place, self).at_object_delete()
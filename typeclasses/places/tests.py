@@ -0,0 +1,51 @@
+"""
+Tests for places and tabletalk
+"""
+from mock import Mock
+
+from evennia.utils.create import create_object
+
+from server.utils.test_utils import ArxCommandTest
+from typeclasses.places.cmdset_places import CmdJoin, SittingCmdSet
+from typeclasses.places.places import Place
+
+
+class PlacesTests(ArxCommandTest):
+
+    def test_tabletalk(self):
+        table = create_object(Place, key="table")
+        table.move_to(self.room1, quiet=True)
+        self.assertEqual(self.room1.places, [table])
+        self.setup_cmd(CmdJoin, self.char2)
+        self.call_cmd("1", "You join the table.")
+        self.assertEqual(table.occupants, [self.char2])
+        self.char1.tags.add("emit_label")
+        table.join(self.char1)
+        self.char1.msg = Mock()
+        self.char2.msg = Mock()
+        table.tt_msg("At the table, a breeze.", from_obj=self.char2, emit=True)
+        self.char1.msg.assert_called_with("{w[{cChar2{w]{n At the table, a breeze.", from_obj=self.char2,
+                                          options=None)
+        self.char2.msg.assert_called_with("At the table, a breeze.", from_obj=self.char2, options=None)
+        # occupants are rebuilt from who's sitting at the table
+        del table.occupancy
+        self.assertEqual(set(table.occupants), {self.char1, self.char2})
+        table.leave(self.char2)
+        self.assertEqual(table.occupants, [self.char1])
+        table.move_to(None, quiet=True, to_none=True)
+        self.assertEqual(self.room1.places, [])
+
+    def test_leave_after_moving(self):
+        table = create_object(Place, key="table")
+        table.move_to(self.room1, quiet=True)
+        table.join(self.char1)
+        table.join(self.char2)
+        self.assertTrue(self.char2.cmdset.has(SittingCmdSet))
+        # after a reload, the occupancy is rebuilt from the room only once the character has already moved out
+        del table.occupancy
+        self.char2.move_to(self.room2, quiet=True)
+        self.assertIsNone(self.char2.db.sitting_at_table)
+        self.assertFalse(self.char2.cmdset.has(SittingCmdSet))
+        self.assertEqual(table.occupants, [self.char1])
+        table.leave(self.char2)
+        self.assertEqual(table.occupants, [self.char1])
@@ -74,8 +74,10 @@ from evennia import default_cmds
 from evennia import utils
 from evennia.utils.utils import lazy_property
 from evennia.objects.models import ObjectDB
+from evennia.typeclasses.tags import TagHandler
 
 from commands.base import ArxCommand
+from server.utils.arx_utils import CachedProperty
 from typeclasses.scripts import gametime
 from typeclasses.mixins import NameMixins, ObjectMixins
 from world.magic.mixins import MagicMixins
@@ -94,6 +96,28 @@ HOMECMD = "commands.cmdsets.home.HomeCmdSet"
 SHOPCMD = "commands.cmdsets.home.ShopCmdSet"
 
 
+# how long a room mood lasts, in seconds
+ROOM_MOOD_DURATION = 86400
+
+
+class RoomTagHandler(TagHandler):
+    """
+    Tags decide which commands and what formatting a room shows in its appearance, so changing
+    them drops the room's cached appearance.
+    """
+    def add(self, *args, **kwargs):
+        super(RoomTagHandler, self).add(*args, **kwargs)
+        self.obj.clear_appearance_cache()
+
+    def remove(self, *args, **kwargs):
+        super(RoomTagHandler, self).remove(*args, **kwargs)
+        self.obj.clear_appearance_cache()
+
+    def clear(self, *args, **kwargs):
+        super(RoomTagHandler, self).clear(*args, **kwargs)
+        self.obj.clear_appearance_cache()
+
+
 # implements the Extended Room
 
 # noinspection PyUnresolvedReferences
@@ -113,6 +137,44 @@ class ArxRoom(NameMixins, ObjectMixins, ExtendedRoom, MagicMixins):
     def is_room(self):
         return True
 
+    @lazy_property
+    def tags(self):
+        return RoomTagHandler(self)
+
+    @property
+    def appearance_cache(self):
+        """
+        The parts of our appearance that are the same for everyone who looks, so that a crowded room
+        doesn't build them over again for every look. Holds:
+            desc: {(format_desc, strip_ansi): ((name, desc), string)}, rebuilt when our name or desc
+                  changes, which includes the desc changing with the time or season.
+            commands: command_string, dropped when our tags change.
+            mood: (time the mood expires or None, mood_string), dropped when the mood is set or cleared.
+            event: the event being logged here, dropped when event logging starts or stops.
+        """
+        cache = self.ndb.appearance_cache
+        if cache is None:
+            cache = self.ndb.appearance_cache = {}
+        return cache
+
+    def clear_appearance_cache(self, *parts):
+        """Drops the given parts of our cached appearance, or all of it if none are given."""
+        if not parts:
+            self.ndb.appearance_cache = None
+            return
+        cache = self.appearance_cache
+        for part in parts:
+            cache.pop(part, None)
+
+    @CachedProperty
+    def places(self):
+        """
+        Places for tabletalk in this room, in the order they were created. Dropped by Place.at_after_move
+        whenever one arrives or leaves, and rebuilt from the room's contents on next use.
+        """
+        from typeclasses.places.places import Place
+        return sorted((ob for ob in self.contents if isinstance(ob, Place)), key=lambda ob: ob.id)
+
     def softdelete(self):
         for entrance in self.entrances:
             entrance.softdelete()
@@ -137,14 +199,36 @@ class ArxRoom(NameMixins, ObjectMixins, ExtendedRoom, MagicMixins):
 
     def return_appearance(self, looker, detailed=False, format_desc=True, show_contents=True):
         """This is called when e.g. the look command wants to retrieve the description of this object."""
-        # update desc
-        ExtendedRoom.return_appearance(self, looker)
-        # return updated desc plus other stuff
-        return (ObjectMixins.return_appearance(self, looker, detailed, format_desc)
-                + self.command_string() + self.mood_string + self.event_string() + self.extra_status_string(looker)
-                + self.combat_string(looker))
-    
+        if not looker:
+            return
+        # update desc for the time and season
+        self.update_current_description()
+        strip_ansi = looker.db.stripansinames
+        string = self.get_desc_string(format_desc=format_desc, strip_ansi=strip_ansi)
+        # contents and combat depend on who is looking, so they're never cached
+        string += self.return_contents(looker, strip_ansi=strip_ansi) or ""
+        return (string + self.command_string() + self.mood_string + self.event_string()
+                + self.extra_status_string(looker) + self.combat_string(looker))
+
+    def get_desc_string(self, format_desc=True, strip_ansi=False):
+        """Returns our name and desc for return_appearance from our appearance cache."""
+        key = (format_desc, bool(strip_ansi))
+        source = (self.name, self.desc)
+        descs = self.appearance_cache.setdefault("desc", {})
+        if key not in descs or descs[key][0] != source:
+            descs[key] = (source, self.return_desc_string(format_desc=format_desc, strip_ansi=strip_ansi))
+        return descs[key][1]
+
     def _current_event(self):
+        cache = self.appearance_cache
+        event = cache.get("event")
+        if "event" not in cache or (event and not event.pk):
+            event = cache["event"] = self.get_current_event()
+        return event
+    event = property(_current_event)
+
+    def get_current_event(self):
+        """Looks up the event being logged in this room."""
         if not self.db.current_event:
             return None
         from world.dominion.models import RPEvent
@@ -152,7 +236,6 @@ class ArxRoom(NameMixins, ObjectMixins, ExtendedRoom, MagicMixins):
             return RPEvent.objects.get(id=self.db.current_event)
         except (RPEvent.DoesNotExist, ValueError, TypeError):
             return None
-    event = property(_current_event)
 
     def _entrances(self):
         return ObjectDB.objects.filter(db_destination=self)
@@ -203,13 +286,18 @@ class ArxRoom(NameMixins, ObjectMixins, ExtendedRoom, MagicMixins):
         self.msg_contents("{rEvent logging is now on for this room.{n")
         self.tags.add("logging event")
         self.db.current_event = event.id
+        self.clear_appearance_cache("event")
 
     def stop_event_logging(self):
         self.tags.remove("logging event")
         self.attributes.remove("current_event")
+        self.clear_appearance_cache("event")
         self.msg_contents("{rEvent logging is now off for this room.{n")
 
     def command_string(self):
+        cache = self.appearance_cache
+        if "commands" in cache:
+            return cache["commands"]
         msg = ""
         tags = self.tags.all()
         if "shop" in tags:
@@ -218,21 +306,37 @@ class ArxRoom(NameMixins, ObjectMixins, ExtendedRoom, MagicMixins):
             msg += "\n    {wYou can {c+bank{w here.{n"
         if "nonlethal_combat" in tags:
             msg += "\n{wCombat in this room is non-lethal."
+        cache["commands"] = msg
         return msg
 
     @property
     def mood_string(self):
-        msg = ""
-        mood = self.db.room_mood
-        try:
-            created = mood[1]
-            if time.time() - created > 86400:
-                self.attributes.remove('room_mood')
-            else:
-                msg = "\n{wCurrent Room Mood:{n " + mood[2]
-        except (IndexError, ValueError, TypeError):
+        cache = self.appearance_cache
+        expires = cache["mood"][0] if "mood" in cache else None
+        if "mood" not in cache or (expires and time.time() > expires):
+            expires = None
             msg = ""
-        return msg
+            mood = self.db.room_mood
+            try:
+                created = mood[1]
+                if time.time() - created > ROOM_MOOD_DURATION:
+                    self.attributes.remove('room_mood')
+                else:
+                    msg = "\n{wCurrent Room Mood:{n " + mood[2]
+                    expires = created + ROOM_MOOD_DURATION
+            except (IndexError, ValueError, TypeError):
+                msg = ""
+            cache["mood"] = (expires, msg)
+        return cache["mood"][1]
+
+    def set_room_mood(self, caller, text):
+        """Sets the mood shown in our appearance for the next day."""
+        self.db.room_mood = (caller, time.time(), text)
+        self.clear_appearance_cache("mood")
+
+    def clear_room_mood(self):
+        self.attributes.remove("room_mood")
+        self.clear_appearance_cache("mood")
 
     def _homeowners(self):
         return self.db.owners or []
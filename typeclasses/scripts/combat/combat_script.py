@@ -128,6 +128,7 @@ class CombatManager(BaseScript):
         # to ensure proper shutdown, prevent some timing errors
         self.ndb.shutting_down = False
         self.ndb.status_table = None
+        self.ndb.status_rows = None
         self.ndb.initializing = True
         if self.obj.event:
             self.ndb.risk = self.obj.event.risk
@@ -139,8 +140,7 @@ class CombatManager(BaseScript):
     @property
     def status_table(self):
         """text table of the combat"""
-        if not self.ndb.status_table:
-            self.build_status_table()
+        self.build_status_table()
         return self.ndb.status_table
 
     def at_repeat(self):
@@ -197,6 +197,10 @@ class CombatManager(BaseScript):
         """
         if self.ndb.shutting_down:
             return
+        character.msg(self.get_phase_status(disp_intro))
+
+    def get_phase_status(self, disp_intro=True):
+        """Returns the message display_phase_status sends, which is the same for everyone"""
         msg = ""
         if self.ndb.phase == 1:
             if disp_intro:
@@ -211,28 +215,34 @@ class CombatManager(BaseScript):
             msg += str(self.status_table) + "\n"
             msg += self.get_initiative_list() + "\n"
         msg += "{wCurrent Round:{n %d" % self.ndb.rounds
-        character.msg(msg)
+        return msg
 
     def build_status_table(self):
-        """Builds a table of the status of combatants"""
-        combatants = sorted(self.ndb.combatants)
+        """
+        Builds a table of the status of combatants. Each combatant's row is only built again when
+        it's changed, and the table is only rendered again when any of the rows have.
+        """
+        # rows are refreshed before sorting, so the order goes by who's ready now: those who are, then by name
+        rows = tuple(sorted((state.get_status_row() for state in self.ndb.combatants),
+                            key=lambda row: (row[4] != "yes", row[0])))
+        if rows == self.ndb.status_rows and self.ndb.status_table is not None:
+            return
         table = PrettyTable(["{wCombatant{n", "{wDamage{n", "{wFatigue{n", "{wAction{n", "{wReady?{n"])
-        for state in combatants:
-            name = state.combat_handler.name
-            dmg = state.character.get_wound_descriptor(state.character.dmg)
-            fatigue = str(state.fatigue_penalty)
-            action = "None" if not state.queued_action else state.queued_action.table_str
-            rdy = "yes" if state.ready else "{rno{n"
-            table.add_row([name, dmg, fatigue, action, rdy])
-        self.ndb.status_table = table
+        for row in rows:
+            table.add_row(list(row))
+        self.ndb.status_rows = rows
+        self.ndb.status_table = str(table)
 
     def display_phase_status_to_all(self, intro=False):
         """Sends status to all characters in or watching the fight"""
         msglist = set([ob.character for ob in self.ndb.combatants] + self.ndb.observers)
         self.build_status_table()
         self.ready_check()
+        if self.ndb.shutting_down:
+            return
+        msg = self.get_phase_status(intro)
         for ob in msglist:
-            self.display_phase_status(ob, disp_intro=intro)
+            ob.msg(msg)
 
     def msg(self, message, exclude=None, options=None):
         """
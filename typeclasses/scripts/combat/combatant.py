@@ -40,7 +40,7 @@ class CombatHandler(object):
         self.state = None
         self.char = character
         self.spectated_combat = None
-        if character.db.num_living:
+        if getattr(character, "num_living", None):
             self.multiple = True
             self.switch_chance = 50
             try:
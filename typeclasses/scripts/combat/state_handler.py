@@ -148,6 +148,9 @@ class CombatantStateHandler(object):
         self.prevent_surrender_list = []
         self.automated_override = False
         self.recent_actions = []
+        # our row of the combat's status table, and what it was built from
+        self._status_key = None
+        self._status_row = None
         if reset:
             self.reset()
 
@@ -241,6 +244,20 @@ class CombatantStateHandler(object):
         # set whether or not a sissy-man non-npc is ready. Unlike npcs, which are ALWAYS READY. BOOYAH.
         self._ready = value
 
+    def get_status_row(self):
+        """
+        Returns our row of the combat's status table as a tuple. It's only built again when our name,
+        damage, fatigue, queued action or readiness has changed since the last time.
+        """
+        action = self.queued_action
+        key = (str(self), self.character.dmg, self._fatigue_penalty, action, action and action.targ, self.ready)
+        if key != self._status_key:
+            name, dmg, _, _, _, ready = key
+            self._status_row = (name, self.character.get_wound_descriptor(dmg), str(self.fatigue_penalty),
+                                "None" if not action else action.table_str, "yes" if ready else "{rno{n")
+            self._status_key = key
+        return self._status_row
+
     def leave_combat(self):
         """Leaves combat"""
         character = self.character
@@ -258,7 +275,8 @@ class CombatantStateHandler(object):
         character.cmdset.delete(CombatCmdSet)
         self.combat_handler.state = None
         try:
-            # remove temporary losses from MultiNpcs
+            # save losses from the last round and remove temporary losses from MultiNpcs
+            self.character.save_losses()
             self.character.temp_losses = 0
         except AttributeError:
             pass
@@ -272,6 +290,8 @@ class CombatantStateHandler(object):
         self.fatigue_gained_this_turn = 0
         # check for attrition between rounds
         if self.combat_handler.multiple:
+            # losses from the last round are saved all at once
+            self.character.save_losses()
             self.num_attacks = self.combat_handler.num
         self.remaining_attacks = self.num_attacks
 
@@ -362,7 +382,7 @@ class CombatantStateHandler(object):
         if not defenders:
             return targ, mssg
         # build dict of our defenders to how many dudes they have
-        chance_dict = {obj: obj.db.num_living or 1 for obj in defenders if obj}
+        chance_dict = {obj: getattr(obj, 'num_living', 0) or 1 for obj in defenders if obj}
         # # add original target
         # chance_dict[targ] = targ.db.num_living or 1
         # do a roll from 0 to the total of all dudes in the dict
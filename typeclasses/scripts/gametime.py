@@ -1,3 +1,13 @@
+"""
+IC game time, kept by the GameTime script.
+
+The script's time marks are read once into a TimeIndex, sorted so that converting a
+runtime or real time to game time is a bisect rather than a walk through every mark.
+The index is only rebuilt when the script marks a new time, and the script itself is
+looked up once rather than queried for on every call.
+"""
+from bisect import bisect_left
+from operator import itemgetter
 import time
 import datetime
 
@@ -60,6 +70,7 @@ class GameTime(Script):
         times = list(self.intervals)
         times.append(tdict)
         self.attributes.add("intervals", times)
+        clear_time_index()
 
         from evennia.utils import logger
         logger.log_info("Gametime: Marked new time {}".format(tdict))
@@ -158,6 +169,7 @@ class GameTime(Script):
                 runtime_marks = self.runtime_marks
                 runtime_marks.append({'runtime': self.runtime, 'realtime': time.time()})
                 self.attributes.add('runtime_marks', runtime_marks)
+        clear_time_index()
 
     def at_server_shutdown(self):
         """
@@ -176,17 +188,88 @@ class GameTime(Script):
         self.attributes.add("check_run_time_since", time.time())
 
 
+_GAMETIME_SCRIPT = None
+_TIME_INDEX = None
+# the game hour we last found the season and time of day for, and what they were
+_TIME_AND_SEASON = (None, None)
+
+
 def get_script():
     """
     Returns the ScriptDB instance
     :return:
     """
-    from evennia.scripts.models import ScriptDB
-    try:
-        script = ScriptDB.objects.get(db_key=GAMETIME_SCRIPT_NAME)
-        return script
-    except ScriptDB.DoesNotExist:
-        return create_script(GameTime)
+    global _GAMETIME_SCRIPT
+    if _GAMETIME_SCRIPT is None or not _GAMETIME_SCRIPT.pk:
+        from evennia.scripts.models import ScriptDB
+        try:
+            _GAMETIME_SCRIPT = ScriptDB.objects.get(db_key=GAMETIME_SCRIPT_NAME)
+        except ScriptDB.DoesNotExist:
+            _GAMETIME_SCRIPT = create_script(GameTime)
+    return _GAMETIME_SCRIPT
+
+
+class TimeIndex(object):
+    """
+    The marks of the GameTime script, sorted for conversions between real time, runtime and game time.
+    """
+    def __init__(self, intervals, runtime_marks):
+        self.intervals = sorted((dict(tdict) for tdict in intervals), key=itemgetter('run'))
+        self.runs = [tdict['run'] for tdict in self.intervals]
+        # pairs of a real time and what our runtime was at that moment
+        real_marks = [(tdict['real'], tdict['run']) for tdict in self.intervals if 'real' in tdict]
+        real_marks += [(mark['realtime'], mark['runtime']) for mark in runtime_marks]
+        self.real_marks = sorted(real_marks)
+        self.reals = [real for real, _ in self.real_marks]
+
+    @property
+    def last_mark(self):
+        """The last runtime / gametime / multiplier marker, returned in that order."""
+        if not self.intervals:
+            return 0, 0, 2.0
+        tdict = self.intervals[-1]
+        return tdict['run'], tdict['game'], tdict['multiplier']
+
+    def gametime(self, run_time):
+        """The game time at the given runtime, going by our latest multiplier."""
+        run, game, multi = self.last_mark
+        return game + ((run_time - run) * multi)
+
+    def runtime_to_gametime(self, run_time):
+        """The game time at a runtime, using the multiplier that was in effect then."""
+        index = bisect_left(self.runs, run_time) - 1
+        if index < 0:
+            last_runtime, last_gametime, last_timescale = 0, 0, 2
+        else:
+            tdict = self.intervals[index]
+            last_runtime, last_gametime, last_timescale = tdict['run'], tdict['game'], tdict['multiplier']
+        return last_gametime + ((run_time - last_runtime) * last_timescale)
+
+    def realtime_to_runtime(self, realtime_secs):
+        """The runtime at a real time, or None if we have no mark before it to go by."""
+        index = bisect_left(self.reals, realtime_secs) - 1
+        if index < 0:
+            return None
+        last_realtime, last_runtime = self.real_marks[index]
+        if last_runtime == 0:
+            return None
+        return last_runtime + (realtime_secs - last_realtime)
+
+
+def get_time_index():
+    """Returns the TimeIndex for the script's marks, building it if they've changed."""
+    global _TIME_INDEX
+    if _TIME_INDEX is None:
+        script = get_script()
+        _TIME_INDEX = TimeIndex(script.intervals, script.runtime_marks)
+    return _TIME_INDEX
+
+
+def clear_time_index():
+    """Called whenever the script's marks change."""
+    global _TIME_INDEX, _TIME_AND_SEASON
+    _TIME_INDEX = None
+    _TIME_AND_SEASON = (None, None)
 
 
 # Legacy definitions
@@ -250,8 +333,7 @@ def gametime(game_time=None, format=False):
     :param format: Whether to parse into elements.
     """
     if not game_time:
-        script = get_script()
-        game_time = script.gametime
+        game_time = get_time_index().gametime(runtime())
     if format:
         return _format(game_time, YEAR, MONTH, WEEK, DAY, HOUR, MIN)
     return game_time
@@ -261,8 +343,7 @@ def time_factor():
     """
     Returns the current IC time multiplier.
     """
-    script = get_script()
-    _, _, multiplier = script.last_mark
+    _, _, multiplier = get_time_index().last_mark
     return multiplier
 
 
@@ -279,26 +360,11 @@ def time_intervals():
     """
     Return all our historical time-intervals
     """
-    script = get_script()
-    return script.intervals
+    return get_time_index().intervals
 
 
 def runtime_to_gametime(runtime, format=False):
-    intervals = time_intervals()
-    last_runtime = 0
-    last_gametime = 0
-    last_timescale = 2
-    for interval in reversed(intervals):
-        if interval['run'] < runtime:
-            last_runtime = interval['run']
-            last_gametime = interval['game']
-            last_timescale = interval['multiplier']
-
-    timediff = runtime - last_runtime
-    game_time = last_gametime + (timediff * last_timescale)
-
-    current_game_time = get_script().gametime
-
+    game_time = get_time_index().runtime_to_gametime(runtime)
     if format:
         return _format(game_time, YEAR, MONTH, WEEK, DAY, HOUR, MIN)
     return game_time
@@ -317,25 +383,9 @@ def closest_journal(realtime_secs):
 
 
 def realtime_to_gametime(realtime_secs, format=False):
-    script = get_script()
-    runtime_marks = script.runtime_marks
-
-    # This is not accurate, but it's the best we can do for defaults
-    last_realtime = time.time() - script.runtime
-    last_runtime = 0
-
-    # Try to find better default
-    for mark in reversed(script.intervals):
-        if mark['real'] < realtime_secs:
-            last_runtime = mark['run']
-            last_realtime = mark['real']
-
-    for mark in reversed(runtime_marks):
-        if mark['realtime'] < realtime_secs:
-            last_realtime = mark['realtime']
-            last_runtime = mark['runtime']
+    run_time = get_time_index().realtime_to_runtime(realtime_secs)
 
-    if last_runtime == 0:
+    if run_time is None:
         journal = closest_journal(realtime_secs)
         if journal is not None:
             journal_ic_date = journal.parse_header().get('date')
@@ -354,8 +404,6 @@ def realtime_to_gametime(realtime_secs, format=False):
         else:
             return None
 
-    time_diff = realtime_secs - last_realtime
-    run_time = last_runtime + time_diff
     return runtime_to_gametime(run_time, format=format)
 
 
@@ -367,9 +415,22 @@ DAY_BOUNDARIES = (0, 6 / 24.0, 12 / 24.0, 18 / 24.0)
 
 
 def get_time_and_season():
-    # get the current time as parts of year and parts of day
+    """
+    Returns the current season and time of day. They can only change on the hour, so we
+    remember them for the rest of the game hour.
+    """
+    global _TIME_AND_SEASON
+    game_time = gametime()
+    game_hour = int(game_time // HOUR)
+    if _TIME_AND_SEASON[0] != game_hour:
+        _TIME_AND_SEASON = (game_hour, time_and_season_at(game_time))
+    return _TIME_AND_SEASON[1]
+
+
+def time_and_season_at(game_time):
+    # get the time as parts of year and parts of day
     # returns a tuple (years,months,weeks,days,hours,minutes,sec)
-    current_time = gametime(format=True)
+    current_time = _format(game_time, YEAR, MONTH, WEEK, DAY, HOUR, MIN)
     month, hour = current_time[1], current_time[4]
     season = float(month) / MONTHS_PER_YEAR
     timeslot = float(hour) / HOURS_PER_DAY
@@ -1,8 +1,10 @@
 """
 Tests for scripts.
 """
+from django.test import TestCase
 from evennia import create_script
 from server.utils.test_utils import ArxCommandTest
+from typeclasses.scripts import gametime
 from world.dominion.models import AccountTransaction, LIFESTYLES
 from typeclasses.scripts.weekly_events import WeeklyEvents
 
@@ -57,3 +59,23 @@ class TestWeeklyEventScript(ArxCommandTest):
         self.assertEqual(self.assetowner5.vault, pl5)  # Same because tran2 failed
         self.assert_tran_success(tran3, pl2 - tran1.weekly_amount, receiver_vault=None)
         self.assert_tran_success(tran4, pl4, pl3 + tran1.weekly_amount)
+
+
+class TestGameTimeIndex(TestCase):
+    def test_conversions(self):
+        intervals = [{'run': 100, 'game': 200, 'multiplier': 4, 'real': 1100},
+                     {'run': 0, 'game': 0, 'multiplier': 2, 'real': 1000}]
+        index = gametime.TimeIndex(intervals, [{'runtime': 300, 'realtime': 2000}])
+        self.assertEqual(index.last_mark, (100, 200, 4))
+        self.assertEqual(index.gametime(150), 400)
+        self.assertEqual(index.runtime_to_gametime(50), 100)
+        self.assertEqual(index.runtime_to_gametime(150), 400)
+        self.assertEqual(index.realtime_to_runtime(1150), 150)
+        self.assertEqual(index.realtime_to_runtime(2010), 310)
+        self.assertIsNone(index.realtime_to_runtime(1050))
+        self.assertIsNone(index.realtime_to_runtime(900))
+
+    def test_time_and_season(self):
+        self.assertEqual(gametime.time_and_season_at(0), ("winter", "night"))
+        game_time = 3 * gametime.MONTH + 13 * gametime.HOUR
+        self.assertEqual(gametime.time_and_season_at(game_time), ("spring", "afternoon"))
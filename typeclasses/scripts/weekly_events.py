@@ -7,7 +7,8 @@ import traceback
 from collections import defaultdict
 from datetime import datetime, timedelta
 
-from django.db.models import Q, F
+from django.db.models import Q, F, Value, TextField
+from django.db.models.functions import Concat
 
 
 from evennia.objects.models import ObjectDB
@@ -64,11 +65,43 @@ class BulkInformCreator(object):
         self.informs.append(inform)
         return inform
 
-    def create_and_send_informs(self, sender="the Weekly Update script"):
-        """Creates all our informs and notifies players/orgs about them"""
+    def append_player_informs(self, players, msg, category, week=None):
+        """
+        Appends msg to each player's first unread inform of the category and week with a single update,
+        and adds a new inform for every player who doesn't have one.
+        """
+        week = week or self.week or 0
+        players = list(players)
+        first_unread = {}
+        unread = Inform.objects.filter(player__in=players, category=category, week=week, read_by__isnull=True)
+        for inform_id, player_id in unread.order_by('id').values_list('id', 'player'):
+            first_unread.setdefault(player_id, inform_id)
+        if first_unread:
+            Inform.objects.filter(id__in=first_unread.values()).update(
+                message=Concat(F('message'), Value("\n\n" + msg), output_field=TextField()))
+        for player in players:
+            if player.id in first_unread:
+                self.receivers_to_notify.add(player)
+            else:
+                self.add_player_inform(player, msg, category, week)
+
+    def create_and_send_informs(self, sender="the Weekly Update script", deferred=False):
+        """
+        Creates all our informs and notifies players/orgs about them. If deferred, the notifications are
+        sent once the reactor is free, so a command creating the informs doesn't wait on them.
+        """
         Inform.objects.bulk_create(self.informs)
+        if deferred:
+            from twisted.internet import reactor
+            reactor.callLater(0, self.notify_receivers, sender)
+        else:
+            self.notify_receivers(sender)
+
+    def notify_receivers(self, sender):
+        """Tells the players we've made informs for that they have new ones"""
         for receiver in self.receivers_to_notify:
-            receiver.msg("{yYou have new informs from %s.{n" % sender)
+            if receiver.is_connected:
+                receiver.msg("{yYou have new informs from %s.{n" % sender)
 
 
 class WeeklyEvents(RunDateMixin, Script):
@@ -0,0 +1 @@
+default_app_config = 'web.character.apps.CharacterConfig'
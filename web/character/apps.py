@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CharacterConfig(AppConfig):
+
+    name = 'web.character'
+
+    def ready(self):
+        from .roster_snapshot import connect_signals
+        from world.stats_and_skills import connect_signals as connect_advancement_signals
+        connect_signals()
+        connect_advancement_signals()
@@ -0,0 +1,112 @@
+"""
+Snapshot of the attributes shown in roster listings.
+
+@roster, +who-style room listings and the web roster pages all show the same
+handful of attributes for every character. Rather than reading them one
+Attribute at a time per row, RosterSnapshot keeps them in columns keyed by
+character id. Missing characters are loaded together in a single query, and
+signals on Attribute keep loaded rows in step when those attributes are set,
+added or deleted.
+"""
+from django.db.models.signals import post_save, pre_delete, m2m_changed
+
+SNAPSHOT_FIELDS = ("longname", "gender", "age", "fealty", "concept", "social_rank")
+
+
+class RosterSnapshot(object):
+    """Columns of roster display fields, keyed by character id."""
+
+    def __init__(self):
+        self.columns = {field: {} for field in SNAPSHOT_FIELDS}
+        self.loaded = set()
+
+    def load(self, char_ids):
+        """Loads every character we don't have yet with a single query."""
+        from evennia.typeclasses.attributes import Attribute
+        from evennia.utils.dbserialize import from_pickle
+        missing = set(char_ids) - self.loaded
+        if not missing:
+            return
+        attrs = Attribute.objects.filter(objectdb__id__in=missing, db_key__in=SNAPSHOT_FIELDS,
+                                         db_category__isnull=True).values_list('objectdb__id', 'db_key', 'db_value')
+        for char_id, key, value in attrs:
+            self.columns[key][char_id] = from_pickle(value)
+        self.loaded.update(missing)
+
+    def row(self, char_id):
+        """Returns a dict of the display fields for a character that's been loaded."""
+        return {field: column.get(char_id) for field, column in self.columns.items()}
+
+    def rows_for(self, characters):
+        """Returns a list of (character, row) tuples, loading whichever are missing."""
+        characters = list(characters)
+        self.load(ob.id for ob in characters)
+        return [(ob, self.row(ob.id)) for ob in characters]
+
+    def set_value(self, char_id, field, value):
+        if char_id in self.loaded:
+            self.columns[field][char_id] = value
+
+    def discard(self, char_id):
+        """Forgets a character, so they're reloaded the next time they're listed."""
+        self.loaded.discard(char_id)
+        for column in self.columns.values():
+            column.pop(char_id, None)
+
+    def clear(self):
+        self.loaded.clear()
+        for column in self.columns.values():
+            column.clear()
+
+
+ROSTER_SNAPSHOT = RosterSnapshot()
+
+
+def is_snapshot_attribute(attr):
+    return attr.db_key in SNAPSHOT_FIELDS and attr.db_category is None
+
+
+def owner_ids(attr):
+    """Ids of the objects an attribute is attached to."""
+    if not ROSTER_SNAPSHOT.loaded:
+        return []
+    return list(attr.objectdb_set.values_list('id', flat=True))
+
+
+def attribute_saved(sender, instance, **kwargs):
+    """Picks up new values for attributes that are already attached to a character."""
+    if not is_snapshot_attribute(instance):
+        return
+    for char_id in owner_ids(instance):
+        ROSTER_SNAPSHOT.set_value(char_id, instance.db_key, instance.value)
+
+
+def attribute_deleted(sender, instance, **kwargs):
+    if not is_snapshot_attribute(instance):
+        return
+    for char_id in owner_ids(instance):
+        ROSTER_SNAPSHOT.discard(char_id)
+
+
+def attributes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    New attributes are attached to an object only after they're saved, so any change to an object's
+    set of attributes drops its row to be reloaded.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        if is_snapshot_attribute(instance):
+            for char_id in pk_set or owner_ids(instance):
+                ROSTER_SNAPSHOT.discard(char_id)
+    else:
+        ROSTER_SNAPSHOT.discard(instance.id)
+
+
+def connect_signals():
+    """Called when the app is ready."""
+    from evennia.objects.models import ObjectDB
+    from evennia.typeclasses.attributes import Attribute
+    post_save.connect(attribute_saved, sender=Attribute)
+    pre_delete.connect(attribute_deleted, sender=Attribute)
+    m2m_changed.connect(attributes_changed, sender=ObjectDB.db_attributes.through)
@@ -10,6 +10,7 @@ from server.utils.test_utils import ArxCommandTest, ArxTest
 from evennia.server.models import ServerConfig
 from web.character import investigation, scene_commands, goal_commands
 from web.character.models import Clue, Revelation, SearchTag, Goal
+from web.character.roster_snapshot import ROSTER_SNAPSHOT
 
 
 class InvestigationTests(ArxCommandTest):
@@ -334,6 +335,25 @@ class ViewTests(ArxTest):
         response = self.client.get(action_url)
         self.assertContains(response, "Social Resources:</b> 300")
 
+    def test_roster_snapshot(self):
+        """roster rows follow the attributes they're built from"""
+        ROSTER_SNAPSHOT.clear()
+        self.char2.db.concept = "Tester"
+        ((char, row),) = ROSTER_SNAPSHOT.rows_for([self.char2])
+        self.assertEqual(row['concept'], "Tester")
+        self.char2.db.concept = "Spy"
+        self.assertEqual(ROSTER_SNAPSHOT.row(self.char2.id)['concept'], "Spy")
+        # a brand new attribute drops the row, and it's reloaded on the next listing
+        self.char2.db.social_rank = 5
+        self.assertNotIn(self.char2.id, ROSTER_SNAPSHOT.loaded)
+        ((char, row),) = ROSTER_SNAPSHOT.rows_for([self.char2])
+        self.assertEqual(row['social_rank'], 5)
+        del self.char2.db.concept
+        ((char, row),) = ROSTER_SNAPSHOT.rows_for([self.char2])
+        self.assertIsNone(row['concept'])
+        response = self.client.get(reverse('character:active_roster'))
+        self.assertEqual(response.status_code, 200)
+
 
 class PRPClueTests(ArxCommandTest):
     def setUp(self):
@@ -34,6 +34,7 @@ from world.dominion.plots.models import PlotAction, ActionSubmissionError
 from .forms import (PhotoForm, PhotoDirectForm, PhotoUnsignedDirectForm, PortraitSelectForm,
                     PhotoDeleteForm, PhotoEditForm, FlashbackPostForm, FlashbackCreateForm)
 from .models import Photo, Story, Episode, Chapter, Flashback, ClueDiscovery
+from .roster_snapshot import ROSTER_SNAPSHOT
 
 
 def get_character_from_ob(object_id):
@@ -226,6 +227,7 @@ class RosterListView(ListView):
             traceback.print_exc()
         context['show_hidden'] = show_hidden
         context['roster_name'] = self.roster_name
+        context['character_rows'] = ROSTER_SNAPSHOT.rows_for(context['object_list'])
         context['page_title'] = "%s Roster" % self.roster_name
         return context
 
@@ -287,3 +287,8 @@ class EffectTrigger(SharedMemoryModel):
         """On save, we'll refresh the cache of ou"""
         super(EffectTrigger, self).save(*args, **kwargs)
         self.object.triggerhandler.add_trigger_to_cache(self)
+
+    def delete(self, *args, **kwargs):
+        """On delete, we're removed from the cache of our object"""
+        self.object.triggerhandler.remove_trigger_from_cache(self)
+        return super(EffectTrigger, self).delete(*args, **kwargs)
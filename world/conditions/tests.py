@@ -96,3 +96,17 @@ class TestTriggers(ArxTest):
         self.trigger1.do_trigger_results.assert_not_called()
         self.trigger2.do_trigger_results.assert_called_once()
         self.trigger3.do_trigger_results.assert_called_once()
+
+    def test_trigger_cache(self):
+        handler = self.room2.triggerhandler
+        handler.warm_room_cache()
+        self.assertEqual(handler._cache[EffectTrigger.ON_OTHER_ENTRY],
+                         [(2, [self.trigger1]), (1, [self.trigger2, self.trigger3])])
+        self.assertEqual(handler._cache[EffectTrigger.ON_TAKING_DAMAGE], [])
+        self.trigger3.priority = 3
+        self.trigger3.save()
+        self.trigger1.delete()
+        self.assertEqual(handler._cache[EffectTrigger.ON_OTHER_ENTRY], [(3, [self.trigger3]), (1, [self.trigger2])])
+        self.char1.move_to(self.room2)
+        self.trigger3.do_trigger_results.assert_called_once()
+        self.trigger2.do_trigger_results.assert_not_called()
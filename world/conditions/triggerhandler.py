@@ -1,62 +1,125 @@
 """
 A class for caching triggers on individual objects to prevent queries on very frequent checks, like every
 time a character moves through a room.
+
+For each event type, the cache holds the triggers in buckets of the same priority, highest priority first,
+so checking triggers never has to sort them. Triggers update the caches of their object when they're saved
+or deleted.
 """
 _TRIGGER = None
 
+
+def get_trigger_model():
+    global _TRIGGER
+    if _TRIGGER is None:
+        from world.conditions.models import EffectTrigger as _TRIGGER
+    return _TRIGGER
+
+
+def warm_trigger_caches(objects):
+    """
+    Fills the trigger caches of a number of objects for every event type with a single query.
+
+        Args:
+            objects: Iterable of objects. Those without a triggerhandler, like shardhaven exits, are skipped.
+    """
+    handlers = {obj.id: obj.triggerhandler for obj in objects if obj and obj.id and hasattr(obj, "triggerhandler")}
+    if not handlers:
+        return
+    triggers = {obj_id: [] for obj_id in handlers}
+    for trigger in get_trigger_model().objects.filter(object_id__in=handlers.keys()).order_by('-priority', 'id'):
+        triggers[trigger.object_id].append(trigger)
+    event_types = [event for event, _ in get_trigger_model().EVENT_CHOICES]
+    for obj_id, handler in handlers.items():
+        for event_type in event_types:
+            handler.set_cached_triggers(event_type, [ob for ob in triggers[obj_id] if ob.trigger_event == event_type])
+
+
 class TriggerHandler(object):
     """
     Stores a cache of an ObjectDB's triggers.
     """
     def __init__(self, obj):
         self.obj = obj
+        # event_type: list of (priority, [triggers]) tuples, in descending order of priority
         self._cache = {}
-        
+
     def check_room_entry_triggers(self, target):
-        global _TRIGGER
-        if _TRIGGER is None:
-            from world.conditions.models import EffectTrigger as _TRIGGER
-        self.check_trigger(_TRIGGER.ON_OTHER_ENTRY, target)
-        
+        self.check_trigger(get_trigger_model().ON_OTHER_ENTRY, target)
+
     def check_health_change_triggers(self, amount):
-        global _TRIGGER
-        if _TRIGGER is None:
-            from world.conditions.models import EffectTrigger as _TRIGGER
+        trigger_model = get_trigger_model()
         if amount < 0:
-            self.check_trigger(_TRIGGER.ON_TAKING_DAMAGE, self.obj, change_amount=amount)
+            self.check_trigger(trigger_model.ON_TAKING_DAMAGE, self.obj, change_amount=amount)
         else:
-            self.check_trigger(_TRIGGER.ON_BEING_HEALED, self.obj, change_amount=amount)
+            self.check_trigger(trigger_model.ON_BEING_HEALED, self.obj, change_amount=amount)
 
     def check_trigger(self, event_type, target, change_amount=0):
-        """Checks triggers for a given event_type. Caches check."""
+        """
+        Checks triggers for a given event_type, highest priority first. Once any trigger of a priority
+        fires, lower priorities are skipped. Caches check.
+        """
         if event_type not in self._cache:
             self.add_query_to_cache(event_type)
-        triggered = False
-        current_priority = None
-        relevant_triggers = sorted([ob for ob in self._cache[event_type] if ob and ob.pk],
-                                   key=lambda x: x.priority, reverse=True)
-        for trigger in relevant_triggers:
-            if triggered and trigger.priority < current_priority:
+        stale = False
+        for priority, triggers in self._cache[event_type]:
+            triggered = False
+            for trigger in triggers:
+                if not trigger.pk:
+                    stale = True
+                    continue
+                if trigger.check_trigger_on_target(target, change_amount=change_amount):
+                    triggered = True
+            if triggered:
                 break
-            triggered = trigger.check_trigger_on_target(target, change_amount=change_amount)
-            current_priority = trigger.priority
-
-        if any([ob for ob in self._cache[event_type] if not ob or not ob.pk]):
+        if stale:
             self.add_query_to_cache(event_type)
 
+    def set_cached_triggers(self, event_type, triggers):
+        """Buckets a list of triggers for an event type, which must be sorted by descending priority."""
+        buckets = []
+        for trigger in triggers:
+            if buckets and buckets[-1][0] == trigger.priority:
+                buckets[-1][1].append(trigger)
+            else:
+                buckets.append((trigger.priority, [trigger]))
+        self._cache[event_type] = buckets
+
     def add_query_to_cache(self, event_type):
         """Caches a query for a triggering event."""
-        self._cache[event_type] = list(self.obj.triggers.filter(trigger_event=event_type).order_by('-priority'))
+        self.set_cached_triggers(event_type,
+                                 self.obj.triggers.filter(trigger_event=event_type).order_by('-priority', 'id'))
+
+    def warm_room_cache(self):
+        """Caches all the triggers for our object and everything in it in a single query."""
+        warm_trigger_caches([self.obj] + list(self.obj.contents))
 
     def add_trigger_to_cache(self, trigger):
         """
         When a trigger is saved, it'll check if it needs to be added to the triggerhandler cache. It might
-        be added by the cache building that query, but if the query is already in there we'll check to make sure
-        we're already there before appending.
+        be added by the cache building that query, but it could have changed its event or priority, so we
+        remove it from wherever it was before putting it in the right bucket.
         """
+        self.remove_trigger_from_cache(trigger)
         if trigger.trigger_event not in self._cache:
             self.add_query_to_cache(trigger.trigger_event)
-        elif trigger not in self._cache[trigger.trigger_event]:
-            trig_list = self._cache[trigger.trigger_event]
-            trig_list.append(trigger)
-            trig_list.sort(key=lambda x: x.priority, reverse=True)
+            return
+        buckets = self._cache[trigger.trigger_event]
+        for index, (priority, triggers) in enumerate(buckets):
+            if priority == trigger.priority:
+                triggers.append(trigger)
+                return
+            if priority < trigger.priority:
+                buckets.insert(index, (trigger.priority, [trigger]))
+                return
+        buckets.append((trigger.priority, [trigger]))
+
+    def remove_trigger_from_cache(self, trigger):
+        """Removes a trigger from any bucket it's in, dropping buckets left empty."""
+        for event_type, buckets in self._cache.items():
+            for index, (priority, triggers) in enumerate(buckets):
+                if trigger in triggers:
+                    triggers.remove(trigger)
+                    if not triggers:
+                        del buckets[index]
+                    return
@@ -14,6 +14,7 @@ __init__ and is populated with the instances of agents we find
 in the world.
 """
 
+from django.db import transaction
 from evennia.utils.create import create_object
 from typeclasses.npcs import npc_types
 
@@ -38,6 +39,7 @@ class AgentHandler(object):
             if agent.dbobj.db.guarding == character:
                 return agent
 
+    @transaction.atomic
     def get_or_create_agentob(self, num):
         assert (self.agent.quantity >= num), "Not enough agents to assign."
         if num < 1:
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.9 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dominion', '0046_auto_20191228_1417'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='fashion_fame',
+            field=models.IntegerField(default=0),
+        ),
+    ]
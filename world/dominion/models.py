@@ -334,6 +334,12 @@ class PlayerOrNpc(SharedMemoryModel):
             report.lifestyle_msg = "You were unable to afford to pay for your lifestyle.\n"
         return False
 
+    @CachedProperty
+    def plot_attendance(self):
+        """Index of the plot actions and assists we're attending in person. See PlotAttendance."""
+        from world.dominion.plots.models import PlotAttendance
+        return PlotAttendance(self)
+
     @CachedProperty
     def support_cooldowns(self):
         """Returns our support cooldowns, from cache if it's already been calculated"""
@@ -1094,6 +1100,24 @@ class AssetOwner(CachedPropertiesMixin, SharedMemoryModel):
             self.store_prestige_record(value, adjustment_type=PrestigeAdjustment.FAME, category=category,
                                        reason=reason, long_reason=long_reason)
 
+    def adjust_prestige_totals(self, totals, reason=None, long_reason=None):
+        """
+        Adjusts our prestige by several amounts with a single save, such as the fame from
+        every item of a modeled outfit.
+
+            Args:
+                totals: dict of PrestigeCategory (or None) to the fame gained in it. Amounts
+                    with a category have a record stored, as in adjust_prestige.
+                reason: reason for the records
+                long_reason: long reason for the records
+        """
+        self.fame += sum(totals.values())
+        self.save()
+        for category, value in totals.items():
+            if category:
+                self.store_prestige_record(value, adjustment_type=PrestigeAdjustment.FAME, category=category,
+                                           reason=reason, long_reason=long_reason)
+
     def adjust_legend(self, value, category=None, reason=None, long_reason=None):
         """
         Adjusts our legend. We gain legend equal to the value.
@@ -1797,6 +1821,8 @@ class Organization(InformMixin, SharedMemoryModel):
     social_influence = models.IntegerField(default=0)
     base_support_value = models.SmallIntegerField(default=5)
     member_support_multiplier = models.SmallIntegerField(default=5)
+    # our share of the fame from fashion modeled on our behalf
+    fashion_fame = models.IntegerField(default=0)
     clues = models.ManyToManyField('character.Clue', blank=True, related_name="orgs",
                                    through="ClueForOrg")
     theories = models.ManyToManyField('character.Theory', blank=True, related_name="orgs")
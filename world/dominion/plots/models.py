@@ -2,10 +2,10 @@ from datetime import datetime
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import Q, Sum, Count
 
 from evennia.utils.idmapper.models import SharedMemoryModel
-from server.utils.arx_utils import inform_staff, passthrough_properties, get_week
+from server.utils.arx_utils import inform_staff, passthrough_properties, get_week, CachedProperty, cache_safe_update
 from server.utils.exceptions import ActionSubmissionError, PayError
 from web.character.models import AbstractPlayerAllocations
 from world.dominion.domain.models import Army, Orders
@@ -52,6 +52,11 @@ class Plot(SharedMemoryModel):
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super(Plot, self).save(*args, **kwargs)
+        # escalation_points may have changed
+        del self.rating
+
     @property
     def time_remaining(self):
         """Returns timedelta of how much time is left before the crisis updates"""
@@ -59,9 +64,9 @@ class Plot(SharedMemoryModel):
         if self.end_date and self.end_date > now:
             return self.end_date - now
 
-    @property
+    @CachedProperty
     def rating(self):
-        """Returns how much rating is left in our crisis"""
+        """Returns how much rating is left in our crisis. Dropped when we or any of our actions are saved."""
         if self.escalation_points:
             return self.escalation_points - sum(ob.outcome_value for ob in self.actions.filter(
                 status=PlotAction.PUBLISHED))
@@ -162,20 +167,21 @@ class Plot(SharedMemoryModel):
         update = self.updates.create(date=datetime.now(), desc=gemit_text, gm_notes=gm_notes, episode=latest_episode)
         qs = self.actions.filter(status__in=(PlotAction.PUBLISHED, PlotAction.PENDING_PUBLISH,
                                              PlotAction.CANCELLED), beat__isnull=True)
-        pending = []
-        already_published = []
+        pending, already_published = [], []
         for action in qs:
             if action.status == PlotAction.PENDING_PUBLISH:
-                action.send(update=update, caller=caller)
-                pending.append(str(action.id))
+                pending.append(action)
             else:
-                action.update = update
-                action.save()
-                already_published.append(str(action.id))
+                already_published.append(action)
+        PlotAction.publish_all(pending, update, caller=caller)
+        PlotAction.objects.filter(id__in=[ob.id for ob in already_published]).update(beat=update)
+        for action in already_published:
+            action.beat = update
         if do_gemit:
             broadcast_msg_and_post(gemit_text, caller, episode_name=latest_episode.name)
-        pending = "Pending actions published: %s" % ", ".join(pending)
-        already_published = "Already published actions for this update: %s" % ", ".join(already_published)
+        pending = "Pending actions published: %s" % ", ".join(str(ob.id) for ob in pending)
+        already_published = "Already published actions for this update: %s" % ", ".join(str(ob.id) for ob in
+                                                                                      already_published)
         post = "Gemit:\n%s\nGM Notes: %s\n%s\n%s" % (gemit_text, gm_notes, pending, already_published)
         subject = "Update for %s" % self
         inform_staff("Crisis update posted by %s for %s:\n%s" % (caller, self, post), post=True, subject=subject)
@@ -258,10 +264,18 @@ class Plot(SharedMemoryModel):
         return msg
 
     def inform(self, text, category="Plot", append=True):
-        """Sends an inform to all active participants"""
-        active = self.dompcs.filter(plot_involvement__activity_status=PCPlotInvolvement.ACTIVE)
-        for dompc in active:
-            dompc.inform(text, category=category, append=append)
+        """Sends an inform to all active participants, creating them in bulk and notifying players afterwards"""
+        from typeclasses.scripts.weekly_events import BulkInformCreator
+        active = self.dompcs.filter(plot_involvement__activity_status=PCPlotInvolvement.ACTIVE,
+                                    player__isnull=False).select_related('player')
+        players = [dompc.player for dompc in active]
+        creator = BulkInformCreator(week=get_week())
+        if append:
+            creator.append_player_informs(players, text, category)
+        else:
+            for player in players:
+                creator.add_player_inform(player, text, category)
+        creator.create_and_send_informs(sender="the plot %s" % self, deferred=True)
 
 
 class OrgPlotInvolvement(SharedMemoryModel):
@@ -400,6 +414,46 @@ class PlotUpdate(SharedMemoryModel):
         return "".join(msg_bits)
 
 
+class PlotAttendance(object):
+    """
+    The unresolved actions and assists a dompc is physically attending, keyed by plot id. Saving or deleting
+    any action or assist bumps the shared generation, since a main action's status or beat changes what its
+    assistants are attending, and an index built in an older generation is rebuilt on its next use.
+    """
+    generation = 0
+
+    def __init__(self, dompc):
+        self.built_for = PlotAttendance.generation
+        self.attending = list(dompc.actions.filter(Q(beat__isnull=True)
+                                                   & Q(attending=True)
+                                                   & Q(plot__isnull=False)
+                                                   & ~Q(status=PlotAction.CANCELLED)
+                                                   & Q(date_submitted__isnull=False)))
+        self.attending += list(dompc.assisting_actions.filter(Q(plot_action__beat__isnull=True)
+                                                              & Q(attending=True)
+                                                              & Q(plot_action__plot__isnull=False)
+                                                              & ~Q(plot_action__status=PlotAction.CANCELLED)
+                                                              & Q(date_submitted__isnull=False)
+                                                              ).select_related('plot_action'))
+        self.by_plot = {}
+        for ob in self.attending:
+            self.by_plot.setdefault(ob.main_action.plot_id, []).append(ob)
+
+    @classmethod
+    def invalidate(cls, *args, **kwargs):
+        """Marks every dompc's index as out of date"""
+        cls.generation += 1
+
+    @property
+    def current(self):
+        """Whether nothing has changed since we were built"""
+        return self.built_for == PlotAttendance.generation
+
+    def for_plot(self, plot_id):
+        """Returns the actions and assists we're attending for the given plot"""
+        return self.by_plot.get(plot_id, [])
+
+
 class AbstractAction(AbstractPlayerAllocations):
     """Abstract parent class representing a player's participation in an action"""
     NOUN = "Action"
@@ -416,6 +470,14 @@ class AbstractAction(AbstractPlayerAllocations):
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        super(AbstractAction, self).save(*args, **kwargs)
+        PlotAttendance.invalidate()
+
+    def delete(self, *args, **kwargs):
+        PlotAttendance.invalidate()
+        return super(AbstractAction, self).delete(*args, **kwargs)
+
     @property
     def submitted(self):
         """Whether they've submitted this or not"""
@@ -552,25 +614,24 @@ class AbstractAction(AbstractPlayerAllocations):
         """In both child classes this check occurs after a resubmit."""
         pass
 
+    @property
+    def attendance_index(self):
+        """Returns our dompc's PlotAttendance, rebuilding it if any action has changed since it was built"""
+        index = self.dompc.plot_attendance
+        if not index.current:
+            del self.dompc.plot_attendance
+            index = self.dompc.plot_attendance
+        return index
+
     @property
     def plot_attendance(self):
         """Returns list of actions we are attending - physically present for"""
-        attended_actions = list(self.dompc.actions.filter(Q(beat__isnull=True)
-                                                          & Q(attending=True)
-                                                          & Q(plot__isnull=False)
-                                                          & ~Q(status=PlotAction.CANCELLED)
-                                                          & Q(date_submitted__isnull=False)))
-        attended_actions += list(self.dompc.assisting_actions.filter(Q(plot_action__beat__isnull=True)
-                                                                     & Q(attending=True)
-                                                                     & Q(plot_action__plot__isnull=False)
-                                                                     & ~Q(plot_action__status=PlotAction.CANCELLED)
-                                                                     & Q(date_submitted__isnull=False)))
-        return attended_actions
+        return list(self.attendance_index.attending)
 
     def check_plot_omnipresence(self):
         """Raises an ActionSubmissionError if we are already attending for this crisis"""
         if self.attending:
-            already_attending = [ob for ob in self.plot_attendance if ob.plot == self.plot]
+            already_attending = self.attendance_index.for_plot(self.plot.id if self.plot else None)
             if already_attending:
                 already_attending = already_attending[-1]
                 raise ActionSubmissionError("You are marked as physically present at %s. Use @action/toggleattend"
@@ -578,8 +639,8 @@ class AbstractAction(AbstractPlayerAllocations):
 
     def check_plot_overcrowd(self):
         """Raises an ActionSubmissionError if too many people are attending"""
-        attendees = self.attendees
-        if len(attendees) > self.attending_limit and not self.prefer_offscreen:
+        if self.attending_count > self.attending_limit and not self.prefer_offscreen:
+            attendees = self.attendees
             excess = len(attendees) - self.attending_limit
             raise ActionSubmissionError("An onscreen action can have %s people attending in person. %s of you should "
                                         "check your story, then change to a passive role with @action/toggleattend. "
@@ -722,6 +783,10 @@ class AbstractAction(AbstractPlayerAllocations):
         return self.questions.filter(answers__isnull=True).exclude(Q(is_intent=True) | Q(mark_answered=True))
 
 
+RESOURCE_TOTAL_FIELDS = ('social', 'economic', 'military', 'silver', 'action_points')
+ASSIST_TOTAL_FIELDS = RESOURCE_TOTAL_FIELDS + ('attending',)
+
+
 class PlotAction(AbstractAction):
     """
     An action that a player is taking. May be in response to a Crisis.
@@ -801,35 +866,89 @@ class PlotAction(AbstractAction):
             plot = ""
         return "%s by {c%s{n%s" % (self.NOUN, self.author, plot)
 
+    def __init__(self, *args, **kwargs):
+        super(PlotAction, self).__init__(*args, **kwargs)
+        # the plot we were last saved with, whose rating also changes if we're moved to another
+        self._saved_plot_id = self.plot_id
+
+    def save(self, *args, **kwargs):
+        super(PlotAction, self).save(*args, **kwargs)
+        self.clear_plot_rating(self.plot_id)
+        if self._saved_plot_id != self.plot_id:
+            self.clear_plot_rating(self._saved_plot_id)
+            self._saved_plot_id = self.plot_id
+
+    def delete(self, *args, **kwargs):
+        plot_id = self.plot_id
+        ret = super(PlotAction, self).delete(*args, **kwargs)
+        self.clear_plot_rating(plot_id)
+        return ret
+
+    @staticmethod
+    def clear_plot_rating(plot_id):
+        """Drops the cached rating of our plot, if it's in memory"""
+        plot = Plot.get_cached_instance(plot_id) if plot_id else None
+        if plot:
+            del plot.rating
+
     @property
     def sent(self):
         """Whether this action is published"""
         return bool(self.status == self.PUBLISHED)
 
+    @staticmethod
+    def get_assist_totals(actions):
+        """
+        Sums the resources spent by the assists of every action given, and counts those attending in person,
+        in a single aggregate query.
+
+            Args:
+                actions: An iterable of PlotActions
+
+            Returns:
+                A dict of action ID to a dict of totals. Actions without assists are absent.
+        """
+        annotations = {"total_%s" % field: Sum(field) for field in RESOURCE_TOTAL_FIELDS}
+        annotations['total_attending'] = Count('id', filter=Q(attending=True) & ~Q(actions=""))
+        rows = PlotActionAssistant.objects.filter(plot_action__in=actions).values('plot_action').annotate(
+            **annotations)
+        return {row['plot_action']: {field: row["total_%s" % field] or 0 for field in ASSIST_TOTAL_FIELDS}
+                for row in rows}
+
+    @CachedProperty
+    def assist_totals(self):
+        """Resources spent by our assists and how many are attending. Dropped when an assist is saved or deleted."""
+        return self.get_assist_totals([self]).get(self.id, dict.fromkeys(ASSIST_TOTAL_FIELDS, 0))
+
     @property
     def total_social(self):
         """Total social resources spent"""
-        return self.social + sum(ob.social for ob in self.assisting_actions.all())
+        return self.social + self.assist_totals['social']
 
     @property
     def total_economic(self):
         """Total economic resources spent"""
-        return self.economic + sum(ob.economic for ob in self.assisting_actions.all())
+        return self.economic + self.assist_totals['economic']
 
     @property
     def total_military(self):
         """Total military resources spent"""
-        return self.military + sum(ob.military for ob in self.assisting_actions.all())
+        return self.military + self.assist_totals['military']
 
     @property
     def total_silver(self):
         """Total silver spent"""
-        return self.silver + sum(ob.silver for ob in self.assisting_actions.all())
+        return self.silver + self.assist_totals['silver']
 
     @property
     def total_action_points(self):
         """Total action points spent"""
-        return self.action_points + sum(ob.action_points for ob in self.assisting_actions.all())
+        return self.action_points + self.assist_totals['action_points']
+
+    @property
+    def attending_count(self):
+        """Number of attendees, without fetching our assists"""
+        return int(bool(self.attending and self.actions)) + self.assist_totals['attending']
 
     @property
     def action_and_assists_and_invites(self):
@@ -846,14 +965,62 @@ class PlotAction(AbstractAction):
         """List of all actions and assists if they're currently editable"""
         return [ob for ob in self.action_and_assists_and_invites if ob.editable]
 
-    def send(self, update=None, caller=None):
-        """Publishes this action"""
+    def get_response_msg(self):
+        """Returns the inform text players receive when this action is published"""
         if self.plot:
             msg = "{wGM Response to action for crisis:{n %s" % self.plot
         else:
             msg = "{wGM Response to story action of %s" % self.author
         msg += "\n{wRolls:{n %s" % self.outcome_value
         msg += "\n\n{wStory Result:{n %s\n\n" % self.story
+        return msg
+
+    @classmethod
+    def publish_all(cls, actions, update, caller=None):
+        """
+        Publishes pending actions to a beat all at once. Informs for every author and assistant are
+        bulk created and their notifications deferred, and the actions and their army orders are each
+        marked with a single update.
+
+            Args:
+                actions: A list of PlotActions that haven't been published yet
+                update: The PlotUpdate they're published as part of
+                caller: The GM publishing them, recorded on any action that has no GM yet
+        """
+        from typeclasses.scripts.weekly_events import BulkInformCreator
+        if not actions:
+            return
+        week = get_week()
+        creator = BulkInformCreator(week=week)
+        assists = PlotActionAssistant.objects.filter(plot_action__in=actions).select_related('dompc__player')
+        assistants = {}
+        for assist in assists:
+            assistants.setdefault(assist.plot_action_id, []).append(assist.dompc)
+        for action in actions:
+            msg = action.get_response_msg()
+            for dompc in [action.dompc] + assistants.get(action.id, []):
+                if dompc.player:
+                    creator.add_player_inform(dompc.player, msg, "Actions")
+        ids = [ob.id for ob in actions]
+        cls.objects.filter(id__in=ids).update(beat=update, week=week, status=cls.PUBLISHED)
+        if caller:
+            cls.objects.filter(id__in=ids, gm__isnull=True).update(gm=caller)
+        for action in actions:
+            action.beat = update
+            action.week = week
+            action.status = cls.PUBLISHED
+            if not action.gm_id:
+                action.gm = caller
+        cache_safe_update(Orders.objects.filter(action__in=actions), complete=True)
+        creator.create_and_send_informs(sender="the GMs", deferred=True)
+        # updates skip save(), so drop what it would have
+        PlotAttendance.invalidate()
+        for plot_id in set(ob.plot_id for ob in actions):
+            cls.clear_plot_rating(plot_id)
+
+    def send(self, update=None, caller=None):
+        """Publishes this action"""
+        msg = self.get_response_msg()
         self.week = get_week()
         if update:
             self.beat = update
@@ -1163,7 +1330,8 @@ class PlotAction(AbstractAction):
 
 
 NAMES_OF_PROPERTIES_TO_PASS_THROUGH = ['plot', 'action_and_assists', 'status', 'prefer_offscreen', 'attendees',
-                                       'all_editable', 'outcome_value', 'difficulty', 'gm', 'attending_limit']
+                                       'all_editable', 'outcome_value', 'difficulty', 'gm', 'attending_limit',
+                                       'attending_count']
 
 
 @passthrough_properties('plot_action', *NAMES_OF_PROPERTIES_TO_PASS_THROUGH)
@@ -1183,6 +1351,23 @@ class PlotActionAssistant(AbstractAction):
     def __str__(self):
         return "%s assisting %s" % (self.author, self.plot_action)
 
+    def save(self, *args, **kwargs):
+        super(PlotActionAssistant, self).save(*args, **kwargs)
+        self.clear_assist_totals(self.plot_action_id)
+
+    def delete(self, *args, **kwargs):
+        plot_action_id = self.plot_action_id
+        ret = super(PlotActionAssistant, self).delete(*args, **kwargs)
+        self.clear_assist_totals(plot_action_id)
+        return ret
+
+    @staticmethod
+    def clear_assist_totals(plot_action_id):
+        """Drops the cached assist totals of the action we're assisting, if it's in memory"""
+        action = PlotAction.get_cached_instance(plot_action_id)
+        if action:
+            del action.assist_totals
+
     @property
     def pretty_str(self):
         """Formatted string of the assist"""
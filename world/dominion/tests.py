@@ -447,3 +447,47 @@ class TestPlotCommands(TestTicketMixins, ArxCommandTest):
                                  'Submitted: 08/27/78 12:08:00 - Last Update: 08/27/78 12:08:00\nRequest: notes\n'
                                  'Plot: testrfr (#7)\nGM Resolution: None')
         self.call_cmd("/rfr/close 10=ok whatever", 'You have marked the rfr as closed.')
+
+    def test_action_totals_and_rating(self):
+        from datetime import datetime
+        self.plot1.escalation_points = 20
+        self.plot1.save()
+        action = PlotAction.objects.create(dompc=self.dompc, plot=self.plot1, social=5, actions="story",
+                                           date_submitted=datetime.now(), outcome_value=8)
+        assist = action.assisting_actions.create(dompc=self.dompc2, social=10, silver=3, actions="help",
+                                                date_submitted=datetime.now())
+        self.assertEqual(action.total_social, 15)
+        self.assertEqual(action.attending_count, 2)
+        assist.social = 20
+        assist.save()
+        self.assertEqual(action.total_social, 25)
+        self.assertEqual(action.assist_totals['silver'], 3)
+        self.assertEqual(self.plot1.rating, 20)
+        action.status = PlotAction.PUBLISHED
+        action.save()
+        self.assertEqual(self.plot1.rating, 12)
+        # moving an action to another plot changes the rating of both
+        self.plot2.escalation_points = 30
+        self.plot2.save()
+        self.assertEqual(self.plot2.rating, 30)
+        action.plot = self.plot2
+        action.save()
+        self.assertEqual(self.plot1.rating, 20)
+        self.assertEqual(self.plot2.rating, 22)
+        action.plot = self.plot1
+        action.save()
+        # attendance is indexed by plot, and refreshed once actions change
+        self.assertEqual(assist.attendance_index.for_plot(self.plot1.id), [assist])
+        action.status = PlotAction.CANCELLED
+        action.save()
+        self.assertEqual(assist.plot_attendance, [])
+
+    @patch("world.dominion.plots.models.get_week")
+    def test_plot_inform(self, mock_get_week):
+        mock_get_week.return_value = 1
+        self.plot1.dompc_involvement.create(dompc=self.dompc2, activity_status=PCPlotInvolvement.ACTIVE)
+        self.plot1.inform("first")
+        self.plot1.inform("second")
+        self.assertEqual(self.account2.informs.get(category="Plot").message, "first\n\nsecond")
+        self.plot1.inform("third", append=False)
+        self.assertEqual(self.account2.informs.filter(category="Plot").count(), 2)
@@ -5,21 +5,19 @@ string will provide an ASCII representation of the maze (for easy
 debugging).  These mazes are not persisted in and of themselves,
 but will be used by the Shardhaven generator to make a layout, after
 which a ShardhavenLayout will be made.
-"""
-
-from random import shuffle, randint
 
+The maze is carved with an iterative recursive backtracker over a flat
+bytearray, so it runs in time proportional to the number of cells and
+a given seed always produces the same maze.
+"""
 
-class BuilderGridSquare(object):
+from random import Random
 
-    def __init__(self):
+WALL = 0
+FLOOR = 1
 
-        self.wall = True
-        self.visited = False
-        self.deadend = False
-
-    def __str__(self):
-        return "WALL" if self.wall else "FLOOR"
+# Seeds are stored on the layout in a PositiveIntegerField
+MAX_SEED = 2147483647
 
 
 class Builder(object):
@@ -35,117 +33,80 @@ class Builder(object):
         WEST: (-2, 0)
     }
 
-    def __init__(self, x_dim=9, y_dim=9, x_start=None, y_start=None):
+    def __init__(self, x_dim=9, y_dim=9, x_start=None, y_start=None, seed=None):
         if x_dim % 2 == 0 or y_dim % 2 == 0:
             raise ValueError("Dimensions must be odd numbers.")
+        if x_dim < 3 or y_dim < 3:
+            raise ValueError("Dimensions must be at least 3.")
+
+        if seed is None:
+            seed = Random().randint(0, MAX_SEED)
+        self.seed = seed
+        self.random = Random(seed)
 
-        self.grid = [[BuilderGridSquare() for y in range(y_dim)] for x in range(x_dim)]
         self.x_dim = x_dim
         self.y_dim = y_dim
+        self.cells = bytearray(x_dim * y_dim)
 
-        if not x_start:
-            x_start = 1 + (2 * randint(0, (x_dim / 2) - 1))
-        if not y_start:
-            y_start = 1 + (2 * randint(0, (y_dim / 2) - 1))
+        if x_start is None:
+            x_start = 1 + (2 * self.random.randint(0, (x_dim // 2) - 1))
+        if y_start is None:
+            y_start = 1 + (2 * self.random.randint(0, (y_dim // 2) - 1))
 
-        self.controller_x = x_start
         self.x_start = x_start
-        self.controller_y = y_start
         self.y_start = y_start
-        self.grid[x_start][y_start].wall = False
-
-    def backstep(self, direction=NORTH):
-        move = self.dir_conversion.get(direction)
-        x_by = move[0]
-        y_by = move[1]
-
-        test_x = self.controller_x + x_by
-        test_y = self.controller_y + y_by
-
-        if test_x < 0 or test_x >= self.x_dim:
-            return False, self.controller_x, self.controller_y
-        if test_y < 0 or test_y >= self.y_dim:
-            return False, self.controller_x, self.controller_y
-
-        if test_x == self.x_start and test_y == self.y_start:
-            return False, self.controller_x, self.controller_y
-
-        test_x2 = self.controller_x + (x_by / 2)
-        test_y2 = self.controller_y + (y_by / 2)
-
-        if self.grid[test_x][test_y].deadend or self.grid[test_x2][test_y2].deadend:
-            return False, self.controller_x, self.controller_y
-
-        if self.grid[test_x][test_y].wall or self.grid[test_x2][test_y2].wall:
-            return False, self.controller_x, self.controller_y
+        self.cells[self.index(x_start, y_start)] = FLOOR
 
-        self.grid[self.controller_x][self.controller_y].visited = True
-        self.grid[test_x][test_y].visited = True
-        self.grid[test_x2][test_y2].visited = True
+    def index(self, x, y):
+        return y * self.x_dim + x
 
-        return True, test_x, test_y
+    def is_floor(self, x, y):
+        return self.cells[y * self.x_dim + x] == FLOOR
 
-    def step(self, direction=NORTH):
-        move = self.dir_conversion.get(direction)
-        x_by = move[0]
-        y_by = move[1]
-
-        test_x = self.controller_x + x_by
-        test_y = self.controller_y + y_by
-
-        if test_x < 0 or test_x >= self.x_dim:
-            return False, self.controller_x, self.controller_y
-        if test_y < 0 or test_y >= self.y_dim:
-            return False, self.controller_x, self.controller_y
-
-        test_x2 = self.controller_x + (x_by / 2)
-        test_y2 = self.controller_y + (y_by / 2)
-
-        if not self.grid[test_x][test_y].wall or not self.grid[test_x2][test_y2].wall:
-            return False, self.controller_x, self.controller_y
-
-        self.grid[test_x][test_y].wall = False
-        self.grid[test_x2][test_y2].wall = False
-
-        return True, test_x, test_y
-
-    def build_step(self):
-        directions = [self.NORTH, self.EAST, self.SOUTH, self.WEST]
-        shuffle(directions)
-
-        found = False
-        for direction in directions:
-            found, self.controller_x, self.controller_y = self.step(direction)
-            if found:
-                return False
-
-        if not found:
-            self.grid[self.controller_x][self.controller_y].visited = True
-            self.grid[self.controller_x][self.controller_y].deadend = True
-            shuffle(directions)
-            for direction in directions:
-                found, self.controller_x, self.controller_y = self.backstep(direction)
-                if found:
-                    return False
-
-        return True
+    def floors(self):
+        """Returns a list of the (x, y) coordinates of every floor square, in column order."""
+        x_dim = self.x_dim
+        cells = self.cells
+        return [(x, y) for x in range(x_dim) for y in range(self.y_dim) if cells[y * x_dim + x] == FLOOR]
 
     def build(self):
-        done = False
-        while not done:
-            done = self.build_step()
+        """
+        Carves the maze. Each cell on the stack is a room at odd coordinates; we knock down the
+        wall to a random unvisited neighbour and push it, or pop when there are none left.
+        """
+        x_dim = self.x_dim
+        y_dim = self.y_dim
+        cells = self.cells
+        randrange = self.random.randrange
+        moves = [self.dir_conversion[direction] for direction in (self.NORTH, self.EAST, self.SOUTH, self.WEST)]
+        stack = [(self.x_start, self.y_start)]
+        while stack:
+            x, y = stack[-1]
+            options = []
+            for x_by, y_by in moves:
+                test_x = x + x_by
+                test_y = y + y_by
+                if 0 < test_x < x_dim - 1 and 0 < test_y < y_dim - 1 and cells[test_y * x_dim + test_x] == WALL:
+                    options.append((x_by, y_by))
+            if not options:
+                stack.pop()
+                continue
+            x_by, y_by = options[randrange(len(options))]
+            cells[(y + y_by // 2) * x_dim + x + x_by // 2] = FLOOR
+            cells[(y + y_by) * x_dim + x + x_by] = FLOOR
+            stack.append((x + x_by, y + y_by))
 
     def __str__(self):
-
-        string = ""
+        lines = []
         for y in range(self.y_dim):
+            row = []
             for x in range(self.x_dim):
                 if x == self.x_start and y == self.y_start:
-                    string += "|w*|n"
-                elif self.grid[x][y].wall:
-                    string += "|[B|B#|n"
+                    row.append("|w*|n")
+                elif not self.is_floor(x, y):
+                    row.append("|[B|B#|n")
                 else:
-                    string += " "
-            string += "|n\n"
-
-        return string
+                    row.append(" ")
+            row.append("|n\n")
+            lines.append("".join(row))
+        return "".join(lines)
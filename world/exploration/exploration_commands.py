@@ -48,8 +48,8 @@ class CmdTestShardhavenBuild(ArxCommand):
     Shardhaven.
 
     Usage:
-      @sh_testbuild/maze [width,height]
-      @sh_testbuild/layout <shardhaven ID>
+      @sh_testbuild/maze [width,height[,seed]]
+      @sh_testbuild/layout <shardhaven ID>[=width,height[,seed]]
       @sh_testbuild/showlayout <shardhaven ID>
       @sh_testbuild/instanciate <shardhaven ID>
       @sh_testbuild/entrance <shardhaven ID>
@@ -62,13 +62,15 @@ class CmdTestShardhavenBuild(ArxCommand):
 
     def func(self):
         if "maze" in self.switches:
-            x_dim = int(self.lhslist[0]) if len(self.lhslist) == 2 else 9
-            y_dim = int(self.lhslist[1]) if len(self.lhslist) == 2 else 9
+            x_dim = int(self.lhslist[0]) if len(self.lhslist) >= 2 else 9
+            y_dim = int(self.lhslist[1]) if len(self.lhslist) >= 2 else 9
+            seed = int(self.lhslist[2]) if len(self.lhslist) == 3 else None
 
-            maze = builder.Builder(x_dim=x_dim, y_dim=y_dim)
+            maze = builder.Builder(x_dim=x_dim, y_dim=y_dim, seed=seed)
 
             maze.build()
             self.msg(str(maze))
+            self.msg("Seed: %s" % maze.seed)
             return
 
         if "layout" in self.switches:
@@ -89,12 +91,14 @@ class CmdTestShardhavenBuild(ArxCommand):
 
             self.msg("Generating layout for " + str(haven))
 
-            x_dim = int(self.rhslist[0]) if len(self.rhslist) == 2 else 9
-            y_dim = int(self.rhslist[1]) if len(self.rhslist) == 2 else 9
+            x_dim = int(self.rhslist[0]) if len(self.rhslist) >= 2 else 9
+            y_dim = int(self.rhslist[1]) if len(self.rhslist) >= 2 else 9
+            seed = int(self.rhslist[2]) if len(self.rhslist) == 3 else None
 
-            layout = ShardhavenLayout.new_haven(haven, x_dim, y_dim)
+            layout = ShardhavenLayout.new_haven(haven, x_dim, y_dim, seed=seed)
             self.msg("Layout generated!")
             self.msg(layout.ascii)
+            self.msg("Seed: %s" % layout.seed)
 
             return
 
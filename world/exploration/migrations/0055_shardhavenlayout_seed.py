@@ -0,0 +1,18 @@
+# Generated by Django 2.2.9 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exploration', '0054_auto_20191228_1417'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shardhavenlayout',
+            name='seed',
+            field=models.PositiveIntegerField(blank=True, help_text='The random seed this layout was generated from.', null=True),
+        ),
+    ]
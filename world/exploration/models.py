@@ -4,9 +4,9 @@ from world.stats_and_skills import do_dice_check
 
 from evennia.utils.idmapper.models import SharedMemoryModel
 from evennia.utils import create
-from django.db import models
+from django.db import models, transaction
 from . import builder
-from server.utils.arx_utils import inform_staff
+from server.utils.arx_utils import inform_staff, CachedProperty
 import random
 from typeclasses.npcs import npc_types
 from server.utils.picker import WeightedPicker
@@ -64,6 +64,7 @@ class Monster(SharedMemoryModel):
 
     instances = models.ManyToManyField('objects.ObjectDB', related_name='monsters')
 
+    @transaction.atomic
     def create_instance(self, location):
         result = None
         for obj in self.instances.all():
@@ -941,14 +942,16 @@ class ShardhavenLayoutSquare(SharedMemoryModel):
         return "{} ({},{})".format(self.layout, self.x_coord, self.y_coord)
 
     def visit(self, character):
-        if character not in self.visitors.all():
+        graph = self.layout.graph
+        if not graph.has_visited(self, character):
             self.visitors.add(character)
+            graph.mark_visited(self, character)
 
     def mark_emptied(self):
         self.last_visited = datetime.datetime.now()
 
     def has_visited(self, character):
-        return character in self.visitors.all()
+        return self.layout.graph.has_visited(self, character)
 
     @property
     def visited_recently(self):
@@ -1002,6 +1005,93 @@ class ShardhavenLayoutSquare(SharedMemoryModel):
             self.save()
 
 
+class LayoutGraph(object):
+    """
+    An in-memory view of a ShardhavenLayout: the square matrix, the exits adjoining each square,
+    and which squares each character has visited, stored as a bitmask per character. Built once per
+    layout instance and discarded whenever squares or exits are added or removed.
+    """
+
+    def __init__(self, layout):
+        self.width = layout.width
+        self.height = layout.height
+        self.layout = layout
+        self.matrix = [[None for y in range(self.height)] for x in range(self.width)]
+        self.positions = {}
+        for square in layout.rooms.all():
+            self.matrix[square.x_coord][square.y_coord] = square
+            self.positions[square.id] = (square.x_coord, square.y_coord)
+        self.exits = {}
+        for room_exit in layout.exits.all():
+            for square_id in (room_exit.room_west_id, room_exit.room_east_id,
+                              room_exit.room_north_id, room_exit.room_south_id):
+                if square_id:
+                    self.exits.setdefault(square_id, []).append(room_exit)
+        self._visited = None
+
+    def square_at(self, x, y):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.matrix[x][y]
+        return None
+
+    def exits_for(self, square):
+        return self.exits.get(square.id, [])
+
+    def _bit(self, square):
+        x, y = self.positions[square.id]
+        return 1 << (y * self.width + x)
+
+    @property
+    def visited(self):
+        """Dict of character ID to a bitmask of the squares they've visited, loaded in one query."""
+        if self._visited is None:
+            self._visited = {}
+            through = ShardhavenLayoutSquare.visitors.through
+            rows = through.objects.filter(shardhavenlayoutsquare__layout=self.layout)\
+                .values_list('shardhavenlayoutsquare_id', 'objectdb_id')
+            for square_id, character_id in rows:
+                x, y = self.positions[square_id]
+                self._visited[character_id] = self._visited.get(character_id, 0) | (1 << (y * self.width + x))
+        return self._visited
+
+    def has_visited(self, square, character):
+        return bool(self.visited.get(character.id, 0) & self._bit(square))
+
+    def mark_visited(self, square, character):
+        self.visited[character.id] = self.visited.get(character.id, 0) | self._bit(square)
+
+    def render(self, character=None):
+        """
+        Renders the layout as a grid. With no character, every square is shown; otherwise only the
+        squares the character has visited are open, with their current location marked.
+        """
+        wall = "|[B|B#|n"
+        visited = self.visited.get(character.id, 0) if character else -1
+        here = None
+        if character and character.location:
+            for square_id, position in self.positions.items():
+                square = self.matrix[position[0]][position[1]]
+                if square.room_id == character.location.id:
+                    here = position
+                    break
+        entrance = (self.layout.entrance_x, self.layout.entrance_y)
+        lines = []
+        for y in range(self.height):
+            row = []
+            for x in range(self.width):
+                if (x, y) == entrance:
+                    row.append("|w$|n")
+                elif self.matrix[x][y] is None or not visited & (1 << (y * self.width + x)):
+                    row.append(wall)
+                elif (x, y) == here:
+                    row.append("|w*|n")
+                else:
+                    row.append(" ")
+            row.append("|n\n")
+            lines.append("".join(row))
+        return "".join(lines)
+
+
 class ShardhavenLayout(SharedMemoryModel):
 
     width = models.PositiveSmallIntegerField(default=5)
@@ -1013,23 +1103,28 @@ class ShardhavenLayout(SharedMemoryModel):
     entrance_x = models.PositiveSmallIntegerField(default=0)
     entrance_y = models.PositiveSmallIntegerField(default=0)
 
-    matrix = None
+    seed = models.PositiveIntegerField(blank=True, null=True,
+                                       help_text="The random seed this layout was generated from.")
 
     def __str__(self):
         return self.haven.name + " Layout"
 
+    @CachedProperty
+    def graph(self):
+        """The matrix, exits and visitors of this layout, built on first use."""
+        return LayoutGraph(self)
+
     @property
-    def entrance(self):
-        if not self.matrix:
-            self.cache_room_matrix()
+    def matrix(self):
+        return self.graph.matrix
 
-        return self.matrix[self.entrance_x][self.entrance_y]
+    @property
+    def entrance(self):
+        return self.graph.square_at(self.entrance_x, self.entrance_y)
 
     def cache_room_matrix(self):
-        self.matrix = [[None for y in range(self.height)] for x in range(self.width)]
-
-        for room in self.rooms.all():
-            self.matrix[room.x_coord][room.y_coord] = room
+        """Discards the layout graph so it's rebuilt from the database on next use."""
+        del self.graph
 
     def save_rooms(self):
         for room in self.rooms.all():
@@ -1042,22 +1137,12 @@ class ShardhavenLayout(SharedMemoryModel):
             room.destroy_room()
 
     def delete_square(self, grid_x, grid_y):
-        self.cache_room_matrix()
-        room = self.matrix[grid_x][grid_y]
+        room = self.graph.square_at(grid_x, grid_y)
         if room:
             # Delete this room, and any exits leading to it.
-            if room.exit_north.count():
-                for room_exit in room.exit_north.all():
-                    room_exit.delete()
-            if room.exit_south.count():
-                for room_exit in room.exit_south.all():
-                    room_exit.delete()
-            if room.exit_east.count():
-                for room_exit in room.exit_east.all():
-                    room_exit.delete()
-            if room.exit_west.count():
-                for room_exit in room.exit_west.all():
-                    room_exit.delete()
+            exit_ids = [room_exit.id for room_exit in self.graph.exits_for(room)]
+            if exit_ids:
+                ShardhavenLayoutExit.objects.filter(id__in=exit_ids).delete()
             room.delete()
             self.cache_room_matrix()
             return True
@@ -1065,41 +1150,29 @@ class ShardhavenLayout(SharedMemoryModel):
             return False
 
     def create_square(self, grid_x, grid_y):
-        self.cache_room_matrix()
-        room = self.matrix[grid_x][grid_y]
+        graph = self.graph
+        room = graph.square_at(grid_x, grid_y)
         if not room:
             from world.dominion.models import PlotRoom
             plotrooms = list(PlotRoom.objects.filter(shardhaven_type=self.haven_type))
             room = ShardhavenLayoutSquare(layout=self, tile=random.choice(plotrooms), x_coord=grid_x, y_coord=grid_y)
             room.save()
 
-            west = self.matrix[grid_x - 1][grid_y]
-            east = self.matrix[grid_x + 1][grid_y]
-            north = self.matrix[grid_x][grid_y - 1]
-            south = self.matrix[grid_x][grid_y + 1]
-
-            # Why do our related-fields not populate properly?
-            # Aaargh.
-            if west and not ShardhavenLayoutExit.objects.filter(room_east=room).count():
-                room_exit = ShardhavenLayoutExit(layout=self)
-                room_exit.room_east = room
-                room_exit.room_west = west
-                room_exit.save()
-            if east and not ShardhavenLayoutExit.objects.filter(room_west=room).count():
-                room_exit = ShardhavenLayoutExit(layout=self)
-                room_exit.room_east = east
-                room_exit.room_west = room
-                room_exit.save()
-            if north and not ShardhavenLayoutExit.objects.filter(room_south=room).count():
-                room_exit = ShardhavenLayoutExit(layout=self)
-                room_exit.room_north = north
-                room_exit.room_south = room
-                room_exit.save()
-            if south and not ShardhavenLayoutExit.objects.filter(room_north=room).count():
-                room_exit = ShardhavenLayoutExit(layout=self)
-                room_exit.room_north = room
-                room_exit.room_south = south
-                room_exit.save()
+            # a brand new square can't have exits yet, so we only need to look at its neighbours
+            new_exits = []
+            west = graph.square_at(grid_x - 1, grid_y)
+            if west:
+                new_exits.append(ShardhavenLayoutExit(layout=self, room_east=room, room_west=west))
+            east = graph.square_at(grid_x + 1, grid_y)
+            if east:
+                new_exits.append(ShardhavenLayoutExit(layout=self, room_east=east, room_west=room))
+            north = graph.square_at(grid_x, grid_y - 1)
+            if north:
+                new_exits.append(ShardhavenLayoutExit(layout=self, room_north=north, room_south=room))
+            south = graph.square_at(grid_x, grid_y + 1)
+            if south:
+                new_exits.append(ShardhavenLayoutExit(layout=self, room_north=room, room_south=south))
+            ShardhavenLayoutExit.objects.bulk_create(new_exits)
 
             self.save()
             self.cache_room_matrix()
@@ -1109,40 +1182,10 @@ class ShardhavenLayout(SharedMemoryModel):
 
     @property
     def ascii(self):
-        self.cache_room_matrix()
-        string = ""
-        for y in range(self.height):
-            for x in range(self.width):
-                if x == self.entrance_x and y == self.entrance_y:
-                    string += "|w$|n"
-                elif self.matrix[x][y] is None:
-                    string += "|[B|B#|n"
-                else:
-                    string += " "
-            string += "|n\n"
-
-        return string
+        return self.graph.render()
 
     def map_for(self, player):
-        self.cache_room_matrix()
-        string = ""
-        for y in range(self.height):
-            for x in range(self.width):
-                if x == self.entrance_x and y == self.entrance_y:
-                    string += "|w$|n"
-                elif self.matrix[x][y] is None:
-                    string += "|[B|B#|n"
-                elif self.matrix[x][y].has_visited(player):
-                    if self.matrix[x][y].room == player.location:
-                        string += "|w*|n"
-                    else:
-                        string += " "
-                else:
-                    string += "|[B|B#|n"
-
-            string += "|n\n"
-
-        return string
+        return self.graph.render(player)
 
     def instanciate(self):
         for room in self.rooms.all():
@@ -1150,8 +1193,7 @@ class ShardhavenLayout(SharedMemoryModel):
         for room_exit in self.exits.all():
             room_exit.create_exits()
 
-        self.cache_room_matrix()
-        return self.matrix[self.entrance_x][self.entrance_y].room
+        return self.entrance.room
 
     def reset(self):
         for room_exit in self.exits.all():
@@ -1167,121 +1209,68 @@ class ShardhavenLayout(SharedMemoryModel):
             room.save()
             if room.room and room.room.is_typeclass('world.exploration.rooms.ShardhavenRoom'):
                 room.room.reset()
+        self.cache_room_matrix()
 
     @classmethod
-    def new_haven(cls, haven, width=9, height=9):
+    def new_haven(cls, haven, width=9, height=9, seed=None):
+        """
+        Generates a new layout for a haven. Passing the seed of an earlier layout reproduces its
+        maze, tiles and obstacles, as long as the haven's room and obstacle choices haven't changed.
+        """
         from world.dominion.models import PlotRoom
         if haven is None or not isinstance(haven, Shardhaven):
             raise ValueError("Must provide a shardhaven!")
 
-        maze = builder.Builder(x_dim=width, y_dim=height)
-        maze.build()
-
-        plotrooms = PlotRoom.objects.filter(shardhaven_type=haven.haven_type)
+        # Fetch all our plotrooms so we can pick them randomly
+        plotrooms = list(PlotRoom.objects.filter(shardhaven_type=haven.haven_type).order_by('id'))
 
-        if plotrooms.count() == 0:
+        if not plotrooms:
             raise ValueError("No valid rooms for that shardhaven type!")
 
-        # Fetch all our plotrooms so we can pick them randomly
-        plotrooms = list(plotrooms)
+        maze = builder.Builder(x_dim=width, y_dim=height, seed=seed)
+        maze.build()
+        rng = random.Random(maze.seed)
 
+        floors = maze.floors()
+        entrance_x, entrance_y = rng.choice(floors)
         layout = ShardhavenLayout(haven=haven, haven_type=haven.haven_type, width=width, height=height,
-                                  entrance_x=maze.x_start, entrance_y=maze.y_start)
+                                  entrance_x=entrance_x, entrance_y=entrance_y, seed=maze.seed)
         layout.save()
 
-        bulk_rooms = []
-        for x in range(width):
-            for y in range(height):
-                if not maze.grid[x][y].wall:
-                    room = ShardhavenLayoutSquare(layout=layout, tile=random.choice(plotrooms), x_coord=x, y_coord=y)
-                    bulk_rooms.append(room)
-
-        ShardhavenLayoutSquare.objects.bulk_create(bulk_rooms)
+        ShardhavenLayoutSquare.objects.bulk_create([
+            ShardhavenLayoutSquare(layout=layout, tile=rng.choice(plotrooms), x_coord=x, y_coord=y)
+            for x, y in floors])
+        # reload so that the squares have their primary keys on every database backend
         layout.cache_room_matrix()
+        graph = layout.graph
 
-        x = 0
-        y = 0
-        while layout.matrix[x][y] is None:
-            x = random.randint(0, width - 1)
-            y = random.randint(0, height - 1)
-
-        layout.entrance_x = x
-        layout.entrance_y = y
-
-        obstacles = list(ShardhavenObstacle.objects.filter(haven_types__pk=layout.haven_type.id,
-                                                           obstacle_class=ShardhavenObstacle.EXIT_OBSTACLE).all())
-        base_obstacles = list(obstacles)
-        random.shuffle(obstacles)
+        base_obstacles = list(ShardhavenObstacle.objects.filter(haven_types__pk=layout.haven_type.id,
+                                                                obstacle_class=ShardhavenObstacle.EXIT_OBSTACLE)
+                              .order_by('id'))
+        obstacles = []
         target_difficulty = 30 + max(layout.haven.difficulty_rating * 2, 5)
 
-        for x in range(width):
-            for y in range(height):
-                room = layout.matrix[x][y]
-                if room is not None:
-                    west = layout.matrix[x - 1][y]
-                    east = layout.matrix[x + 1][y]
-                    north = layout.matrix[x][y - 1]
-                    south = layout.matrix[x][y + 1]
-
-                    # Why do our related-fields not populate properly?
-                    # Aaargh.
-                    if west and not ShardhavenLayoutExit.objects.filter(room_east=room).count():
-                        room_exit = ShardhavenLayoutExit(layout=layout)
-                        room_exit.room_east = room
-                        room_exit.room_west = west
-
-                        if random.randint(1,100) < target_difficulty:
-                            if len(obstacles) == 0:
-                                obstacles = list(base_obstacles)
-                                random.shuffle(obstacles)
-
-                            obstacle = obstacles.pop()
-                            room_exit.obstacle = obstacle
-
-                        room_exit.save()
-                    if east and not ShardhavenLayoutExit.objects.filter(room_west=room).count():
-                        room_exit = ShardhavenLayoutExit(layout=layout)
-                        room_exit.room_east = east
-                        room_exit.room_west = room
-
-                        if random.randint(1, 100) < target_difficulty:
-                            if len(obstacles) == 0:
-                                obstacles = list(base_obstacles)
-                                random.shuffle(obstacles)
-
-                            obstacle = obstacles.pop()
-                            room_exit.obstacle = obstacle
-
-                        room_exit.save()
-                    if north and not ShardhavenLayoutExit.objects.filter(room_south=room).count():
-                        room_exit = ShardhavenLayoutExit(layout=layout)
-                        room_exit.room_north = north
-                        room_exit.room_south = room
-
-                        if random.randint(1, 100) < target_difficulty:
-                            if len(obstacles) == 0:
-                                obstacles = list(base_obstacles)
-                                random.shuffle(obstacles)
-
-                            obstacle = obstacles.pop()
-                            room_exit.obstacle = obstacle
-
-                        room_exit.save()
-                    if south and not ShardhavenLayoutExit.objects.filter(room_north=room).count():
-                        room_exit = ShardhavenLayoutExit(layout=layout)
-                        room_exit.room_north = room
-                        room_exit.room_south = south
-
-                        if random.randint(1, 100) < target_difficulty:
-                            if len(obstacles) == 0:
-                                obstacles = list(base_obstacles)
-                                random.shuffle(obstacles)
-
-                            obstacle = obstacles.pop()
-                            room_exit.obstacle = obstacle
-
-                        room_exit.save()
-
-        layout.save()
+        def random_obstacle():
+            if not base_obstacles or rng.randint(1, 100) >= target_difficulty:
+                return None
+            if not obstacles:
+                obstacles.extend(base_obstacles)
+                rng.shuffle(obstacles)
+            return obstacles.pop()
+
+        # each pair of adjacent squares gets one exit, found by looking east and south of every square
+        new_exits = []
+        for x, y in floors:
+            room = graph.matrix[x][y]
+            east = graph.square_at(x + 1, y)
+            if east:
+                new_exits.append(ShardhavenLayoutExit(layout=layout, room_west=room, room_east=east,
+                                                      obstacle=random_obstacle()))
+            south = graph.square_at(x, y + 1)
+            if south:
+                new_exits.append(ShardhavenLayoutExit(layout=layout, room_north=room, room_south=south,
+                                                      obstacle=random_obstacle()))
+        ShardhavenLayoutExit.objects.bulk_create(new_exits)
+        layout.cache_room_matrix()
 
         return layout
@@ -7,6 +7,43 @@ from server.utils.picker import WeightedPicker
 from typeclasses.mixins import ObjectMixins
 from evennia.contrib.extended_room import ExtendedRoom
 
+OCCUPANT_OTHER = 0
+OCCUPANT_CHARACTER = 1
+OCCUPANT_MONSTER = 2
+OCCUPANT_LOOT = 3
+OCCUPANT_EXIT = 4
+
+_MONSTER_TYPECLASSES = ('world.exploration.npcs.BossMonsterNpc', 'world.exploration.npcs.MookMonsterNpc')
+_LOOT_TYPECLASSES = ('world.exploration.loot.Trinket', 'world.exploration.loot.AncientWeapon',
+                     'world.magic.materials.MagicMaterial',
+                     'world.dominion.dominion_typeclasses.CraftingMaterialObject')
+_EXIT_TYPECLASSES = ('typeclasses.exits.ShardhavenInstanceExit', 'typeclasses.exits.Exit')
+_OCCUPANT_KINDS = {}
+
+
+def occupant_kind(obj):
+    """
+    Classifies an object in a shardhaven room. The typeclass checks are only done once per class,
+    since every entry and exit looks at everything in the room.
+    """
+    cls = obj.__class__
+    try:
+        return _OCCUPANT_KINDS[cls]
+    except KeyError:
+        pass
+    if any(obj.is_typeclass(path) for path in _MONSTER_TYPECLASSES):
+        kind = OCCUPANT_MONSTER
+    elif obj.is_typeclass('typeclasses.characters.Character'):
+        kind = OCCUPANT_CHARACTER
+    elif any(obj.is_typeclass(path) for path in _LOOT_TYPECLASSES):
+        kind = OCCUPANT_LOOT
+    elif any(obj.is_typeclass(path) for path in _EXIT_TYPECLASSES):
+        kind = OCCUPANT_EXIT
+    else:
+        kind = OCCUPANT_OTHER
+    _OCCUPANT_KINDS[cls] = kind
+    return kind
+
 
 class ShardhavenRoom(ArxRoom):
 
@@ -40,7 +77,8 @@ class ShardhavenRoom(ArxRoom):
         super(ShardhavenRoom, self).at_init()
 
     def at_object_receive(self, obj, source_location):
-        if not obj.is_typeclass('typeclasses.characters.Character'):
+        obj_kind = occupant_kind(obj)
+        if obj_kind not in (OCCUPANT_CHARACTER, OCCUPANT_MONSTER):
             return
 
         haven = self.shardhaven
@@ -54,8 +92,7 @@ class ShardhavenRoom(ArxRoom):
         if not obj.has_account or not (hasattr(obj, 'is_character') and obj.is_character):
             return
 
-        if obj.is_typeclass("world.exploration.npcs.BossMonsterNpc")\
-                or obj.is_typeclass("world.explorations.npcs.MookMonsterNpc"):
+        if obj_kind == OCCUPANT_MONSTER:
             return
 
         haven_square = self.shardhaven_square
@@ -76,8 +113,7 @@ class ShardhavenRoom(ArxRoom):
         player_characters = []
         monsters = []
         for testobj in characters:
-            if not testobj.is_typeclass("world.exploration.npcs.BossMonsterNpc") \
-                    and not testobj.is_typeclass("world.exploration.npcs.MookMonsterNpc"):
+            if occupant_kind(testobj) != OCCUPANT_MONSTER:
                 player_characters.append(testobj)
             else:
                 monsters.append(testobj)
@@ -185,8 +221,7 @@ class ShardhavenRoom(ArxRoom):
 
             for testobj in self.contents:
                 if testobj.has_account or (hasattr(testobj, 'is_character') and testobj.is_character):
-                    if testobj.is_typeclass('world.exploration.npcs.BossMonsterNpc') \
-                            or testobj.is_typeclass('world.exploration.npcs.MookMonsterNpc'):
+                    if occupant_kind(testobj) == OCCUPANT_MONSTER:
                         mobs.append(testobj)
                     elif testobj != obj and not testobj.check_permstring("builders"):
                         characters.append(testobj)
@@ -209,18 +244,14 @@ class ShardhavenRoom(ArxRoom):
             city_center = None
 
         for testobj in self.contents:
+            kind = occupant_kind(testobj)
             if testobj.has_account or (hasattr(testobj, 'is_character') and testobj.is_character):
-                if testobj.is_typeclass('world.exploration.npcs.BossMonsterNpc') \
-                        or testobj.is_typeclass('world.exploration.npcs.MookMonsterNpc'):
+                if kind == OCCUPANT_MONSTER:
                     testobj.location = None
                 else:
                     testobj.location = city_center
-            elif testobj.is_typeclass('world.exploration.loot.Trinket') \
-                    or testobj.is_typeclass('world.exploration.loot.AncientWeapon') \
-                    or testobj.is_typeclass('world.magic.materials.MagicMaterial') \
-                    or testobj.is_typeclass('world.dominion.dominion_typeclasses.CraftingMaterialObject'):
+            elif kind == OCCUPANT_LOOT:
                 testobj.softdelete()
-            elif not testobj.is_typeclass('typeclasses.exits.ShardhavenInstanceExit') \
-                    and not testobj.is_typeclass('typeclasses.exits.Exit'):
+            elif kind != OCCUPANT_EXIT:
                 # Someone dropped something in the shardhaven.  Let's not destroy it.
                 testobj.location = None
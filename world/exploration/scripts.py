@@ -1,6 +1,6 @@
 from typeclasses.scripts.scripts import Script
 from .models import Monster, Shardhaven
-from server.utils.picker import WeightedPicker
+from server.utils.picker import get_picker
 
 
 class SpawnMobScript(Script):
@@ -42,11 +42,7 @@ class SpawnMobScript(Script):
                 self.stop()
                 return
 
-            picker = WeightedPicker()
-            for monster in monsters.all():
-                picker.add_option(monster, monster.weight_spawn)
-
-            monster = picker.pick()
+            monster = get_picker((monster, monster.weight_spawn) for monster in monsters.all()).pick()
 
         mob_instance = monster.create_instance(self.obj)
         self.obj.msg_contents("{} attacks {}!".format(mob_instance.name, self.obj.ndb.monster_attack))
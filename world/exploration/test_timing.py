@@ -0,0 +1,24 @@
+"""
+Timings for shardhaven maze generation at increasing sizes. Generation should grow
+linearly with the number of cells, so doubling each dimension should roughly
+quadruple the time.
+"""
+
+from timeit import Timer
+
+SIZES = (9, 21, 51, 101, 201)
+
+
+def build_maze(size, seed=1):
+    from world.exploration.builder import Builder
+    maze = Builder(x_dim=size, y_dim=size, seed=seed)
+    maze.build()
+    return maze
+
+
+def time_builds(number=10):
+    for size in SIZES:
+        t = Timer('build_maze(%d)' % size, 'from world.exploration.test_timing import build_maze')
+        elapsed = t.timeit(number=number) / number
+        print("%dx%d: %.5f seconds, %.3f microseconds per cell" % (size, size, elapsed,
+                                                                  elapsed * 1000000 / (size * size)))
@@ -0,0 +1,148 @@
+"""
+Tests for the exploration app
+"""
+from __future__ import unicode_literals
+
+from evennia.utils import create
+
+from server.utils.test_utils import ArxTest
+from world.dominion.models import PlotRoom
+from world.exploration.models import (Shardhaven, ShardhavenType, ShardhavenLayout, ShardhavenLayoutSquare,
+                                      ShardhavenLayoutExit)
+from world.exploration import rooms
+from world.exploration.builder import Builder
+
+
+class ShardhavenTestMixin(object):
+    def setUp(self):
+        super(ShardhavenTestMixin, self).setUp()
+        self.haven_type = ShardhavenType.objects.create(name="Cave", description="A cave.")
+        self.haven = Shardhaven.objects.create(name="Test Haven", description="A haven.", haven_type=self.haven_type)
+        self.tiles = [PlotRoom.objects.create(name="Tile %s" % num, description="A tile.",
+                                              shardhaven_type=self.haven_type) for num in range(3)]
+
+
+class LayoutGraphTests(ShardhavenTestMixin, ArxTest):
+    def setUp(self):
+        super(LayoutGraphTests, self).setUp()
+        self.layout = ShardhavenLayout.objects.create(haven=self.haven, haven_type=self.haven_type, width=3,
+                                                      height=3)
+
+    def test_create_square_at_edges(self):
+        layout = self.layout
+        graph = layout.graph
+        self.assertIs(layout.graph, graph)
+        # squares on each edge have no neighbour beyond it, and don't wrap around to the far side
+        layout.create_square(2, 2)
+        self.assertIsNot(layout.graph, graph)
+        layout.create_square(0, 2)
+        layout.create_square(2, 0)
+        layout.create_square(0, 0)
+        self.assertEqual(layout.exits.count(), 0)
+        self.assertFalse(layout.create_square(0, 0))
+        layout.create_square(1, 0)
+        layout.create_square(2, 1)
+        self.assertEqual(layout.exits.count(), 4)
+        middle = layout.graph.square_at(1, 0)
+        self.assertEqual(sorted(ob.id for ob in layout.graph.exits_for(middle)),
+                         sorted(ob.id for ob in ShardhavenLayoutExit.objects.filter(room_east=middle) |
+                                ShardhavenLayoutExit.objects.filter(room_west=middle)))
+        self.assertEqual(len(layout.graph.exits_for(middle)), 2)
+        self.assertIsNone(layout.graph.square_at(-1, 0))
+        self.assertIsNone(layout.graph.square_at(3, 0))
+        self.assertIsNone(layout.graph.square_at(0, 3))
+        self.assertTrue(layout.delete_square(1, 0))
+        self.assertIsNone(layout.graph.square_at(1, 0))
+        self.assertEqual(layout.exits.count(), 2)
+        self.assertFalse(layout.delete_square(1, 0))
+        self.assertEqual(layout.ascii, "|w$|n|[B|B#|n |n\n"
+                                       "|[B|B#|n|[B|B#|n |n\n"
+                                       " |[B|B#|n |n\n")
+
+    def test_visits(self):
+        layout = self.layout
+        layout.create_square(0, 0)
+        layout.create_square(1, 0)
+        first, second = layout.graph.square_at(0, 0), layout.graph.square_at(1, 0)
+        first.visit(self.char1)
+        self.assertTrue(first.has_visited(self.char1))
+        self.assertFalse(second.has_visited(self.char1))
+        self.assertFalse(first.has_visited(self.char2))
+        self.assertEqual(list(first.visitors.all()), [self.char1])
+        second.visit(self.char1)
+        second.visit(self.char1)
+        self.assertEqual(list(second.visitors.all()), [self.char1])
+        # visits are read back from the database when the graph is rebuilt
+        layout.cache_room_matrix()
+        self.assertTrue(second.has_visited(self.char1))
+        self.assertEqual(layout.graph.visited, {self.char1.id: 3})
+        self.assertEqual(layout.map_for(self.char1).splitlines()[0], "|w$|n |[B|B#|n|n")
+        self.assertEqual(layout.map_for(self.char2).splitlines()[0], "|w$|n|[B|B#|n|[B|B#|n|n")
+
+    def test_cache_room_matrix(self):
+        layout = self.layout
+        layout.create_square(0, 0)
+        graph = layout.graph
+        ShardhavenLayoutSquare.objects.create(layout=layout, tile=self.tiles[0], x_coord=1, y_coord=1)
+        self.assertIsNone(layout.graph.square_at(1, 1))
+        layout.cache_room_matrix()
+        self.assertIsNot(layout.graph, graph)
+        self.assertEqual(layout.graph.square_at(1, 1).tile, self.tiles[0])
+        self.assertEqual(layout.entrance, layout.graph.square_at(0, 0))
+
+    def test_occupant_kind(self):
+        mooks = create.create_object("world.exploration.npcs.MookMonsterNpc", key="mooks")
+        self.assertEqual(rooms.occupant_kind(mooks), rooms.OCCUPANT_MONSTER)
+        self.assertEqual(rooms.occupant_kind(self.char1), rooms.OCCUPANT_CHARACTER)
+        self.assertEqual(rooms.occupant_kind(self.char2), rooms.OCCUPANT_CHARACTER)
+        self.assertEqual(rooms.occupant_kind(self.exit), rooms.OCCUPANT_EXIT)
+        self.assertEqual(rooms.occupant_kind(self.obj1), rooms.OCCUPANT_OTHER)
+        self.assertEqual(rooms.occupant_kind(mooks), rooms.OCCUPANT_MONSTER)
+
+
+class LayoutGenerationTests(ShardhavenTestMixin, ArxTest):
+    def make_maze(self, seed):
+        maze = Builder(x_dim=9, y_dim=9, seed=seed)
+        maze.build()
+        return maze
+
+    def test_builder_seed(self):
+        maze = self.make_maze(5)
+        self.assertEqual(maze.seed, 5)
+        self.assertEqual(maze.cells, self.make_maze(5).cells)
+        self.assertNotEqual(maze.cells, self.make_maze(6).cells)
+        self.assertTrue(maze.is_floor(maze.x_start, maze.y_start))
+        self.assertIsNotNone(Builder().seed)
+
+    def test_new_haven_seed(self):
+        def squares(layout):
+            return sorted((ob.x_coord, ob.y_coord, ob.tile_id) for ob in layout.rooms.all())
+        layout = ShardhavenLayout.new_haven(self.haven, seed=5)
+        other_haven = Shardhaven.objects.create(name="Other Haven", description="A haven.",
+                                                haven_type=self.haven_type)
+        same = ShardhavenLayout.new_haven(other_haven, seed=5)
+        self.assertEqual(layout.seed, 5)
+        self.assertEqual(sorted(ob[:2] for ob in squares(layout)), sorted(self.make_maze(5).floors()))
+        self.assertEqual(squares(layout), squares(same))
+        self.assertEqual((layout.entrance_x, layout.entrance_y), (same.entrance_x, same.entrance_y))
+        self.assertIsNotNone(layout.entrance)
+
+    def test_new_haven_exits(self):
+        layout = ShardhavenLayout.new_haven(self.haven, seed=7)
+        floors = set(self.make_maze(7).floors())
+        expected = set()
+        for x, y in floors:
+            if (x + 1, y) in floors:
+                expected.add(((x, y), (x + 1, y)))
+            if (x, y + 1) in floors:
+                expected.add(((x, y), (x, y + 1)))
+        pairs = []
+        for room_exit in layout.exits.all():
+            if room_exit.room_west:
+                first, second = room_exit.room_west, room_exit.room_east
+                self.assertIsNone(room_exit.room_north)
+            else:
+                first, second = room_exit.room_north, room_exit.room_south
+            pairs.append(((first.x_coord, first.y_coord), (second.x_coord, second.y_coord)))
+        self.assertEqual(len(pairs), len(expected))
+        self.assertEqual(set(pairs), expected)
@@ -0,0 +1,36 @@
+# Generated by Django 2.2.9 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    def total_fashion_fame(apps, schema_editor):
+        """Totals the fame of existing snapshots for their outfits and orgs"""
+        FashionSnapshot = apps.get_model('fashion', 'FashionSnapshot')
+        FashionOutfit = apps.get_model('fashion', 'FashionOutfit')
+        Organization = apps.get_model('dominion', 'Organization')
+        outfit_fame = {}
+        org_fame = {}
+        for outfit_id, org_id, fame in FashionSnapshot.objects.values_list('outfit_id', 'org_id', 'fame'):
+            if outfit_id:
+                outfit_fame[outfit_id] = outfit_fame.get(outfit_id, 0) + fame
+            if org_id:
+                org_fame[org_id] = org_fame.get(org_id, 0) + int(fame/2)
+        for outfit_id, fame in outfit_fame.items():
+            FashionOutfit.objects.filter(id=outfit_id).update(fame=fame)
+        for org_id, fame in org_fame.items():
+            Organization.objects.filter(id=org_id).update(fashion_fame=fame)
+
+    dependencies = [
+        ('dominion', '0047_organization_fashion_fame'),
+        ('fashion', '0005_auto_20181212_2122'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fashionoutfit',
+            name='fame',
+            field=models.IntegerField(blank=True, default=0, help_text='Total fame of every snapshot of this outfit.'),
+        ),
+        migrations.RunPython(total_fashion_fame, migrations.RunPython.noop),
+    ]
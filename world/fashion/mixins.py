@@ -25,16 +25,25 @@ class FashionableMixins(object):
         Checks the item's availability as well as the model's. Makes snapshot object
         and has it calculate fame. Then fame is awarded and a record of it made.
         """
+        snapshot = self.create_fashion_snapshot(player, org, outfit=outfit)
+        snapshot.apply_fame()
+        snapshot.inform_fashion_clients()
+        return snapshot.fame
+
+    def create_fashion_snapshot(self, player, org, outfit=None):
+        """
+        Checks the item's availability as well as the model's, then makes a snapshot
+        that has rolled for its fame. Awarding the fame is left to the caller, so that
+        an outfit can award the fame of all its items together.
+        """
         self.check_fashion_ready()
         if not outfit and not player.pay_action_points(self.fashion_ap_cost):
             msg = "It costs %d AP to model %s; you do not have enough energy." % (self.fashion_ap_cost, self)
             raise FashionError(msg)
-        snapshot = FashionSnapshot.objects.create(fashion_model=player.Dominion, fashion_item=self, org=org,
-                                                  designer=self.designer.Dominion, outfit=outfit)
+        snapshot = FashionSnapshot(fashion_model=player.Dominion, fashion_item=self, org=org,
+                                   designer=self.designer.Dominion, outfit=outfit)
         snapshot.roll_for_fame()
-        snapshot.apply_fame()
-        snapshot.inform_fashion_clients()
-        return snapshot.fame
+        return snapshot
 
     def return_appearance(self, pobject, detailed=False, format_desc=False,
                           show_contents=True):
@@ -50,6 +59,23 @@ class FashionableMixins(object):
         """Clears cached snapshots"""
         self.ndb.snapshots_cache = None
 
+    def add_to_snapshots_cache(self, snapshot):
+        """Adds a new snapshot to our cached snapshots, if we have them cached."""
+        if self.ndb.snapshots_cache is not None:
+            self.ndb.snapshots_cache.append(snapshot)
+
+    @property
+    def snapshots(self):
+        """Cached list of the snapshots from each time we've been modeled."""
+        if self.ndb.snapshots_cache is None:
+            self.ndb.snapshots_cache = list(self.fashion_snapshots.all())
+        return self.ndb.snapshots_cache
+
+    @property
+    def fashion_fame(self):
+        """Total fame we've earned from being modeled."""
+        return sum(ob.fame for ob in self.snapshots)
+
     @property
     def item_worth(self):
         """
@@ -93,17 +119,8 @@ class FashionableMixins(object):
 
     @property
     def modeled_by(self):
-        """
-        Sets snapshots_cache to be a list of snapshots. Returns their display
-        on separate lines, or empty string.
-        """
-        msg = ""
-        if self.ndb.snapshots_cache is None:
-            self.ndb.snapshots_cache = list(self.fashion_snapshots.all())
-        snapshots = self.ndb.snapshots_cache
-        if snapshots:
-            msg += "\n".join([ob.display for ob in snapshots])
-        return msg
+        """Returns the display of our snapshots on separate lines, or empty string."""
+        return "\n".join([ob.display for ob in self.snapshots])
 
     @property
     def designer(self):
@@ -7,7 +7,10 @@ gaining prestige, which influences their economic power.
 """
 from __future__ import unicode_literals
 
+from collections import OrderedDict
+
 from django.db import models
+from django.db.models import F
 
 from evennia.utils.idmapper.models import SharedMemoryModel
 from world.fashion.exceptions import FashionError
@@ -118,13 +121,13 @@ class FashionOutfit(FashionCommonMixins):
     fashion_items = models.ManyToManyField('objects.ObjectDB', through='ModusOrnamenta', blank=True)
     db_date_created = models.DateTimeField(auto_now_add=True)
     archived = models.BooleanField(default=False)
+    fame = models.IntegerField(default=0, blank=True, help_text="Total fame of every snapshot of this outfit.")
     # TODO: foreignkey to @cal events!
 
     def __str__(self):
         return str(self.name)
 
     def invalidate_outfit_caches(self):
-        del self.fame
         del self.model_info
         del self.list_display
         del self.modeled
@@ -226,10 +229,11 @@ class FashionOutfit(FashionCommonMixins):
         ap_cost = len(valid_items) * FashionableMixins.fashion_ap_cost
         if not self.owner.player.pay_action_points(ap_cost):
             raise FashionError("It costs %d AP to model %s; you do not have enough energy." % (ap_cost, self))
-        outfit_fame = 0
-        for item in valid_items:
-            outfit_fame += item.model_for_fashion(self.owner.player, org, outfit=self)
-        return min(outfit_fame, self.FAME_CAP)
+        snapshots = [item.create_fashion_snapshot(self.owner.player, org, outfit=self) for item in valid_items]
+        FashionSnapshot.apply_fame_for_all(snapshots)
+        for snapshot in snapshots:
+            snapshot.inform_fashion_clients()
+        return min(sum(ob.fame for ob in snapshots), self.FAME_CAP)
 
     @property
     def table_display(self):
@@ -293,18 +297,6 @@ class FashionOutfit(FashionCommonMixins):
         if hasattr(self, '_cached_model_bool'):
             del self._cached_model_bool
 
-    @property
-    def fame(self):
-        if self.modeled:
-            if not hasattr(self, '_cached_fame'):
-                self._cached_fame = sum([ob.fame for ob in self.fashion_snapshots.all()])
-            return self._cached_fame
-
-    @fame.deleter
-    def fame(self):
-        if hasattr(self, '_cached_fame'):
-            del self._cached_fame
-
     @property
     def appraisal_or_buzz(self):
         if self.modeled:
@@ -315,10 +307,8 @@ class FashionOutfit(FashionCommonMixins):
     @property
     def appraisal(self):
         """Returns string sum worth of outfit's unmodeled items."""
-        worth = 0
-        for item in self.fashion_items.all():
-            if not item.modeled_by:
-                worth += item.item_worth
+        unmodeled = self.fashion_items.filter(fashion_snapshots__isnull=True).distinct()
+        worth = sum(item.item_worth for item in unmodeled)
         return str("{:,}".format(worth) or "cannot model")
 
     @property
@@ -422,19 +412,33 @@ class FashionSnapshot(FashionCommonMixins):
         return msg
 
     def save(self, *args, **kwargs):
-        """Invalidates cache on save"""
+        """Adds a new snapshot to the caches of its item and outfit"""
+        created = not self.pk
         super(FashionSnapshot, self).save(*args, **kwargs)
-        self.invalidate_fashion_caches()
+        if created:
+            self.add_to_fashion_caches()
 
     def delete(self, *args, **kwargs):
         """Invalidates cache before delete"""
         self.invalidate_fashion_caches()
         super(FashionSnapshot, self).delete(*args, **kwargs)
 
+    def add_to_fashion_caches(self):
+        """
+        Appends us to our item's snapshots, if it has them cached, and marks our outfit
+        as modeled rather than having either query for their snapshots again.
+        """
+        if self.outfit:
+            self.outfit.invalidate_outfit_caches()
+            self.outfit._cached_model_bool = True
+        if self.fashion_item:
+            self.fashion_item.add_to_snapshots_cache(self)
+
     def invalidate_fashion_caches(self):
         if self.outfit:
             self.outfit.invalidate_outfit_caches()
-        self.fashion_item.invalidate_snapshots_cache()
+        if self.fashion_item:
+            self.fashion_item.invalidate_snapshots_cache()
 
     def roll_for_fame(self):
         """
@@ -461,15 +465,39 @@ class FashionSnapshot(FashionCommonMixins):
         Awards full amount of fame to fashion model and a portion to the
         sponsoring Organization & the item's Designer.
         """
-        from world.dominion.models import PrestigeCategory
+        self.apply_fame_for_all([self], reverse=reverse)
+
+    @classmethod
+    def apply_fame_for_all(cls, snapshots, reverse=False):
+        """
+        Awards (or with reverse, takes back) the fame of several snapshots at once. Prestige is
+        totalled per AssetOwner so that each is saved only once, and the fame totals of the
+        outfits and organizations involved are adjusted with a single update apiece.
+        """
+        from world.dominion.models import Organization, PrestigeCategory
 
         mult = -1 if reverse else 1
-        model_fame = self.fame * mult
-        org_fame = self.org_fame * mult
-        designer_fame = self.designer_fame * mult
-        self.fashion_model.assets.adjust_prestige(model_fame, PrestigeCategory.FASHION)
-        self.org.assets.adjust_prestige(org_fame)
-        self.designer.assets.adjust_prestige(designer_fame, PrestigeCategory.DESIGN)
+        prestige = OrderedDict()
+        outfit_fame = OrderedDict()
+        org_fame = OrderedDict()
+        for snapshot in snapshots:
+            awards = ((snapshot.fashion_model.assets, snapshot.fame, PrestigeCategory.FASHION),
+                      (snapshot.org.assets, snapshot.org_fame, None),
+                      (snapshot.designer.assets, snapshot.designer_fame, PrestigeCategory.DESIGN))
+            for assets, value, category in awards:
+                totals = prestige.setdefault(assets, OrderedDict())
+                totals[category] = totals.get(category, 0) + (value * mult)
+            if snapshot.outfit:
+                outfit_fame[snapshot.outfit] = outfit_fame.get(snapshot.outfit, 0) + (snapshot.fame * mult)
+            org_fame[snapshot.org] = org_fame.get(snapshot.org, 0) + (snapshot.org_fame * mult)
+        for assets, totals in prestige.items():
+            assets.adjust_prestige_totals(totals)
+        for outfit, value in outfit_fame.items():
+            FashionOutfit.objects.filter(id=outfit.id).update(fame=F('fame') + value)
+            outfit.fame += value
+        for org, value in org_fame.items():
+            Organization.objects.filter(id=org.id).update(fashion_fame=F('fashion_fame') + value)
+            org.fashion_fame += value
 
     def inform_fashion_clients(self):
         """
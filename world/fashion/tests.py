@@ -142,6 +142,9 @@ class FashionCommandTests(TestEquipmentMixins, ArxCommandTest):
 
         self.assertEqual(self.roster_entry2.action_points, 200 - (ap_cost * 6))
         self.assertTrue(outfit1.modeled)
+        self.assertEqual(outfit1.fame, 72016)
+        self.assertEqual(self.top1.fashion_fame, 1000)
+        self.assertEqual(self.org.fashion_fame, 36508)
         self.assertTrue(self.hairpins1.modeled_by)
         self.assertEqual(self.hairpins1.fashion_snapshots.first().outfit, outfit1)
         # this tests if hairpins carries the "buzz message" from the entire outfit:
@@ -192,5 +195,8 @@ class FashionCommandTests(TestEquipmentMixins, ArxCommandTest):
                                                   org=self.org, fashion_item=self.top1)
         snapshot.apply_fame()
         self.assertEqual(self.dompc2.assets.fame, 62500)
+        self.assertEqual(self.dompc2.assets.prestige_adjustments.count(), 2)
+        self.assertEqual(self.org.fashion_fame, 25000)
         self.call_cmd("/delete 1", 'Snapshot #1 fame/ap has been reversed. Deleting it.')
         self.assertEqual(self.dompc2.assets.fame, 0)
+        self.assertEqual(self.org.fashion_fame, 0)
@@ -6,7 +6,13 @@ class MagicConfig(AppConfig):
     name = 'world.magic'
 
     def ready(self):
+        from django.db.models.signals import post_save, post_delete
         from .effects import register_effects
         from .consequences import register_consequences
+        from .models import SkillNode, SkillNodeEffect, Spell, Condition, NodeDiscoveries
         register_effects()
         register_consequences()
+        # any edit to what a node unlocks makes the cached discovery thresholds stale
+        for model in (SkillNode, SkillNodeEffect, Spell, Condition):
+            post_save.connect(NodeDiscoveries.clear_cache, sender=model)
+            post_delete.connect(NodeDiscoveries.clear_cache, sender=model)
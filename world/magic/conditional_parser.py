@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from django.conf import settings
 from evennia.utils import utils, logger
 from django.utils.translation import ugettext as _
@@ -9,6 +10,10 @@ __all__ = ("ConditionalHandler", "ConditionalException")
 WARNING_LOG = settings.LOCKWARNING_LOG_FILE
 _MAGIC_CONDITION_FUNCS = {}
 
+# Number of distinct raw condition strings whose compiled form we keep around. Effects, Spells and
+# Conditions all share the same handful of strings, so this is generous.
+_COMPILED_CACHE_SIZE = 512
+
 
 #
 # Exception class. This will be raised
@@ -26,9 +31,8 @@ class ConditionalException(Exception):
 # pre-compiled regular expressions
 #
 
-_RE_FUNCS = re.compile(r"\w+\([^)]*\)")
-_RE_SEPS = re.compile(r"(?<=[ )])AND(?=\s)|(?<=[ )])OR(?=\s)|(?<=[ )])NOT(?=\s)")
-_RE_OK = re.compile(r"%s|and|or|not")
+_RE_TOKENS = re.compile(r"\s*(?:(?P<op>AND|OR|NOT)\b|(?P<func>\w+)\s*\((?P<args>[^)]*)\)"
+                        r"|(?P<paren>[()])|(?P<bad>\S+))", re.IGNORECASE)
 
 
 def _cache_conditionfuncs():
@@ -39,13 +43,180 @@ def _cache_conditionfuncs():
     _MAGIC_CONDITION_FUNCS = {}
     for modulepath in settings.MAGIC_CONDITION_MODULES:
         _MAGIC_CONDITION_FUNCS.update(utils.callables_from_module(modulepath))
+    # compiled conditions hold references to the old functions
+    _compile_conditional_string.cache_clear()
+
+
+#
+# Compilation of a condition's right-hand side into a tree of closures. Each node is a
+# callable taking (caster, target) and returning a bool, with AND/OR/NOT short-circuiting.
+#
+
+def _call_node(func, args, kwargs):
+    def node(caster, target):
+        return bool(func(caster, target, *args, **kwargs))
+    return node
+
+
+def _not_node(operand):
+    def node(caster, target):
+        return not operand(caster, target)
+    return node
+
+
+def _and_node(operands):
+    def node(caster, target):
+        return all(operand(caster, target) for operand in operands)
+    return node
+
+
+def _or_node(operands):
+    def node(caster, target):
+        return any(operand(caster, target) for operand in operands)
+    return node
+
+
+def _tokenize(rhs):
+    """
+    Splits a condition's right-hand side into (kind, value) tuples.
+
+    Raises:
+        ValueError if the string contains anything that isn't a function call, an operator or a parenthesis.
+    """
+    tokens = []
+    for match in _RE_TOKENS.finditer(rhs):
+        if match.group("func"):
+            tokens.append(("func", (match.group("func"), match.group("args"))))
+        elif match.group("op"):
+            tokens.append(("op", match.group("op").upper()))
+        elif match.group("paren"):
+            tokens.append(("paren", match.group("paren")))
+        elif match.group("bad"):
+            raise ValueError(match.group("bad"))
+    return tokens
+
+
+class _ConditionCompiler(object):
+    """
+    Recursive descent parser over the tokens of a single condition, with python's precedence
+    of NOT over AND over OR.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.errors = []
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None, None
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def compile(self):
+        node = self.parse_or()
+        if self.pos != len(self.tokens):
+            raise ValueError("Unexpected trailing tokens.")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == ("op", "OR"):
+            self.advance()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else _or_node(tuple(operands))
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.peek() == ("op", "AND"):
+            self.advance()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else _and_node(tuple(operands))
+
+    def parse_not(self):
+        if self.peek() == ("op", "NOT"):
+            self.advance()
+            return _not_node(self.parse_not())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        kind, value = self.advance()
+        if kind == "paren" and value == "(":
+            node = self.parse_or()
+            if self.advance() != ("paren", ")"):
+                raise ValueError("Unbalanced parentheses.")
+            return node
+        if kind == "func":
+            funcname, rest = value
+            func = _MAGIC_CONDITION_FUNCS.get(funcname, None)
+            if not callable(func):
+                self.errors.append(_("Condition: magic condition-function '%s' is not available.") %
+                                   ("%s(%s)" % (funcname, rest)))
+                return None
+            args = tuple(arg.strip() for arg in rest.split(',') if arg and '=' not in arg)
+            kwargs = dict([arg.split('=', 1) for arg in rest.split(',') if arg and '=' in arg])
+            return _call_node(func, args, kwargs)
+        raise ValueError("Expected a condition function.")
+
+
+@lru_cache(maxsize=_COMPILED_CACHE_SIZE)
+def _compile_conditional_string(storage_conditionstring):
+    """
+    Compiles a full condition storage string into a dict of access_type to (node, raw_condition).
+    Results are shared between every handler built from the same string.
+
+    Raises:
+        ConditionalException if any condition is malformed or uses an unknown function.
+    """
+    conditions = {}
+    if not storage_conditionstring:
+        return conditions
+    elist = []  # errors
+    wlist = []  # warnings
+    for raw_condition in storage_conditionstring.split(';'):
+        if not raw_condition:
+            continue
+        try:
+            access_type, rhs = (part.strip() for part in raw_condition.split(':', 1))
+        except ValueError:
+            logger.log_trace()
+            return conditions
+
+        compiler = None
+        try:
+            compiler = _ConditionCompiler(_tokenize(rhs))
+            node = compiler.compile()
+        except (ValueError, TypeError):
+            node = None
+        if compiler and compiler.errors:
+            elist.extend(compiler.errors)
+            continue
+        if node is None:
+            elist.append(_("Condition: definition '%s' has syntax errors.") % raw_condition)
+            continue
+        if access_type in conditions:
+            wlist.append(_("ConditionalHandler: access type '%(access_type)s' changed from "
+                           "'%(source)s' to '%(goal)s' " %
+                           {"access_type": access_type, "source": conditions[access_type][1],
+                            "goal": raw_condition}))
+        conditions[access_type] = (node, raw_condition)
+    if wlist and WARNING_LOG:
+        # a warning text was set, it's not an error, so only report
+        logger.log_file("\n".join(wlist), WARNING_LOG)
+    if elist:
+        # an error text was set, raise exception.
+        raise ConditionalException("\n".join(elist))
+    return conditions
 
 
 class ConditionalHandler:
 
     def __init__(self, condition_storagestring):
         """
-        Loads and pre-caches all relevant locks and their functions.
+        Loads the compiled conditions for the string, compiling them on first use.
         """
         if not _MAGIC_CONDITION_FUNCS:
             _cache_conditionfuncs()
@@ -55,73 +226,13 @@ class ConditionalHandler:
 
     @staticmethod
     def _parse_conditional_string(storage_conditionstring):
-        conditions = {}
-        if not storage_conditionstring:
-            return conditions
-        duplicates = 0
-        elist = []  # errors
-        wlist = []  # warnings
-        for raw_condition in storage_conditionstring.split(';'):
-            if not raw_condition:
-                continue
-            condition_funcs = []
-            try:
-                access_type, rhs = (part.strip() for part in raw_condition.split(':', 1))
-            except ValueError:
-                logger.log_trace()
-                return conditions
-
-            # parse the lock functions and separators
-            funclist = _RE_FUNCS.findall(rhs)
-            evalstring = rhs
-            for pattern in ('AND', 'OR', 'NOT'):
-                evalstring = re.sub(r"\b%s\b" % pattern, pattern.lower(), evalstring)
-            nfuncs = len(funclist)
-            for funcstring in funclist:
-                funcname, rest = (part.strip().strip(')') for part in funcstring.split('(', 1))
-                func = _MAGIC_CONDITION_FUNCS.get(funcname, None)
-                if not callable(func):
-                    elist.append(_("Condition: magic condition-function '%s' is not available.") % funcstring)
-                    continue
-                args = list(arg.strip() for arg in rest.split(',') if arg and '=' not in arg)
-                kwargs = dict([arg.split('=', 1) for arg in rest.split(',') if arg and '=' in arg])
-                condition_funcs.append((func, args, kwargs))
-                evalstring = evalstring.replace(funcstring, '%s')
-            if len(condition_funcs) < nfuncs:
-                continue
-            try:
-                # purge the eval string of any superfluous items, then test it
-                evalstring = " ".join(_RE_OK.findall(evalstring))
-                eval(evalstring % tuple(True for func in funclist), {}, {})
-            except Exception:
-                elist.append(_("Condition: definition '%s' has syntax errors.") % raw_condition)
-                continue
-            if access_type in conditions:
-                duplicates += 1
-                wlist.append(_("ConditionalHandler: access type '%(access_type)s' changed from "
-                               "'%(source)s' to '%(goal)s' " %
-                               {"access_type": access_type, "source": conditions[access_type][2],
-                                "goal": raw_condition}))
-            conditions[access_type] = (evalstring, tuple(condition_funcs), raw_condition)
-        if wlist and WARNING_LOG:
-            # a warning text was set, it's not an error, so only report
-            logger.log_file("\n".join(wlist), WARNING_LOG)
-        if elist:
-            # an error text was set, raise exception.
-            raise ConditionalException("\n".join(elist))
-        # return the gathered locks in an easily executable form
-        return conditions
+        return _compile_conditional_string(storage_conditionstring or "")
 
     def check(self, caster, target, access_type, default=False):
         if access_type in self.conditions:
-            # we have a lock, test it.
-            evalstring, func_tup, raw_string = self.conditions[access_type]
-            # execute all lock funcs in the correct order, producing a tuple of True/False results.
-            true_false = tuple(bool(
-                tup[0](caster, target, *tup[1], **tup[2])) for tup in func_tup)
-            # the True/False tuple goes into evalstring, which combines them
-            # with AND/OR/NOT in order to get the final result.
-            return eval(evalstring % true_false)
+            # the compiled tree calls condition funcs in order, stopping as soon as the result is known
+            node, raw_string = self.conditions[access_type]
+            return node(caster, target)
         else:
             return default
 
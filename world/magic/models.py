@@ -6,8 +6,9 @@ from evennia.utils import logger
 from evennia.utils.ansi import strip_ansi
 from evennia.utils.evtable import EvTable
 from world.roll import Roll
-from server.utils.arx_utils import commafy, inform_staff, classproperty
+from server.utils.arx_utils import commafy, inform_staff, classproperty, CachedProperty
 from datetime import datetime, timedelta
+from bisect import bisect_right
 import math
 import json
 
@@ -295,6 +296,237 @@ class PractitionerFavor(SharedMemoryModel):
         unique_together = ('practitioner', 'alignment')
 
 
+class ResonanceIndex(object):
+    """
+    In-memory index of a practitioner's SkillNodeResonance records. Everything is loaded in one query,
+    and effective resonance (a node's own resonance plus a tenth of its parent's effective resonance)
+    is memoized per node, so repeated cost and difficulty calculations don't touch the database.
+    """
+
+    def __init__(self, practitioner):
+        self.practitioner = practitioner
+        self.records = {}
+        qs = practitioner.node_resonances.select_related('node__parent_node', 'node__affinity')
+        for record in qs:
+            self.records[record.node_id] = record
+        self._effective = {}
+        self._affinity_totals = {}
+        self._counted = {}
+        self._alignment = None
+        for record in self.records.values():
+            self._count_affinity(record)
+            self.resonance_for_node(record.node)
+
+    def _count_affinity(self, record):
+        """Adjusts our affinity totals by the change in a record's resonance since we last counted it."""
+        affinity = record.node.affinity
+        if not affinity:
+            return
+        delta = record.resonance - self._counted.get(record.node_id, 0)
+        self._counted[record.node_id] = record.resonance
+        self._affinity_totals[affinity] = self._affinity_totals.get(affinity, 0) + delta
+
+    def update_record(self, record):
+        """Called whenever one of our records is created or saved."""
+        self.records[record.node_id] = record
+        self._count_affinity(record)
+        # descendants inherit from this node, and recomputing is cheap now that records are in memory
+        self._effective = {}
+
+    def remove_record(self, record):
+        """Called whenever one of our records is deleted."""
+        self.records.pop(record.node_id, None)
+        affinity = record.node.affinity
+        if affinity:
+            self._affinity_totals[affinity] = (self._affinity_totals.get(affinity, 0) -
+                                               self._counted.pop(record.node_id, 0))
+        self._effective = {}
+
+    def record_for_node(self, node):
+        return self.records.get(node.id)
+
+    def knows_node(self, node):
+        return node.id in self.records
+
+    def resonance_for_node(self, node):
+        try:
+            return self._effective[node.id]
+        except KeyError:
+            pass
+        value = 0
+        record = self.records.get(node.id)
+        if record:
+            value = record.resonance
+        if node.parent_node:
+            value += (self.resonance_for_node(node.parent_node) / 10)
+        self._effective[node.id] = value
+        return value
+
+    def _highest_record(self, predicate):
+        best = None
+        for record in self.records.values():
+            if predicate(record.node) and (not best or record.raw_resonance > best.raw_resonance):
+                best = record
+        return best
+
+    def resonance_for_main_school(self):
+        record = self._highest_record(lambda node: not node.parent_node_id)
+        if not record:
+            # Are you even a mage?
+            return 0
+        return self.resonance_for_node(record.node)
+
+    def resonance_for_affinity(self, affinity):
+        record = self._highest_record(lambda node: node.affinity_default and node.affinity_id == affinity.id)
+        if record:
+            return self.resonance_for_node(record.node)
+        return 0
+
+    @property
+    def best_affinity(self):
+        result = None
+        max_value = 0
+        for affinity, value in self._affinity_totals.items():
+            if value > max_value:
+                result = affinity
+                max_value = value
+        return result
+
+    @property
+    def alignment(self):
+        if self._alignment is None:
+            alignments = PractitionerAlignment.objects.filter(practitioner=self.practitioner).order_by('-value')
+            record = alignments.first()
+            self._alignment = record.alignment if record else Alignment.PRIMAL
+        return self._alignment
+
+    def clear_alignment(self):
+        self._alignment = None
+
+
+class NodeDiscoveries(object):
+    """
+    Everything that is automatically discovered through a single SkillNode, sorted by the resonance
+    required, so that finding what a given resonance unlocks is a bisect rather than a query.
+    """
+
+    def __init__(self, node):
+        self.child_nodes = self._sorted(node.child_nodes.filter(auto_discover=True))
+        self.spells = self._sorted(node.spells.filter(auto_discover=True))
+        self.effects = self._sorted(node.effect_records.filter(auto_discover=True).select_related('effect'))
+        self.conditions = self._sorted(node.conditions.filter(auto_discover=True))
+
+    @staticmethod
+    def _sorted(queryset):
+        entries = sorted((ob for ob in queryset if ob.required_resonance is not None),
+                         key=lambda ob: ob.required_resonance)
+        return [ob.required_resonance for ob in entries], entries
+
+    @staticmethod
+    def unlocked(table, resonance):
+        """Returns every entry of a sorted table whose required resonance is at most the given value."""
+        thresholds, entries = table
+        return entries[:bisect_right(thresholds, resonance)]
+
+    @staticmethod
+    def clear_cache(*args, **kwargs):
+        """Discards every node's cached table. Magic trees are only edited by staff, so this is rare."""
+        for node in SkillNode.get_all_cached_instances():
+            del node.discoveries
+
+
+class PendingDiscoveries(object):
+    """
+    Collects everything a practitioner unlocks over a cascade of resonance gains, then creates the
+    records in bulk and sends a single inform to the player and to staff.
+    """
+
+    def __init__(self, practitioner):
+        self.practitioner = practitioner
+        self.nodes = []
+        self.spells = []
+        self.effects = []
+        self.conditions = []
+        self.messages = []
+
+    def add(self, node, resonance):
+        explanation = "Discovered by improving {}.".format(node.name)
+        tables = node.discoveries
+        for child_node in NodeDiscoveries.unlocked(tables.child_nodes, resonance):
+            self.nodes.append((child_node, explanation))
+        for spell in NodeDiscoveries.unlocked(tables.spells, resonance):
+            self.spells.append((spell, explanation))
+        for record in NodeDiscoveries.unlocked(tables.effects, resonance):
+            self.effects.append((record.effect, explanation))
+        for condition in NodeDiscoveries.unlocked(tables.conditions, resonance):
+            self.conditions.append((condition, "Gained by improving %s." % node.name))
+
+    @staticmethod
+    def _unknown(pending, known_ids):
+        """Drops anything already known, along with duplicates reached through more than one node."""
+        result = []
+        for ob, explanation in pending:
+            if ob.id not in known_ids:
+                known_ids.add(ob.id)
+                result.append((ob, explanation))
+        return result
+
+    def apply(self):
+        practitioner = self.practitioner
+        now = datetime.now()
+        staff_informs = []
+        index = practitioner.resonance_index
+
+        nodes = self._unknown(self.nodes, set(index.records.keys()))
+        if nodes:
+            SkillNodeResonance.objects.bulk_create([
+                SkillNodeResonance(practitioner=practitioner, node=node, learned_by=SkillNodeResonance.LEARN_DISCOVERED,
+                                   learned_on=now, learned_notes=explanation) for node, explanation in nodes])
+            for record in practitioner.node_resonances.filter(node__in=[node for node, _ in nodes]):
+                index.update_record(record)
+            reason = SkillNodeResonance.reason_string(SkillNodeResonance.LEARN_DISCOVERED)
+            staff_informs += ["just unlocked node |y{}|n in the magic tree by {}: {}".format(node.name, reason, expl)
+                              for node, expl in nodes]
+
+        spells = self.spells and self._unknown(self.spells, set(practitioner.spells.values_list('id', flat=True)))
+        if spells:
+            PractitionerSpell.objects.bulk_create([
+                PractitionerSpell(practitioner=practitioner, spell=spell, learned_by=PractitionerSpell.LEARN_DISCOVERED,
+                                  learned_on=now, learned_notes=explanation) for spell, explanation in spells])
+            reason = PractitionerSpell.reason_string(PractitionerSpell.LEARN_DISCOVERED)
+            staff_informs += ["just learned spell |y{}|n by {}: {}".format(spell.name, reason, expl)
+                              for spell, expl in spells]
+
+        effects = self.effects and self._unknown(self.effects, set(practitioner.effects.values_list('id', flat=True)))
+        if effects:
+            PractitionerEffect.objects.bulk_create([
+                PractitionerEffect(practitioner=practitioner, effect=effect,
+                                   learned_by=PractitionerEffect.LEARN_DISCOVERED, learned_on=now,
+                                   learned_notes=explanation) for effect, explanation in effects])
+            reason = PractitionerEffect.reason_string(PractitionerEffect.LEARN_DISCOVERED)
+            staff_informs += ["just learned effect |y{}|n by {}: {}".format(effect.name, reason, expl)
+                              for effect, expl in effects]
+
+        conditions = self.conditions and self._unknown(
+            self.conditions, set(practitioner.conditions.values_list('condition_id', flat=True)))
+        if conditions:
+            PractitionerCondition.objects.bulk_create([
+                PractitionerCondition(practitioner=practitioner, condition=condition, gm_notes=explanation)
+                for condition, explanation in conditions])
+            condition_informs = ["just gained the |y{}|n condition: {}".format(condition, explanation)
+                                 for condition, explanation in conditions]
+        else:
+            condition_informs = []
+
+        # conditions are kept from the player, everything else is shared with them
+        self.messages += ["You " + inform for inform in staff_informs]
+        staff_informs += condition_informs
+        if staff_informs:
+            inform_staff("\n".join("|y{}|n {}".format(practitioner, inform) for inform in staff_informs))
+        if self.messages:
+            practitioner.send_inform("\n".join(self.messages))
+
+
 class Practitioner(SharedMemoryModel):
 
     character = models.OneToOneField('objects.ObjectDB', blank=False, null=False, related_name='practitioner_record',
@@ -348,34 +580,31 @@ class Practitioner(SharedMemoryModel):
         except (Practitioner.DoesNotExist, Practitioner.MultipleObjectsReturned):
             return None
 
-    @property
-    def best_affinity(self):
-        affinities = {}
-        nodes = SkillNodeResonance.objects.filter(practitioner=self)
-        for node in nodes:
-            if node.node.affinity:
-                old_value = affinities[node.node.affinity] if node.node.affinity in affinities else 0
-                affinities[node.node.affinity] = old_value + node.resonance
+    @CachedProperty
+    def resonance_index(self):
+        """Our node resonances, loaded once and kept up to date as records change."""
+        return ResonanceIndex(self)
 
-        result = None
-        max_value = 0
-        for affinity, value in affinities.items():
-            if value > max_value:
-                result = affinity
-                max_value = value
+    def update_resonance_index(self, record, deleted=False):
+        """Keeps an already-built resonance index in sync with a changed SkillNodeResonance."""
+        index = self.__dict__.get('resonance_index')
+        if not index:
+            return
+        if deleted:
+            index.remove_record(record)
+        else:
+            index.update_record(record)
 
-        return result
+    @property
+    def best_affinity(self):
+        return self.resonance_index.best_affinity
 
     @property
     def alignment(self):
         if self.raw_alignment:
             return self.raw_alignment
 
-        alignments = PractitionerAlignment.objects.filter(practitioner=self).order_by('-value')
-        if alignments.count() > 0:
-            return alignments[0].alignment
-
-        return Alignment.PRIMAL
+        return self.resonance_index.alignment
 
     @property
     def affinity(self):
@@ -385,29 +614,16 @@ class Practitioner(SharedMemoryModel):
         return self.best_affinity
 
     def resonance_record_for_node(self, node):
-        try:
-            resonance_node = SkillNodeResonance.objects.get(practitioner=self, node=node)
-        except (SkillNodeResonance.DoesNotExist, SkillNodeResonance.MultipleObjectsReturned):
-            return None
-
-        return resonance_node
+        return self.resonance_index.record_for_node(node)
 
     def resonance_for_node(self, node):
-        value = 0
-        resonance_record = self.resonance_record_for_node(node)
-        if resonance_record:
-            value = resonance_record.resonance
-
-        if node.parent_node:
-            value += (self.resonance_for_node(node.parent_node) / 10)
-
-        return value
+        return self.resonance_index.resonance_for_node(node)
 
     def knows_spell(self, spell):
         return spell in self.spells.all()
 
     def knows_node(self, node):
-        return node in self.nodes.all()
+        return self.resonance_index.knows_node(node)
 
     def knows_effect(self, effect):
         return effect in self.effects.all()
@@ -423,46 +639,30 @@ class Practitioner(SharedMemoryModel):
         return False
 
     def add_resonance_to_node(self, node, amount):
-        try:
-            resonance_node = SkillNodeResonance.objects.get(practitioner=self, node=node)
-        except (SkillNodeResonance.DoesNotExist, SkillNodeResonance.MultipleObjectsReturned):
-            return
-
-        before = resonance_node.resonance
-        after = min(self.potential, resonance_node.raw_resonance + amount)
-        if after == self.potential:
-            self.send_inform("You feel that you've reached the limit of your ability to learn |y%s|n until "
-                             "you improve as a practitioner." % node.name)
-        resonance_node.raw_resonance = after
-        resonance_node.save()
-
-        if before != after:
-            explanation_string = "Discovered by improving {}.".format(node.name)
-            child_nodes = node.child_nodes.filter(auto_discover=True, required_resonance__lte=after)\
-                .exclude(id__in=self.nodes.all())
-            if child_nodes.count():
-                for child_node in child_nodes.all():
-                    self.open_node(child_node, SkillNodeResonance.LEARN_DISCOVERED, explanation=explanation_string)
-
-            spells = node.spells.filter(auto_discover=True, required_resonance__lte=after)\
-                .exclude(id__in=self.spells.all())
-            if spells.count():
-                for spell in spells.all():
-                    self.learn_spell(spell, PractitionerSpell.LEARN_DISCOVERED, explanation=explanation_string)
-
-            effects = node.effect_records.filter(auto_discover=True, required_resonance__lte=after)\
-                .exclude(effect__in=self.effects.all())
-            if effects.count():
-                for effect in effects.all():
-                    self.learn_effect(effect, PractitionerEffect.LEARN_DISCOVERED, explanation=explanation_string)
-
-            conditions = node.conditions.filter(auto_discover=True, required_resonance__lte=after)
-            if conditions.count():
-                for condition in conditions.all():
-                    self.gain_condition(condition, explanation="Gained by improving %s." % node.name)
-
-        if node.parent_node:
-            self.add_resonance_to_node(node.parent_node, amount / 20)
+        """
+        Adds resonance to a node and a twentieth of that to each ancestor in turn, then applies
+        everything unlocked along the way in one batch.
+        """
+        discoveries = PendingDiscoveries(self)
+        while node:
+            resonance_node = self.resonance_record_for_node(node)
+            if not resonance_node:
+                break
+
+            before = resonance_node.resonance
+            after = min(self.potential, resonance_node.raw_resonance + amount)
+            if after == self.potential:
+                discoveries.messages.append("You feel that you've reached the limit of your ability to learn |y%s|n "
+                                            "until you improve as a practitioner." % node.name)
+            resonance_node.raw_resonance = after
+            resonance_node.save()
+
+            if before != after:
+                discoveries.add(node, after)
+
+            node = node.parent_node
+            amount /= 20
+        discoveries.apply()
 
     def gain_condition(self, condition, explanation=None):
         conditions = self.conditions.filter(condition=condition)
@@ -480,6 +680,8 @@ class Practitioner(SharedMemoryModel):
 
         practalign.value = practalign.value + amount
         practalign.save()
+        if 'resonance_index' in self.__dict__:
+            self.resonance_index.clear_alignment()
 
     def send_inform(self, text):
         self.character.dompc.player.inform(text, category="Magic", append=True)
@@ -548,23 +750,10 @@ class Practitioner(SharedMemoryModel):
         self.send_inform("You " + inform_string)
 
     def resonance_for_main_school(self):
-        nodes = SkillNodeResonance.objects.filter(practitioner=self, node__parent_node__isnull=True)\
-            .order_by('-raw_resonance')
-
-        if nodes.count() == 0:
-            # Are you even a mage?
-            return 0
-
-        return self.resonance_for_node(nodes[0])
+        return self.resonance_index.resonance_for_main_school()
 
     def resonance_for_affinity(self, affinity):
-        nodes = SkillNodeResonance.objects.filter(practitioner=self, node__affinity=affinity,
-                                                  node__affinity_default=True).order_by('-raw_resonance')
-
-        if nodes.count() > 0:
-            return self.resonance_for_node(nodes[0].node)
-
-        return 0
+        return self.resonance_index.resonance_for_affinity(affinity)
 
     def roll_magic(self, difficulty):
         stat_list = ['mana', self.stat]
@@ -648,8 +837,8 @@ class Practitioner(SharedMemoryModel):
 
     @property
     def eyes_open(self):
-        return self.node_resonances.filter(node__eyes_open=True, raw_resonance__gte=0)\
-                   .count() > 0
+        return any(record.node.eyes_open and record.raw_resonance >= 0
+                   for record in self.resonance_index.records.values())
 
     def at_magic_exposure(self, alignment=None, affinity=None, strength=10):
         conditions = None
@@ -741,6 +930,11 @@ class SkillNode(SharedMemoryModel):
     def __str__(self):
         return self.name
 
+    @CachedProperty
+    def discoveries(self):
+        """Sorted thresholds of what auto-discovery through this node unlocks."""
+        return NodeDiscoveries(self)
+
 
 class SkillNodeEffect(SharedMemoryModel):
 
@@ -798,6 +992,14 @@ class SkillNodeResonance(SharedMemoryModel):
     def resonance(self):
         return math.trunc(self.raw_resonance)
 
+    def save(self, *args, **kwargs):
+        super(SkillNodeResonance, self).save(*args, **kwargs)
+        self.practitioner.update_resonance_index(self)
+
+    def delete(self, *args, **kwargs):
+        self.practitioner.update_resonance_index(self, deleted=True)
+        super(SkillNodeResonance, self).delete(*args, **kwargs)
+
     def add_teacher(self, teacher):
         teacher_resonance = teacher.resonance_for_node(self.node)
         self.taught_by = teacher.character.name
@@ -1,7 +1,8 @@
 from world.magic.models import *
-from .conditional_parser import ConditionalHandler
+from .conditional_parser import ConditionalHandler, ConditionalException
 from world.dominion.models import CraftingRecipe
 from world.weather.models import WeatherType, WeatherEmit
+from world.weather import utils as weather_utils
 from evennia.server.models import ServerConfig
 from .test_utils import ArxMagicTest, pending_magic_text
 from server.utils.test_utils import ArxTest
@@ -12,6 +13,8 @@ class TestMagicConditions(ArxTest):
 
     def setUp(self):
         super(TestMagicConditions, self).setUp()
+        weather_utils.WEATHER_STATE.clear()
+        weather_utils.clear_emit_tables()
         self.weather1 = WeatherType.objects.create(name='MagicTest1', gm_notes='Test weather')
         self.emit1 = WeatherEmit.objects.create(weather=self.weather1,
                                                 text='MagicTest1 weather happens.')
@@ -28,6 +31,19 @@ class TestMagicConditions(ArxTest):
         self.assertFalse(handler.check(None, None, "require", default=True))
         self.assertTrue(handler.check(None, None, "prohibit", default=False))
 
+    def test_compound_condition(self):
+        handler = ConditionalHandler("require:weather(MagicTest2) OR weather(MagicTest1);"
+                                     "prohibit:NOT (weather(MagicTest1) AND NOT weather(MagicTest2))")
+        self.assertTrue(handler.check(None, None, "require", default=False))
+        self.assertFalse(handler.check(None, None, "prohibit", default=True))
+        self.assertTrue(handler.check(None, None, "missing", default=True))
+        # compiled conditions are shared between handlers for the same string
+        self.assertIs(handler.conditions, ConditionalHandler(str(handler)).conditions)
+        with self.assertRaises(ConditionalException):
+            ConditionalHandler("require:weather(MagicTest1) weather(MagicTest2)")
+        with self.assertRaises(ConditionalException):
+            ConditionalHandler("require:nosuchfunc(MagicTest1)")
+
 
 class TestMagicSystem(ArxMagicTest):
 
@@ -85,3 +101,45 @@ class TestMagicSystem(ArxMagicTest):
                          "pattern atop static.\n"
                          "Gazing at Test Object, you perceive: A spectacular glow.")
         self.assertEqual(self.practitioner.anima, 92)
+
+    def test_resonance_index(self):
+        child = SkillNode.objects.create(name="Test Child", parent_node=self.node, affinity=self.affinity,
+                                         affinity_default=True)
+        self.practitioner.open_node(self.node, SkillNodeResonance.LEARN_FIAT)
+        self.practitioner.open_node(child, SkillNodeResonance.LEARN_FIAT)
+        self.assertIsNone(self.practitioner.best_affinity)
+        self.practitioner.add_resonance_to_node(self.node, 50)
+        self.assertEqual(self.practitioner.resonance_for_node(child), 5)
+        self.practitioner.add_resonance_to_node(child, 20)
+        self.assertEqual(self.practitioner.resonance_for_node(self.node), 51)
+        self.assertEqual(self.practitioner.resonance_for_node(child), 25.1)
+        self.assertEqual(self.practitioner.resonance_for_affinity(self.affinity), 25.1)
+        self.assertEqual(self.practitioner.resonance_for_main_school(), 51)
+        self.assertEqual(self.practitioner.best_affinity, self.affinity)
+        # a freshly built index agrees with the incrementally maintained one
+        del self.practitioner.resonance_index
+        self.assertEqual(self.practitioner.resonance_for_node(child), 25.1)
+        self.assertEqual(self.practitioner.best_affinity, self.affinity)
+        self.practitioner.resonance_record_for_node(child).delete()
+        self.assertFalse(self.practitioner.knows_node(child))
+        self.assertIsNone(self.practitioner.best_affinity)
+        child.delete()
+
+    def test_auto_discovery(self):
+        child = SkillNode.objects.create(name="Test Child", parent_node=self.node, auto_discover=True,
+                                         required_resonance=20)
+        child_spell = Spell.objects.create(name="Child Spell", node=child, auto_discover=True, required_resonance=1)
+        self.practitioner.open_node(self.node, SkillNodeResonance.LEARN_FIAT)
+        self.practitioner.add_resonance_to_node(self.node, 10)
+        self.assertTrue(self.practitioner.knows_spell(self.spell))
+        self.assertFalse(self.practitioner.knows_node(child))
+        self.practitioner.add_resonance_to_node(self.node, 10)
+        self.assertTrue(self.practitioner.knows_node(child))
+        self.assertFalse(self.practitioner.knows_spell(child_spell))
+        # gains in the child cascade up to the parent, and unlock through both in one batch
+        self.practitioner.add_resonance_to_node(child, 20)
+        self.assertTrue(self.practitioner.knows_spell(child_spell))
+        self.assertEqual(self.practitioner.resonance_for_node(self.node), 21)
+        self.assertEqual(self.practitioner.spells.count(), 2)
+        child_spell.delete()
+        child.delete()
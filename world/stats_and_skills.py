@@ -11,9 +11,12 @@ respectively. So while you can do
 char.db.strength, you would have to access
 a skill by char.db.skills.get('brawl', 0), for example.
 """
-from .roll import Roll
+from collections import namedtuple, OrderedDict
+from itertools import count
 from math import ceil
 
+from .roll import Roll
+
 
 # tuples of allowed stats and skills
 
@@ -55,6 +58,14 @@ COMBAT_SKILL_COST_MULT = 20
 # being taught will give you a 20% discount
 TEACHER_DISCOUNT = 0.8
 LEGENDARY_COST = 500
+STAT_MAXIMUM = 5
+SKILL_MAXIMUM = 6
+ABILITY_MAXIMUM = 6
+# the skill each crafting ability requires, and how to describe someone with it
+_ability_requirements_ = {'tailor': ('sewing', 'a tailor'), 'weaponsmith': ('smithing', 'a weaponsmith'),
+                          'armorsmith': ('smithing', 'a armorsmith'), 'leatherworker': ('tanning', 'a leatherworker'),
+                          'apothecary': ('alchemy', 'an apothecary'), 'carpenter': ('woodworking', 'a carpenter'),
+                          'jeweler': ('smithing', 'a jeweler')}
 
 
 def get_partial_match(args, s_type):
@@ -81,14 +92,18 @@ def do_dice_check(*args, **kwargs):
     return roll.result
 
 
-def get_stat_cost(caller, stat):
-    """Currently all stats cost 100, but this could change."""
+def get_stat_cost(caller, stat, total_stats=None):
+    """
+    Currently all stats cost 100, but this could change. total_stats is the sum of
+    all our stats, if the caller has already added them up.
+    """
     cost = NEW_STAT_COST
     if check_training(caller, stat, stype="stat"):
         cost = discounted_cost(caller, cost)
-    total_stats = 0
-    for stat in VALID_STATS:
-        total_stats += caller.attributes.get(stat)
+    if total_stats is None:
+        total_stats = 0
+        for stat in VALID_STATS:
+            total_stats += caller.attributes.get(stat)
     bonus_stats = total_stats - 36
     if bonus_stats > 0:
         cost *= (1 + 0.5*bonus_stats)
@@ -123,7 +138,11 @@ def cost_at_rank(skill, current_rating, new_rating):
     return cost
 
 
-def get_skill_cost_increase(caller, additional_cost=0):
+def get_skill_totals(caller):
+    """
+    Returns the total xp cost of all our skills, and the xp we were given towards
+    skills by chargen, social rank and age.
+    """
     from commands.base_commands import guest
     skills = caller.db.skills or {}
     srank = caller.db.social_rank or 0
@@ -136,6 +155,15 @@ def get_skill_cost_increase(caller, additional_cost=0):
     bonus_by_srank = guest.XP_BONUS_BY_SRANK.get(srank, 0)
     bonus_by_age = guest.award_bonus_by_age(age)
     discounts = skill_xp + bonus_by_srank + bonus_by_age
+    return total, discounts
+
+
+def get_skill_cost_increase(caller, additional_cost=0, totals=None):
+    """
+    Returns the tax on buying skills, or a negative discount while we still have skill points left.
+    totals is the result of get_skill_totals, if the caller already has it.
+    """
+    total, discounts = totals or get_skill_totals(caller)
     if total + additional_cost < discounts:  # we're free
         return -1.0
     elif total >= discounts:  # we have an xp tax
@@ -150,8 +178,11 @@ def get_skill_cost_increase(caller, additional_cost=0):
         return initial + tax
 
 
-def get_skill_cost(caller, skill, adjust_value=None, check_teacher=True, unmodified=False):
-    """Uses cost at rank and factors in teacher discounts if they are allowed."""
+def get_skill_cost(caller, skill, adjust_value=None, check_teacher=True, unmodified=False, totals=None):
+    """
+    Uses cost at rank and factors in teacher discounts if they are allowed. totals is
+    the result of get_skill_totals, if the caller already has it.
+    """
     current_rating = caller.db.skills.get(skill, 0)
     if not adjust_value and adjust_value != 0:
         adjust_value = 1
@@ -163,7 +194,7 @@ def get_skill_cost(caller, skill, adjust_value=None, check_teacher=True, unmodif
     if unmodified:
         return base_cost
     # check for freebies
-    tax = get_skill_cost_increase(caller, additional_cost=base_cost)
+    tax = get_skill_cost_increase(caller, additional_cost=base_cost, totals=totals)
     if tax <= -1.0:
         return 0
     # check what discount would be
@@ -212,6 +243,145 @@ def get_ability_cost(caller, ability, adjust_value=None, check_teacher=True, unm
     return cost
 
 
+TraitCost = namedtuple("TraitCost", "current maximum cost reason")
+
+
+class AdvancementCosts(object):
+    """
+    The cost and maximum of raising every stat, skill and ability of a character, and the
+    reason they can't raise it, if any. Costs are the same the get_*_cost functions give,
+    but the totals they share are only added up once for the whole table. The caller
+    must already have dicts of skills and abilities.
+    """
+    def __init__(self, caller, key=None):
+        self.key = key
+        self.stats = OrderedDict()
+        self.skills = OrderedDict()
+        self.abilities = OrderedDict()
+        stats = [(stat, caller.attributes.get(stat) or 0) for stat in VALID_STATS]
+        total_stats = sum(value for _, value in stats)
+        for stat, current in stats:
+            self.stats[stat] = TraitCost(current, STAT_MAXIMUM, get_stat_cost(caller, stat, total_stats=total_stats),
+                                         self.maximum_reason(stat, current, STAT_MAXIMUM))
+        skills = caller.db.skills
+        totals = get_skill_totals(caller)
+        no_legendary = get_skill_cost_increase(caller, totals=totals) <= -1.0
+        for skill in VALID_SKILLS:
+            current = skills.get(skill, 0)
+            reason = self.maximum_reason(skill, current, SKILL_MAXIMUM)
+            if not reason and current >= 5 and no_legendary:
+                reason = "You cannot buy a legendary skill while you still have catchup xp remaining."
+            self.skills[skill] = TraitCost(current, SKILL_MAXIMUM, get_skill_cost(caller, skill, totals=totals), reason)
+        abilities = caller.db.abilities
+        specialized = any(value >= 6 for key, value in abilities.items() if key in CRAFTING_ABILITIES)
+        for ability in VALID_ABILITIES:
+            current = abilities.get(ability, 0)
+            reason = self.maximum_reason(ability, current, ABILITY_MAXIMUM)
+            if not current and ability in _ability_requirements_:
+                required, title = _ability_requirements_[ability]
+                if required not in skills:
+                    reason = "You must have %s to be %s." % (required, title)
+            if not reason and current == 5 and specialized:
+                reason = "You have already chosen a crafting specialization."
+            self.abilities[ability] = TraitCost(current, ABILITY_MAXIMUM, get_ability_cost(caller, ability), reason)
+
+    @staticmethod
+    def maximum_reason(name, current, maximum):
+        if current >= maximum:
+            return "%s is already at its maximum." % name
+
+    def get(self, name):
+        """Returns the TraitCost for a stat, skill or ability, or None if it's none of those."""
+        for traits in (self.stats, self.skills, self.abilities):
+            if name in traits:
+                return traits[name]
+
+
+# attributes an AdvancementCosts table is built from
+ADVANCEMENT_ATTRIBUTES = frozenset(VALID_STATS + ("skills", "abilities", "social_rank", "age", "trainer"))
+_trait_versions = count(1)
+_bonus_points_version = 0
+
+
+def traits_changed(char_id):
+    """
+    Marks the advancement costs of a character as out of date, along with those of anyone they're
+    training. Characters that aren't in memory have no costs cached to mark.
+    """
+    from evennia.objects.models import ObjectDB
+    char = ObjectDB.get_cached_instance(char_id)
+    if char:
+        char.ndb.trait_version = next(_trait_versions)
+
+
+def get_advancement_key(caller):
+    """
+    Returns the versions of everything an AdvancementCosts table depends upon: the character's traits,
+    their trainer and the trainer's traits, and the chargen bonus skill points.
+    """
+    trainer = caller.db.trainer
+    if trainer:
+        return caller.ndb.trait_version, trainer.id, trainer.ndb.trait_version, _bonus_points_version
+    return caller.ndb.trait_version, None, None, _bonus_points_version
+
+
+def get_advancement_costs(caller):
+    """
+    Returns the AdvancementCosts for a character. The table is kept in their ndb and is only
+    rebuilt once their traits, training or skill discounts have changed.
+    """
+    key = get_advancement_key(caller)
+    table = caller.ndb.advancement_costs
+    if table is None or table.key != key:
+        table = AdvancementCosts(caller, key)
+        caller.ndb.advancement_costs = table
+    return table
+
+
+def advancement_attribute_changed(sender, instance, **kwargs):
+    """Marks the owners of a saved or deleted trait attribute as changed."""
+    if instance.db_key not in ADVANCEMENT_ATTRIBUTES or instance.db_category is not None:
+        return
+    for char_id in instance.objectdb_set.values_list('id', flat=True):
+        traits_changed(char_id)
+
+
+def advancement_attributes_attached(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Attributes are attached to an object only after they're first saved, so an object gaining or
+    losing attributes has its traits marked as changed.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        traits_changed(instance.id)
+    elif instance.db_key in ADVANCEMENT_ATTRIBUTES and instance.db_category is None:
+        for char_id in pk_set or instance.objectdb_set.values_list('id', flat=True):
+            traits_changed(char_id)
+
+
+def bonus_skill_points_changed(sender, instance, **kwargs):
+    global _bonus_points_version
+    if instance.db_key == "CHARGEN_BONUS_SKILL_POINTS":
+        _bonus_points_version += 1
+
+
+def connect_signals():
+    """
+    Called when the app is ready. Trait attributes and the bonus skill points can be changed by
+    any command or script, so we hear about changes from their models rather than each caller.
+    """
+    from django.db.models.signals import post_save, pre_delete, m2m_changed
+    from evennia.objects.models import ObjectDB
+    from evennia.server.models import ServerConfig
+    from evennia.typeclasses.attributes import Attribute
+    post_save.connect(advancement_attribute_changed, sender=Attribute)
+    pre_delete.connect(advancement_attribute_changed, sender=Attribute)
+    m2m_changed.connect(advancement_attributes_attached, sender=ObjectDB.db_attributes.through)
+    post_save.connect(bonus_skill_points_changed, sender=ServerConfig)
+    pre_delete.connect(bonus_skill_points_changed, sender=ServerConfig)
+
+
 def discounted_cost(caller, cost):
     discount = TEACHER_DISCOUNT
     trainer = caller.db.trainer
@@ -1,10 +1,19 @@
 """
 This class provides utilities for working with templates.
-"""
 
+Templates are rendered into a desc in a single pass over it, looking up each template's desc from the
+table kept by Template.objects. Rendered descs are cached by the desc and the versions of the templates
+it uses, so objects sharing a desc render it once, and saving a template makes every desc using it
+render again.
+"""
+from collections import OrderedDict
 import re
 from world.templates.models import Template
 
+MAX_RENDERED_DESCS = 512
+
+_rendered_descs = OrderedDict()
+
 
 class TemplateMixins(object):
     template_regex_obj = re.compile("(\[\[TEMPLATE_\d+\]\])")
@@ -17,11 +26,32 @@ class TemplateMixins(object):
         return re.findall(self.template_id_regex_obj, string)
 
     def replace_template_values(self, string, templates):
-        escape = lambda e: "".join("\\" + c if c in "\\" or c == "\\" else c for c in e)
-        work_string = string
-        for template in templates:
-            work_string = re.sub(re.escape(template.markup()), escape(template.desc), work_string)
-        return work_string
+        """Replaces the markup of each of the given templates in a string with its desc."""
+        return self.substitute_templates(string, {str(template.id): template.desc for template in templates})
+
+    def substitute_templates(self, string, descs):
+        """
+        Replaces template markup in a string with descs from a dict keyed by template id, in a single pass.
+        Markup for ids not in descs is left alone.
+        """
+        return self.template_id_regex_obj.sub(lambda match: descs.get(match.group(1), match.group(0)), string)
+
+    def render_templates(self, string):
+        """
+        Returns a string with all the templates it uses replaced by their descs, from our cache of
+        rendered descs if none of its templates have changed since it was rendered.
+        """
+        template_ids = sorted(set(self.find_template_ids(string)))
+        if not template_ids:
+            return string
+        key = (string, tuple(Template.objects.version(ob) for ob in template_ids))
+        rendered = _rendered_descs.pop(key, None)
+        if rendered is None:
+            rendered = self.substitute_templates(string, Template.objects.descs_by_id(template_ids))
+            if len(_rendered_descs) >= MAX_RENDERED_DESCS:
+                _rendered_descs.popitem(last=False)
+        _rendered_descs[key] = rendered
+        return rendered
 
     def can_apply_templates(self, caller, desc):
         template_ids = self.find_template_ids(desc)
@@ -54,9 +54,13 @@ class Template(SharedMemoryModel):
     objects = TemplateManager()
 
     def save(self, *args, **kwargs):
-        super(Template, self).save(args, kwargs)
-        for obj in self.applied_to.all():
-            obj.ndb.cached_template_desc = None
+        super(Template, self).save(*args, **kwargs)
+        Template.objects.template_changed(self.id)
+
+    def delete(self, *args, **kwargs):
+        template_id = self.id
+        super(Template, self).delete(*args, **kwargs)
+        Template.objects.template_changed(template_id)
 
     def __str__(self):
         return self.title
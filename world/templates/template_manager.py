@@ -1,5 +1,9 @@
 """
 Django manager for the Template model.
+
+The manager also keeps an in-memory table of template descs by id, so rendering the templates in a desc
+doesn't need a query. Each template id has a version that goes up whenever the template is saved or
+deleted, so anything rendered from a template can tell when it's out of date.
 """
 
 from django.db import models
@@ -7,9 +11,38 @@ from django.db.models import Q
 
 
 class TemplateManager(models.Manager):
+    def __init__(self):
+        super(TemplateManager, self).__init__()
+        # str(id): desc, or None for an id with no template
+        self._descs = {}
+        self._versions = {}
+
     def accessible_by(self, char):
         return self.get_queryset().filter(Q(owner=char.roster.current_account) | Q(templategrantee__grantee=char.roster) | Q(access_level="OP")).distinct()
 
     def in_list(self, ids):
         return self.get_queryset().filter(id__in=ids).distinct()
 
+    def descs_by_id(self, ids):
+        """
+        Returns a dict of the descs of the templates with the given ids, keyed by the ids as strings. Ids
+        without a template are left out. Only templates we haven't already got are queried.
+        """
+        ids = [str(ob) for ob in ids]
+        missing = [ob for ob in ids if ob not in self._descs]
+        if missing:
+            for template_id, desc in self.in_list(missing).values_list('id', 'desc'):
+                self._descs[str(template_id)] = desc
+            for template_id in missing:
+                self._descs.setdefault(template_id, None)
+        return {ob: self._descs[ob] for ob in ids if self._descs[ob] is not None}
+
+    def version(self, template_id):
+        """Returns how many times a template has changed since we started."""
+        return self._versions.get(str(template_id), 0)
+
+    def template_changed(self, template_id):
+        """Drops a saved or deleted template from the table, so it's read again when it's next used."""
+        template_id = str(template_id)
+        self._descs.pop(template_id, None)
+        self._versions[template_id] = self.version(template_id) + 1
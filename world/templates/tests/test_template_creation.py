@@ -212,6 +212,19 @@ class TemplateTests(ArxCommandTest, TemplateMixins):
 
         self.assertEqual(self.replace_template_values(desc, Template.objects.in_list(self.find_template_ids(desc)).all()), parsed_desc)
 
+    def test_render_templates(self):
+        desc = "{0} and {1}, then {0} again, but not [[TEMPLATE_999]].".format(self.c1_template.markup(),
+                                                                           self.c2_template.markup())
+        parsed_desc = "{0} and {1}, then {0} again, but not [[TEMPLATE_999]].".format(self.c1_template.desc,
+                                                                                  self.c2_template.desc)
+        self.assertEqual(self.render_templates(desc), parsed_desc)
+        self.assertEqual(self.render_templates("No templates here."), "No templates here.")
+        self.c2_template.desc = "A \\1 desc with a backslash"
+        self.c2_template.save()
+        self.assertEqual(self.render_templates(desc),
+                         "{0} and A \\1 desc with a backslash, then {0} again, but not "
+                         "[[TEMPLATE_999]].".format(self.c1_template.desc))
+
     def test_can_delete_if_not_in_use(self):
         other_template = self.create_template_for(self.paccount1, title="My Restricted Template", access_level='RS', apply_attribution=True)
         other_template.save()
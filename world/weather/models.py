@@ -52,3 +52,13 @@ class WeatherEmit(SharedMemoryModel):
     weight = models.PositiveIntegerField('Weight', default=10)
     text = models.TextField('Emit', blank=False, null=False)
     gm_notes = models.TextField('GM Notes', blank=True, null=True)
+
+    def save(self, *args, **kwargs):
+        super(WeatherEmit, self).save(*args, **kwargs)
+        from .utils import clear_emit_tables
+        clear_emit_tables()
+
+    def delete(self, *args, **kwargs):
+        from .utils import clear_emit_tables
+        clear_emit_tables()
+        return super(WeatherEmit, self).delete(*args, **kwargs)
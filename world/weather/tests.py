@@ -10,16 +10,18 @@ class TestWeatherCommands(ArxCommandTest):
 
     def setUp(self):
         super(TestWeatherCommands,self).setUp()
+        utils.WEATHER_STATE.clear()
+        utils.clear_emit_tables()
         self.weather1 = WeatherType.objects.create(name='Test', gm_notes='Test weather')
         self.emit1 = WeatherEmit.objects.create(weather=self.weather1,
                                                 text='Test1 weather happens.')
         self.weather2 = WeatherType.objects.create(name='Test2', gm_notes='Test weather')
         self.emit2 = WeatherEmit.objects.create(weather=self.weather2,
                                                 text='Test2 weather happens.')
-        ServerConfig.objects.conf('weather_type_current', value=1)
-        ServerConfig.objects.conf('weather_intensity_current', value=5)
-        ServerConfig.objects.conf('weather_type_target', value=2)
-        ServerConfig.objects.conf('weather_intensity_target', value=5)
+        utils.set_weather_type(self.weather1.id)
+        utils.set_weather_intensity(5)
+        utils.set_weather_target_type(self.weather2.id)
+        utils.set_weather_target_intensity(5)
 
     def test_cmd_adminweather(self):
         self.setup_cmd(weather_commands.CmdAdminWeather, self.char1)
@@ -35,3 +37,31 @@ class TestWeatherCommands(ArxCommandTest):
     def test_weather_utils(self):
         new_weather, new_intensity = utils.advance_weather()
         assert(new_intensity < 5)
+
+    def test_emit_tables(self):
+        self.assertEqual(utils.pick_emit(self.weather1, season="Summer", time="night", intensity=5),
+                         'Test1 weather happens.')
+        emits, picker = utils.emit_table(self.weather1, season="summer", time="night", intensity=5)
+        self.assertEqual(emits, [self.emit1])
+        self.assertIsNone(picker)
+        emit3 = WeatherEmit.objects.create(weather=self.weather1, text='Test3 weather happens.', at_night=False)
+        self.assertEqual(utils.emit_table(self.weather1, season="summer", time="night", intensity=5)[0], [self.emit1])
+        emits, picker = utils.emit_table(self.weather1, season="summer", time="morning", intensity=5)
+        self.assertEqual(set(emits), {self.emit1, emit3})
+        self.assertIn(picker.pick(), emits)
+        emit = utils.choose_current_weather()
+        self.assertEqual(utils.get_last_emit(), emit)
+        self.assertEqual(ServerConfig.objects.conf('weather_last_emit'), emit)
+
+    def test_weather_state(self):
+        self.assertEqual(utils.get_weather_type(), self.weather1.id)
+        # writes that don't go through the weather utils are seen too
+        ServerConfig.objects.conf('weather_type_current', value=self.weather2.id)
+        self.assertEqual(utils.get_weather_type(), self.weather2.id)
+        ServerConfig.objects.conf('weather_type_current', delete=True)
+        self.assertEqual(utils.get_weather_type(), 1)
+        self.assertNotIn(self.account2.id, utils.WEATHER_STATE.ignore_weather)
+        self.account2.db.ignore_weather = True
+        self.assertIn(self.account2.id, utils.WEATHER_STATE.ignore_weather)
+        self.account2.db.ignore_weather = False
+        self.assertNotIn(self.account2.id, utils.WEATHER_STATE.ignore_weather)
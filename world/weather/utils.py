@@ -1,14 +1,104 @@
 """
 Utilities to make the weather system a little more friendly to write.
+
+The weather's current state lives in ServerConfig, but every read of it is a query, so
+WEATHER_STATE keeps the values we've read in memory and writes changes through to
+ServerConfig. Anything written to ServerConfig or to an ignore_weather attribute some
+other way is forgotten through model signals, so that it's read again on next use. Emits
+are likewise sorted into compiled pickers for each combination of weather, season, time
+and intensity the first time they're asked for, and those are thrown away whenever an
+emit is saved or deleted.
 """
 
+from django.db.models.signals import post_save, pre_delete
+
 from .models import WeatherType, WeatherEmit
 from typeclasses.scripts import gametime
 from evennia.server.models import ServerConfig
+from evennia.typeclasses.attributes import Attribute
 from evennia.server.sessionhandler import SESSION_HANDLER
 from evennia.utils import logger
 from random import randint
-from server.utils.picker import WeightedPicker
+from server.utils.picker import get_picker, WeightedPicker
+
+
+class WeatherState(object):
+    """
+    Weather settings from ServerConfig, read once and then kept in memory. Changes made through
+    set and delete are kept as they're written, and values written to ServerConfig any other way
+    are forgotten, through signals, so that they're read again.
+    """
+    def __init__(self):
+        self._values = {}
+        self._ignore_weather = None
+
+    def get(self, key, default=None):
+        if key not in self._values:
+            self._values[key] = ServerConfig.objects.conf(key, default=None)
+        value = self._values[key]
+        return default if value is None else value
+
+    def set(self, key, value):
+        ServerConfig.objects.conf(key=key, value=value)
+        self._values[key] = value
+
+    def delete(self, key):
+        ServerConfig.objects.conf(key, delete=True)
+        self._values[key] = None
+
+    @property
+    def ignore_weather(self):
+        """Set of the ids of accounts who have turned weather emits off"""
+        if self._ignore_weather is None:
+            from evennia.typeclasses.attributes import Attribute
+            from evennia.utils.dbserialize import from_pickle
+            attrs = Attribute.objects.filter(db_key="ignore_weather", db_category__isnull=True,
+                                             accountdb__isnull=False).values_list('accountdb__id', 'db_value')
+            self._ignore_weather = {account_id for account_id, value in attrs if from_pickle(value)}
+        return self._ignore_weather
+
+    def set_ignores_weather(self, account, ignore):
+        if ignore:
+            self.ignore_weather.add(account.id)
+        else:
+            self.ignore_weather.discard(account.id)
+
+    def forget(self, key):
+        self._values.pop(key, None)
+
+    def forget_ignores(self):
+        self._ignore_weather = None
+
+    def clear(self):
+        self._values.clear()
+        self._ignore_weather = None
+
+
+WEATHER_STATE = WeatherState()
+
+
+def server_config_changed(sender, instance, **kwargs):
+    """Forgets a setting that's been written to ServerConfig, in case it wasn't written by us."""
+    WEATHER_STATE.forget(instance.db_key)
+
+
+def ignore_weather_changed(sender, instance, **kwargs):
+    if instance.db_key == "ignore_weather" and instance.db_category is None:
+        WEATHER_STATE.forget_ignores()
+
+
+post_save.connect(server_config_changed, sender=ServerConfig, dispatch_uid="weather_server_config_saved")
+pre_delete.connect(server_config_changed, sender=ServerConfig, dispatch_uid="weather_server_config_deleted")
+post_save.connect(ignore_weather_changed, sender=Attribute, dispatch_uid="weather_ignore_saved")
+pre_delete.connect(ignore_weather_changed, sender=Attribute, dispatch_uid="weather_ignore_deleted")
+
+# (weather id, season, time, intensity): (emits, compiled picker)
+_emit_tables = {}
+
+
+def clear_emit_tables():
+    """Called whenever an emit changes"""
+    _emit_tables.clear()
 
 
 def weather_emits(weathertype, season=None, time=None, intensity=5):
@@ -20,13 +110,7 @@ def weather_emits(weathertype, season=None, time=None, intensity=5):
     :param intensity: The intensity of weather to pick an emit for, from 1 to 10
     :return: A QuerySet of matching WeatherEmit objects
     """
-    if not season:
-        season, _ = gametime.get_time_and_season()
-    season = season.lower()
-
-    if not time:
-        _, time = gametime.get_time_and_season()
-    time = time.lower()
+    season, time = get_season_and_time(season, time)
 
     qs = WeatherEmit.objects.filter(weather=weathertype)
     qs = qs.filter(intensity_min__lte=intensity, intensity_max__gte=intensity)
@@ -51,6 +135,35 @@ def weather_emits(weathertype, season=None, time=None, intensity=5):
     return qs
 
 
+def get_season_and_time(season=None, time=None):
+    """Fills in the current IC season and time of day if they're not given, in lowercase."""
+    if not season or not time:
+        current_season, current_time = gametime.get_time_and_season()
+        season = season or current_season
+        time = time or current_time
+    return season.lower(), time.lower()
+
+
+def emit_table(weathertype, season=None, time=None, intensity=5):
+    """
+    Returns the emits for the given conditions, and a compiled picker for them if there's more than one.
+    :param weathertype: The type of weather to use, a WeatherType object
+    :param season: The season (summer, spring, autumn, winter)
+    :param time: The time (morning, afternoon, evening, night)
+    :param intensity: The intensity of weather to pick an emit for, from 1 to 10
+    :return: A tuple of a list of matching WeatherEmit objects and a WeightedPicker or None
+    """
+    season, time = get_season_and_time(season, time)
+    key = (weathertype.id, season, time, intensity)
+    if key not in _emit_tables:
+        emits = list(weather_emits(weathertype, season=season, time=time, intensity=intensity))
+        picker = None
+        if len(emits) > 1:
+            picker = WeightedPicker((emit, emit.weight) for emit in emits).compile()
+        _emit_tables[key] = (emits, picker)
+    return _emit_tables[key]
+
+
 def pick_emit(weathertype, season=None, time=None, intensity=None):
     """
     Given weather conditions, pick a random emit.  If a GM-set weather
@@ -65,12 +178,12 @@ def pick_emit(weathertype, season=None, time=None, intensity=None):
     :return:
     """
     # Do we have a GM-set override?
-    custom_weather = ServerConfig.objects.conf('weather_custom', default=None)
+    custom_weather = WEATHER_STATE.get('weather_custom')
     if custom_weather:
         return custom_weather
 
     if weathertype is None:
-        weathertype = ServerConfig.objects.conf('weather_type_current', default=1)
+        weathertype = get_weather_type()
 
     if isinstance(weathertype, int):
         weathertype = WeatherType.objects.get(pk=weathertype)
@@ -79,26 +192,19 @@ def pick_emit(weathertype, season=None, time=None, intensity=None):
         raise ValueError
 
     if intensity is None:
-        intensity = ServerConfig.objects.conf('weather_intensity_current', default=5)
+        intensity = get_weather_intensity()
 
-    emits = weather_emits(weathertype, season=season, time=time, intensity=intensity)
+    emits, picker = emit_table(weathertype, season=season, time=time, intensity=intensity)
 
-    if emits.count() == 0:
+    if not emits:
         logger.log_err("Weather: Unable to find any matching emits for {} intensity {} on a {} {}."
                        .format(weathertype.name, intensity, season, time))
         return None
 
-    if emits.count() == 1:
+    if not picker:
         return emits[0].text
 
-    picker = WeightedPicker()
-
-    for emit in emits:
-        picker.add_option(emit, emit.weight)
-
-    result = picker.pick()
-
-    return result.text
+    return picker.pick().text
 
 
 def set_weather_type(value=1):
@@ -106,7 +212,7 @@ def set_weather_type(value=1):
     Sets the weather type, as an integer value.
     :param value: A value mapping to the primary key of a WeatherType object
     """
-    ServerConfig.objects.conf(key='weather_type_current', value=value)
+    WEATHER_STATE.set('weather_type_current', value)
 
 
 def set_weather_target_type(value=1):
@@ -115,7 +221,7 @@ def set_weather_target_type(value=1):
     :param value: A value mapping to the primary key of a WeatherType object
     :return:
     """
-    ServerConfig.objects.conf(key='weather_type_target', value=value)
+    WEATHER_STATE.set('weather_type_target', value)
 
 
 def get_weather_type():
@@ -123,7 +229,7 @@ def get_weather_type():
     Returns the current weather type, as an integer.
     :return: An integer mapping to the primary key of a WeatherType object
     """
-    return ServerConfig.objects.conf('weather_type_current', default=1)
+    return WEATHER_STATE.get('weather_type_current', default=1)
 
 
 def get_weather_target_type():
@@ -131,7 +237,7 @@ def get_weather_target_type():
     Returns the target weather type, as an integer.
     :return: An integer mapping to the primary key of a WeatherType object
     """
-    return ServerConfig.objects.conf('weather_type_target', default=1)
+    return WEATHER_STATE.get('weather_type_target', default=1)
 
 
 def set_weather_intensity(value=5):
@@ -139,7 +245,7 @@ def set_weather_intensity(value=5):
     Sets the weather intensity, as an integer value.
     :param value: A value from 1 to 10.
     """
-    ServerConfig.objects.conf(key='weather_intensity_current', value=value)
+    WEATHER_STATE.set('weather_intensity_current', value)
 
 
 def set_weather_target_intensity(value=5):
@@ -147,7 +253,7 @@ def set_weather_target_intensity(value=5):
     Sets the weather intensity, as an integer value.
     :param value: A value from 1 to 10.
     """
-    ServerConfig.objects.conf(key='weather_intensity_target', value=value)
+    WEATHER_STATE.set('weather_intensity_target', value)
 
 
 def get_weather_intensity():
@@ -155,7 +261,7 @@ def get_weather_intensity():
     Returns the current weather intensity, as an integer from 1 to 10
     :return: The current intensity.
     """
-    return ServerConfig.objects.conf('weather_intensity_current', default=5)
+    return WEATHER_STATE.get('weather_intensity_current', default=5)
 
 
 def get_weather_target_intensity():
@@ -163,7 +269,7 @@ def get_weather_target_intensity():
     Returns the target weather intensity, as an integer.
     :return: An integer value from 1 to 10.
     """
-    return ServerConfig.objects.conf('weather_intensity_target', default=5)
+    return WEATHER_STATE.get('weather_intensity_target', default=5)
 
 
 def emits_for_season(season='fall'):
@@ -205,12 +311,8 @@ def random_weather(season='fall'):
             weathers[emit.weather.id] = weatherweight * emit.weather.multiplier
             total_weight += emit.weight
 
-    # Create our picker list
-    picker = WeightedPicker()
-    for k, v in weathers.items():
-        picker.add_option(k, v)
-
-    result = picker.pick()
+    # Pick from our weathers, reusing the picker for them if they haven't changed
+    result = get_picker(sorted(weathers.items())).pick()
 
     weather = WeatherType.objects.get(pk=result)
     return weather
@@ -222,11 +324,11 @@ def advance_weather():
     If we have met our target, pick a new one for the next run.
     :return: Current weather ID as an integer, current weather intensity as an integer
     """
-    if ServerConfig.objects.conf('weather_locked', default=False):
+    if WEATHER_STATE.get('weather_locked', default=False):
         return get_weather_type(), get_weather_intensity()
 
-    target_weather = ServerConfig.objects.conf('weather_type_target', default=None)
-    target_intensity = ServerConfig.objects.conf('weather_intensity_target', default=None)
+    target_weather = WEATHER_STATE.get('weather_type_target')
+    target_intensity = WEATHER_STATE.get('weather_intensity_target')
 
     season, time = gametime.get_time_and_season()
 
@@ -239,8 +341,8 @@ def advance_weather():
         target_intensity = randint(1, 10)
         set_weather_intensity(target_intensity)
 
-    current_weather = ServerConfig.objects.conf('weather_type_current', default=1)
-    current_intensity = ServerConfig.objects.conf('weather_intensity_current', default=1)
+    current_weather = WEATHER_STATE.get('weather_type_current', default=1)
+    current_intensity = WEATHER_STATE.get('weather_intensity_current', default=1)
 
     if current_weather != target_weather:
         current_intensity -= randint(1, 6)
@@ -293,7 +395,7 @@ def choose_current_weather():
         weather_type, weather_intensity = advance_weather()
         emit = pick_emit(weather_type, intensity=weather_intensity)
 
-    ServerConfig.objects.conf(key='weather_last_emit', value=emit)
+    WEATHER_STATE.set('weather_last_emit', emit)
     return emit
 
 
@@ -302,7 +404,7 @@ def get_last_emit():
     Returns the last emit chosen by the weather system.
     :return: The last emit chosen by the weather system.
     """
-    return ServerConfig.objects.conf(key='weather_last_emit', default=None)
+    return WEATHER_STATE.get('weather_last_emit')
 
 
 def announce_weather(text=None):
@@ -313,9 +415,9 @@ def announce_weather(text=None):
     if not text:
         return
 
+    ignore_weather = WEATHER_STATE.ignore_weather
     for sess in SESSION_HANDLER.get_sessions():
         account = sess.get_account()
         if account:
-            ignore_weather = account.db.ignore_weather or False
-            if not ignore_weather:
+            if account.id not in ignore_weather:
                 sess.msg("|wWeather:|n {}".format(text))
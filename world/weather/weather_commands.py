@@ -1,4 +1,3 @@
-from evennia.server.models import ServerConfig
 from evennia import ScriptDB
 from commands.base import ArxCommand
 from . import utils
@@ -44,7 +43,7 @@ class CmdAdminWeather(ArxCommand):
     def func(self):
 
         if "advance" in self.switches:
-            if ServerConfig.objects.conf('weather_locked', default=False):
+            if utils.WEATHER_STATE.get('weather_locked', default=False):
                 self.msg("Weather is currently locked, and cannot be advanced!")
                 return
 
@@ -62,23 +61,23 @@ class CmdAdminWeather(ArxCommand):
 
         if "set" in self.switches:
             if self.args:
-                ServerConfig.objects.conf('weather_custom', value=self.args)
+                utils.WEATHER_STATE.set('weather_custom', self.args)
                 self.msg('Custom weather emit set.  Remember to {}/announce if you want the players to know.'
                          .format(self.cmdstring))
                 return
             else:
-                ServerConfig.objects.conf('weather_custom', delete=True)
+                utils.WEATHER_STATE.delete('weather_custom')
                 self.msg('Custom weather message cleared.  Remember to {}/announce '
                          'if you want the players to see a new weather emit.'.format(self.cmdstring))
                 return
 
         if "lock" in self.switches:
-            ServerConfig.objects.conf('weather_locked', value=True)
+            utils.WEATHER_STATE.set('weather_locked', True)
             self.msg("Weather is now locked and will not change.")
             return
 
         if "unlock" in self.switches:
-            ServerConfig.objects.conf('weather_locked', delete=True)
+            utils.WEATHER_STATE.delete('weather_locked')
             self.msg("Weather is now unlocked and will change again as normal.")
             return
 
@@ -125,8 +124,8 @@ class CmdAdminWeather(ArxCommand):
         current_obj = WeatherType.objects.get(pk=current_weather)
         target_obj = WeatherType.objects.get(pk=target_weather)
 
-        locked = ServerConfig.objects.conf('weather_locked', default=False)
-        custom = ServerConfig.objects.conf('weather_custom', default=None)
+        locked = utils.WEATHER_STATE.get('weather_locked', default=False)
+        custom = utils.WEATHER_STATE.get('weather_custom')
 
         self.msg("\nWeather pattern is {} (intensity {}), moving towards {} (intensity {})."
                  .format(current_obj.name, current_intensity, target_obj.name, target_intensity))